@@ -0,0 +1,53 @@
+"""
+Measure EventHub memory per idle subscriber and fan-out cost.
+
+Subscribes SUBSCRIBERS idle clients (each following one user, as in a class
+of students watched by their own devices, plus a few teachers following
+everyone) and reports tracemalloc growth and publish latency. This covers the
+hub only, not the per-connection cost of the ASGI server. Run from the
+backend directory:
+
+    python -m benchmarks.bench_event_hub
+"""
+
+import asyncio
+import time
+import tracemalloc
+from datetime import datetime
+from uuid import uuid4
+
+from src.events import EventHub
+
+SUBSCRIBERS = 10_000
+TEACHERS = 100
+PUBLISHES = 10_000
+
+
+async def main():
+    hub = EventHub(max_queue=64)
+    students = [uuid4() for _ in range(SUBSCRIBERS)]
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    subscribers = [hub.subscribe([student]) for student in students]
+    subscribers += [hub.subscribe() for _ in range(TEACHERS)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    grown = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    print(f"idle subscribers:      {len(subscribers):,}")
+    print(f"hub memory:            {grown / 1024:,.0f} KiB ({grown / len(subscribers):,.0f} B/subscriber)")
+
+    now = datetime.utcnow()
+    start = time.perf_counter()
+    for i in range(PUBLISHES):
+        hub.publish_level_passed(students[i % SUBSCRIBERS], 1, now)
+    elapsed = time.perf_counter() - start
+    print(
+        f"publish (1 + {TEACHERS} recipients): {elapsed / PUBLISHES * 1e6:,.1f} us/event, "
+        f"{PUBLISHES / elapsed:,.0f} events/s"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+"""
+Benchmark JSON serialization of the /game/user_progress_summary and
+/game/get_level_data payloads.
+
+"dict + jsonable_encoder" is what the routes paid when they returned ad-hoc
+dicts declared as response_model=dict; "ModelJSONResponse" renders the typed
+response models through cached TypeAdapters. Run from the backend directory:
+
+    python -m benchmarks.bench_serialization
+"""
+
+import json
+import timeit
+from datetime import datetime
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+
+from src.levels import CODE_LEVELS, MOVEMENT_LEVELS, CURSOR_LEVELS
+from src.schemas.game_schemas import CertificateRead, LevelData, UserProgressSummary
+from src.serialization import ModelJSONResponse
+
+ITERATIONS = 20_000
+CERTIFICATES = 20
+
+
+def legacy_summary() -> bytes:
+    user_id = uuid4()
+    payload = {
+        "user_id": str(user_id),
+        "username": "bench",
+        "max_level": 4,
+        "levels_passed": 4,
+        "total_levels": 4,
+        "all_levels_passed": True,
+        "progress_percentage": 100.0,
+        "certificates_count": CERTIFICATES,
+        "certificates": [
+            {
+                "id": str(uuid4()),
+                "certificate_name": f"cert-{i}",
+                "issued_at": datetime.utcnow().isoformat(),
+            }
+            for i in range(CERTIFICATES)
+        ],
+    }
+    return json.dumps(jsonable_encoder(payload)).encode()
+
+
+def typed_summary() -> bytes:
+    user_id = uuid4()
+    summary = UserProgressSummary(
+        user_id=user_id,
+        username="bench",
+        max_level=4,
+        levels_passed=4,
+        total_levels=4,
+        all_levels_passed=True,
+        progress_percentage=100.0,
+        certificates_count=CERTIFICATES,
+        certificates=[
+            CertificateRead(
+                id=uuid4(),
+                user_id=user_id,
+                certificate_name=f"cert-{i}",
+                issued_at=datetime.utcnow(),
+            )
+            for i in range(CERTIFICATES)
+        ],
+    )
+    return ModelJSONResponse(summary).body
+
+
+def legacy_level_data() -> bytes:
+    payload = {
+        "user_id": str(uuid4()),
+        "level_number": 4,
+        "code": CODE_LEVELS[3],
+        "movements": MOVEMENT_LEVELS[3],
+        "cursor": CURSOR_LEVELS[3],
+        "can_play": True,
+    }
+    return json.dumps(jsonable_encoder(payload)).encode()
+
+
+def typed_level_data() -> bytes:
+    level_data = LevelData(
+        user_id=uuid4(),
+        level_number=4,
+        code=CODE_LEVELS[3],
+        movements=MOVEMENT_LEVELS[3],
+        cursor=CURSOR_LEVELS[3],
+        can_play=True,
+    )
+    return ModelJSONResponse(level_data).body
+
+
+def main():
+    cases = [
+        ("user_progress_summary", legacy_summary, typed_summary),
+        ("get_level_data", legacy_level_data, typed_level_data),
+    ]
+    print(f"{'payload':>22} | {'dict + jsonable_encoder':>24} | {'ModelJSONResponse':>18} | {'speedup':>7}")
+    for name, legacy, typed in cases:
+        legacy_rate = ITERATIONS / timeit.timeit(legacy, number=ITERATIONS)
+        typed_rate = ITERATIONS / timeit.timeit(typed, number=ITERATIONS)
+        print(
+            f"{name:>22} | {legacy_rate:>18,.0f} op/s | {typed_rate:>12,.0f} op/s | "
+            f"{typed_rate / legacy_rate:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark the recorded play session encoding (src/recording.py).
+
+Generates synthetic sessions from the level catalog's solutions: each
+intended move is pressed after a human-like pause, with some wrong presses
+mixed in. Reports storage per session against the JSON upload body and the
+encode/decode throughput. Run from the backend directory:
+
+    python -m benchmarks.bench_session_recording
+"""
+
+import json
+import random
+import time
+
+from src.level_catalog import level_catalog
+from src.recording import decode_session, encode_session
+from src.turtle import MOVES
+
+SESSIONS = 2_000
+MISTAKE_RATE = 0.15
+
+
+def synthetic_session(rng: random.Random) -> tuple[list[str], list[int]]:
+    level = level_catalog.get(rng.randint(1, len(level_catalog)))
+    moves, offsets = [], []
+    offset = 0
+    # A few attempts at the level, each with pauses to think
+    for _ in range(rng.randint(1, 4)):
+        for move in level.movements:
+            offset += int(rng.lognormvariate(6.0, 0.6))  # median ~400 ms
+            if rng.random() < MISTAKE_RATE:
+                moves.append(rng.choice(MOVES))
+                offsets.append(offset)
+                offset += int(rng.lognormvariate(6.5, 0.5))
+            moves.append(move)
+            offsets.append(offset)
+        offset += int(rng.lognormvariate(8.0, 0.5))
+    return moves, offsets
+
+
+def main():
+    rng = random.Random(42)
+    sessions = [synthetic_session(rng) for _ in range(SESSIONS)]
+    events = sum(len(moves) for moves, _ in sessions)
+
+    json_bytes = sum(
+        len(json.dumps({"moves": moves, "offsets_ms": offsets}).encode()) for moves, offsets in sessions
+    )
+
+    start = time.perf_counter()
+    blobs = [encode_session(moves, offsets) for moves, offsets in sessions]
+    encode_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    decoded = [decode_session(blob) for blob in blobs]
+    decode_seconds = time.perf_counter() - start
+    assert decoded == sessions
+
+    blob_bytes = sum(len(blob) for blob in blobs)
+    print(f"{SESSIONS} sessions, {events} events ({events / SESSIONS:.1f} per session)")
+    print(f"{'format':>8} | {'bytes/session':>13} | {'bytes/event':>11}")
+    for name, total in (("json", json_bytes), ("binary", blob_bytes)):
+        print(f"{name:>8} | {total / SESSIONS:>13.1f} | {total / events:>11.2f}")
+    print(f"encode: {events / encode_seconds:,.0f} events/s")
+    print(f"decode: {events / decode_seconds:,.0f} events/s")
+
+
+if __name__ == "__main__":
+    main()
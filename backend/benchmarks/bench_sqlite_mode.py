@@ -0,0 +1,128 @@
+"""
+Benchmark concurrent reads and writes on a single SQLite file.
+
+Compares a default engine (rollback journal, shared connection pool) with the
+tuned single-node mode from src.database.create_sqlite_engines (WAL and
+pragmas, one writer connection, read-only reader pool). Writers run
+pass_level-style read-then-insert transactions while readers run the
+current_level aggregate. Run from the backend directory:
+
+    python -m benchmarks.bench_sqlite_mode
+"""
+
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from uuid import uuid4
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from src.database import Base, create_sqlite_engines
+from src.models import User, Progress
+
+USERS = 200
+CONCURRENCY = [(8, 32), (32, 128)]  # (writers, readers)
+OPERATIONS_PER_TASK = 25
+
+
+async def seed(engine: AsyncEngine) -> list:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    user_ids = [uuid4() for _ in range(USERS)]
+    async with async_sessionmaker(engine)() as session:
+        await session.execute(insert(User), [
+            {"id": uid, "email": f"u{i}@example.com", "username": f"u{i}", "hashed_password": "x",
+             "is_active": True, "is_superuser": False, "is_verified": True}
+            for i, uid in enumerate(user_ids)
+        ])
+        await session.commit()
+    return user_ids
+
+
+async def run_mode(tuned: bool, writers: int, readers: int) -> dict:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    url = f"sqlite+aiosqlite:///{path}"
+    if tuned:
+        write_engine, read_engine = create_sqlite_engines(url)
+    else:
+        write_engine = read_engine = create_async_engine(url)
+    user_ids = await seed(write_engine)
+    write_maker = async_sessionmaker(write_engine, expire_on_commit=False)
+    read_maker = async_sessionmaker(read_engine, expire_on_commit=False)
+
+    latencies = {"write": [], "read": []}
+    errors = {"write": 0, "read": 0}
+
+    async def writer(task: int):
+        for op in range(OPERATIONS_PER_TASK):
+            user_id = user_ids[(task * OPERATIONS_PER_TASK + op) % USERS]
+            start = time.perf_counter()
+            try:
+                async with write_maker() as session:
+                    current = await session.scalar(
+                        select(func.max(Progress.level)).where(Progress.user_id == user_id)
+                    )
+                    session.add(Progress(user_id=user_id, level=(current or 0) + 1))
+                    await session.commit()
+                latencies["write"].append(time.perf_counter() - start)
+            except OperationalError:
+                errors["write"] += 1
+
+    async def reader(task: int):
+        for op in range(OPERATIONS_PER_TASK):
+            user_id = user_ids[(task + op) % USERS]
+            start = time.perf_counter()
+            try:
+                async with read_maker() as session:
+                    await session.scalar(
+                        select(func.max(Progress.level)).where(Progress.user_id == user_id)
+                    )
+                latencies["read"].append(time.perf_counter() - start)
+            except OperationalError:
+                errors["read"] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(writer(task) for task in range(writers)),
+        *(reader(task) for task in range(readers)),
+    )
+    elapsed = time.perf_counter() - start
+
+    await write_engine.dispose()
+    if read_engine is not write_engine:
+        await read_engine.dispose()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    def p95(values: list[float]) -> float:
+        return statistics.quantiles(values, n=20)[-1] * 1000 if len(values) >= 2 else float("nan")
+
+    return {
+        "writes/s": len(latencies["write"]) / elapsed,
+        "reads/s": len(latencies["read"]) / elapsed,
+        "write p95 (ms)": p95(latencies["write"]),
+        "read p95 (ms)": p95(latencies["read"]),
+        "errors": errors["write"] + errors["read"],
+    }
+
+
+async def main():
+    columns = ["writes/s", "reads/s", "write p95 (ms)", "read p95 (ms)", "errors"]
+    print(f"{'mode':>8} | {'W/R':>7} | " + " | ".join(f"{c:>14}" for c in columns))
+    for writers, readers in CONCURRENCY:
+        for tuned in (False, True):
+            result = await run_mode(tuned, writers, readers)
+            print(
+                f"{'tuned' if tuned else 'default':>8} | {f'{writers}/{readers}':>7} | "
+                + " | ".join(f"{result[c]:>14.1f}" for c in columns)
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+"""
+Measure cold-start cost of the backend and enforce a budget.
+
+Each run starts a fresh interpreter in production boot mode
+(AUTO_CREATE_TABLES=False, DEBUG=False), imports src.app, runs the lifespan
+startup and serves a first request. The median of all runs is compared
+against the budgets and the script exits non-zero when one is exceeded, so it
+can gate CI. Run from the backend directory:
+
+    python -m benchmarks.bench_startup [--runs 5] [--import-budget-ms 1500]
+                                       [--first-request-budget-ms 250]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+CHILD_SCRIPT = """
+import asyncio, json, time
+start = time.perf_counter()
+from src.app import app
+imported = time.perf_counter()
+
+from httpx import AsyncClient, ASGITransport
+
+async def first_request():
+    async with app.router.lifespan_context(app):
+        started = time.perf_counter()
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+            response = await client.get("/health")
+            response.raise_for_status()
+        return started, time.perf_counter()
+
+started, served = asyncio.run(first_request())
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "lifespan_ms": (started - imported) * 1000,
+    "first_request_ms": (served - started) * 1000,
+}))
+"""
+
+
+def run_once() -> dict:
+    env = dict(os.environ, AUTO_CREATE_TABLES="False", DEBUG="False")
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=1500)
+    parser.add_argument("--first-request-budget-ms", type=float, default=250)
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    medians = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+
+    for key, value in medians.items():
+        print(f"{key:>18}: {value:8.1f} ms (median of {args.runs})")
+
+    failures = []
+    if medians["import_ms"] > args.import_budget_ms:
+        failures.append(f"import {medians['import_ms']:.1f} ms > {args.import_budget_ms} ms")
+    if medians["first_request_ms"] > args.first_request_budget_ms:
+        failures.append(
+            f"first request {medians['first_request_ms']:.1f} ms > {args.first_request_budget_ms} ms"
+        )
+
+    for failure in failures:
+        print(f"BUDGET EXCEEDED: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
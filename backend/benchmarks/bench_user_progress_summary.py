@@ -0,0 +1,118 @@
+"""
+Benchmark /game/user_progress_summary as a user's history grows.
+
+Compares the aggregate + keyset implementation served by the app against
+the previous approach of loading every Progress and Certificate row into
+Python. Run from the backend directory:
+
+    python -m benchmarks.bench_user_progress_summary
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.app import app
+from src.auth import current_active_user
+from src.database import Base, get_async_session
+from src.routes.game_routes import get_read_session
+from src.models import User, Progress, Certificate
+
+HISTORY_SIZES = [10, 100, 1_000, 10_000, 50_000]
+REQUESTS = 50
+
+
+async def legacy_summary(session: AsyncSession, user: User) -> dict:
+    """The pre-aggregate implementation: materialize every row in Python."""
+    progress_list = (
+        await session.scalars(select(Progress).where(Progress.user_id == user.id))
+    ).all()
+    cert_list = (
+        await session.scalars(select(Certificate).where(Certificate.user_id == user.id))
+    ).all()
+    return {
+        "max_level": max([p.level for p in progress_list], default=0),
+        "levels_passed": len(progress_list),
+        "certificates_count": len(cert_list),
+        "certificates": [
+            {"id": str(c.id), "certificate_name": c.certificate_name, "issued_at": c.issued_at.isoformat()}
+            for c in cert_list
+        ],
+    }
+
+
+async def run_size(history: int) -> tuple[float, float, int]:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    statements = 0
+
+    def count_statement(*args):
+        nonlocal statements
+        statements += 1
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with session_maker() as session:
+        user = User(email="bench@example.com", username="bench", hashed_password="x")
+        session.add(user)
+        await session.commit()
+        await session.execute(
+            insert(Progress),
+            [{"user_id": user.id, "level": i % 4 + 1} for i in range(history)],
+        )
+        await session.execute(
+            insert(Certificate),
+            [{"user_id": user.id, "certificate_name": f"cert-{i}"} for i in range(max(1, history // 10))],
+        )
+        await session.commit()
+
+    async def override_get_db():
+        async with session_maker() as session:
+            yield session
+
+    async def override_current_user():
+        return user
+
+    app.dependency_overrides[get_async_session] = override_get_db
+    app.dependency_overrides[get_read_session] = override_get_db
+    app.dependency_overrides[current_active_user] = override_current_user
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        start = time.perf_counter()
+        for _ in range(REQUESTS):
+            response = await client.get("/game/user_progress_summary")
+            response.raise_for_status()
+        current = (time.perf_counter() - start) / REQUESTS
+    event.remove(engine.sync_engine, "before_cursor_execute", count_statement)
+
+    async with session_maker() as session:
+        start = time.perf_counter()
+        for _ in range(REQUESTS):
+            await legacy_summary(session, user)
+        legacy = (time.perf_counter() - start) / REQUESTS
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+    os.remove(path)
+    return current, legacy, statements // REQUESTS
+
+
+async def main():
+    print(f"{'history rows':>12} | {'aggregate (ms)':>14} | {'stmts/req':>9} | {'legacy (ms)':>11}")
+    for history in HISTORY_SIZES:
+        current, legacy, statements = await run_size(history)
+        print(f"{history:>12} | {current * 1000:>14.2f} | {statements:>9} | {legacy * 1000:>11.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
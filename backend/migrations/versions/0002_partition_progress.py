@@ -0,0 +1,109 @@
+"""partition progress by month on postgresql
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 09:12:04.518377
+
+"""
+from datetime import datetime, timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Months created beyond the current one; the app keeps this window moving
+MONTHS_AHEAD = 3
+
+PROGRESS_INDEXES = (
+    ("ix_progress_level", "level"),
+    ("ix_progress_passed_at", "passed_at"),
+    ("ix_progress_user_id", "user_id"),
+    ("ix_progress_user_id_level", "user_id, level"),
+)
+
+
+def _add_month(month: datetime) -> datetime:
+    return (month + timedelta(days=32)).replace(day=1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Range partitioning is PostgreSQL-only; SQLite keeps the plain table
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE progress RENAME TO progress_unpartitioned")
+    op.execute("ALTER TABLE progress_unpartitioned RENAME CONSTRAINT progress_pkey TO progress_unpartitioned_pkey")
+    for name, _ in PROGRESS_INDEXES:
+        op.execute(f"DROP INDEX {name}")
+
+    # The partition key must be part of the primary key
+    op.execute(
+        'CREATE TABLE progress ('
+        ' id UUID NOT NULL,'
+        ' user_id UUID NOT NULL REFERENCES "user" (id) ON DELETE CASCADE,'
+        ' level INTEGER NOT NULL,'
+        ' passed_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,'
+        ' CONSTRAINT progress_pkey PRIMARY KEY (id, passed_at)'
+        ') PARTITION BY RANGE (passed_at)'
+    )
+    op.execute("CREATE TABLE progress_default PARTITION OF progress DEFAULT")
+
+    bind = op.get_bind()
+    oldest = bind.scalar(sa.text("SELECT min(passed_at) FROM progress_unpartitioned"))
+    now = datetime.utcnow()
+    month = (oldest or now).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    last = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    for _ in range(MONTHS_AHEAD):
+        last = _add_month(last)
+    while month <= last:
+        following = _add_month(month)
+        op.execute(
+            f"CREATE TABLE progress_p{month:%Y_%m} PARTITION OF progress "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{following:%Y-%m-%d}')"
+        )
+        month = following
+
+    # Indexes on the parent are created on every partition
+    for name, columns in PROGRESS_INDEXES:
+        op.execute(f"CREATE INDEX {name} ON progress ({columns})")
+
+    op.execute(
+        "INSERT INTO progress (id, user_id, level, passed_at) "
+        "SELECT id, user_id, level, passed_at FROM progress_unpartitioned"
+    )
+    op.execute("DROP TABLE progress_unpartitioned")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE progress RENAME TO progress_partitioned")
+    op.execute("ALTER TABLE progress_partitioned RENAME CONSTRAINT progress_pkey TO progress_partitioned_pkey")
+    for name, _ in PROGRESS_INDEXES:
+        op.execute(f"DROP INDEX {name}")
+
+    op.create_table('progress',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('level', sa.Integer(), nullable=False),
+    sa.Column('passed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute(
+        "INSERT INTO progress (id, user_id, level, passed_at) "
+        "SELECT id, user_id, level, passed_at FROM progress_partitioned"
+    )
+    for name, columns in PROGRESS_INDEXES:
+        op.execute(f"CREATE INDEX {name} ON progress ({columns})")
+    op.execute("DROP TABLE progress_partitioned")
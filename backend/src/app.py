@@ -1,25 +1,86 @@
 """Main FastAPI application."""
 
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from uuid import UUID
 
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 
-from src.database import engine, create_db_and_tables
+from src.database import async_session_maker, engine, read_engine
+from src.certificates import certificate_revocations
+from src.coalesce import CoalescingMiddleware, coalescing_metrics
 from src.config import settings
+from src.migrate import upgrade_database
+from src.profiler import ProfilerMiddleware, profiler
+from src.progress_buffer import progress_buffer
+from src.progress_partitions import run_partition_maintenance
+from src.rate_limit import RateLimitMiddleware
 from src.routes.auth_routes import auth_routes
 from src.routes.game_routes import router as game_router
+from src.routes.certificate_routes import router as certificate_router
+from src.routes.event_routes import router as event_router
+from src.routes.session_routes import router as session_router
+from src.routes.sync_routes import router as sync_router
+from src.routes.admin_routes import router as admin_router
+from src.duration_stats import level_duration_stats
+from src.events import event_hub
+from src.jobs import job_runner
+from src.token_revocation import token_denylist
+from src.username_index import username_index
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Manage application lifespan - create tables on startup."""
-    # Startup: Create tables
-    await create_db_and_tables()
+    """Manage application lifespan - create tables on startup in development."""
+    # Startup: migrate the schema in development (production runs src.migrate
+    # as a separate step)
+    if settings.AUTO_CREATE_TABLES:
+        await asyncio.to_thread(upgrade_database)
+    # Usernames for the registration typeahead
+    await username_index.load(async_session_maker)
+    # Mirror revoked tokens in memory, then follow other workers' revocations
+    await token_denylist.load(async_session_maker)
+    denylist_refresh = asyncio.create_task(
+        token_denylist.run(async_session_maker, settings.TOKEN_DENYLIST_REFRESH_SECONDS)
+    )
+    # Same for revoked certificates
+    await certificate_revocations.load(async_session_maker)
+    revocation_refresh = asyncio.create_task(
+        certificate_revocations.run(async_session_maker, settings.CERTIFICATE_REVOCATION_REFRESH_SECONDS)
+    )
+    # Per-level completion time sketches, merged with other workers' periodically
+    await level_duration_stats.load(async_session_maker)
+    duration_checkpoint = asyncio.create_task(
+        level_duration_stats.run(async_session_maker, settings.DURATION_CHECKPOINT_SECONDS)
+    )
+    if settings.PROGRESS_WRITE_BEHIND:
+        progress_buffer.start()
+    if settings.JOB_RUNNER_ENABLED:
+        await job_runner.recover_expired()
+        job_runner.start()
+    # Keep monthly progress partitions ahead of time (PostgreSQL only)
+    partition_maintenance = None
+    if engine.dialect.name == "postgresql":
+        partition_maintenance = asyncio.create_task(
+            run_partition_maintenance(engine, settings.PROGRESS_PARTITION_MAINTENANCE_SECONDS)
+        )
     yield
-    # Shutdown: Close engine
+    # Shutdown: Stop background tasks, drain buffered progress, then close engines
+    for task in (denylist_refresh, revocation_refresh, duration_checkpoint, partition_maintenance):
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+    with suppress(Exception):
+        await level_duration_stats.checkpoint(async_session_maker)
+    if settings.JOB_RUNNER_ENABLED:
+        await job_runner.stop()
+    if settings.PROGRESS_WRITE_BEHIND:
+        await progress_buffer.stop()
     await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
 
 
 # Create FastAPI app
@@ -29,6 +90,24 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Add admission control (added before CORS so 429s still carry CORS headers)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(
+        RateLimitMiddleware,
+        rate=settings.RATE_LIMIT_PER_SECOND,
+        burst=settings.RATE_LIMIT_BURST,
+        max_concurrent=settings.MAX_CONCURRENT_DB_REQUESTS,
+    )
+
+# Coalesce identical concurrent reads (outside admission control, so followers
+# neither spend tokens nor occupy a DB slot)
+if settings.REQUEST_COALESCING_ENABLED:
+    app.add_middleware(CoalescingMiddleware)
+
+# Mark requests covered by an on-demand profiling session (/admin/profile)
+if settings.PROFILER_ENABLED:
+    app.add_middleware(ProfilerMiddleware, profiler=profiler)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -40,13 +119,33 @@ app.add_middleware(
 
 app.include_router(auth_routes)
 app.include_router(game_router)
+app.include_router(session_router)
+app.include_router(sync_router)
+app.include_router(certificate_router)
+app.include_router(event_router)
+if settings.PROFILER_ENABLED:
+    app.include_router(admin_router)
 
 
 # Health check
 @app.get("/health", tags=["health"])
 async def health_check():
     """Health check endpoint."""
-    return {"status": "ok", "app": settings.API_TITLE}
+    health = {
+        "status": "ok",
+        "app": settings.API_TITLE,
+        "events": event_hub.stats(),
+        "auth": token_denylist.stats(),
+        "certificates": certificate_revocations.stats(),
+        "durations": level_duration_stats.stats(),
+    }
+    if settings.PROGRESS_WRITE_BEHIND:
+        health["progress_buffer"] = progress_buffer.stats()
+    if settings.JOB_RUNNER_ENABLED:
+        health["jobs"] = job_runner.stats()
+    if settings.REQUEST_COALESCING_ENABLED:
+        health["request_coalescing"] = coalescing_metrics.stats()
+    return health
 
 
 if __name__ == "__main__":
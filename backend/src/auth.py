@@ -1,25 +1,33 @@
 """Authentication setup with fastapi-users."""
 
 import logging
+import time
+from datetime import datetime, timezone
 
-from typing import Optional, Union
-from uuid import UUID
+from typing import Any, Dict, Optional, Union
+from uuid import UUID, uuid4
+
+import jwt
 
 from fastapi import Depends, Request, HTTPException, status
-from fastapi_users import BaseUserManager, FastAPIUsers, InvalidPasswordException
+from fastapi_users import BaseUserManager, FastAPIUsers, InvalidPasswordException, exceptions
 from fastapi_users.authentication import (
     AuthenticationBackend,
     BearerTransport,
     JWTStrategy,
 )
+from fastapi_users.jwt import decode_jwt, generate_jwt
 from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_object_session
+from sqlalchemy import func, or_, select
 
 from src.config import settings
 from src.database import get_async_session
-from src.models import User, get_user_db
-from src.schemas.user_schemas import UserCreate
+from src.models import OAuthAccount, User, get_auth_user_db
+from src.schemas.user_schemas import UserCreate, UserUpdate
+from src.jobs import job_runner
+from src.token_revocation import token_denylist
+from src.username_index import username_index
 
 
 class UserManager(BaseUserManager[User, UUID]):
@@ -32,7 +40,47 @@ class UserManager(BaseUserManager[User, UUID]):
         self, user: User, request: Optional[Request] = None
     ) -> None:
         """Called after successful user registration."""
-        logging.info(f"User {user.id} has registered.")
+        username_index.add(user.username)
+
+    async def update(
+        self,
+        user_update: UserUpdate,
+        user: User,
+        safe: bool = False,
+        request: Optional[Request] = None,
+    ) -> User:
+        """Update a user, keeping the availability index in step with renames."""
+        previous = user.username
+        updated_user = await super().update(user_update, user, safe=safe, request=request)
+        if updated_user.username != previous:
+            username_index.remove(previous)
+            username_index.add(updated_user.username)
+        return updated_user
+
+    async def on_after_delete(
+        self, user: User, request: Optional[Request] = None
+    ) -> None:
+        """Called after a user is deleted."""
+        username_index.remove(user.username)
+
+    async def on_after_update(
+        self, user: User, update_dict: Dict[str, Any], request: Optional[Request] = None
+    ) -> None:
+        """Called after a profile update; a new password invalidates existing tokens."""
+        if "password" in update_dict:
+            await self.revoke_existing_tokens(user)
+
+    async def on_after_reset_password(
+        self, user: User, request: Optional[Request] = None
+    ) -> None:
+        """Called after a password reset; invalidates existing tokens."""
+        await self.revoke_existing_tokens(user)
+
+    async def revoke_existing_tokens(self, user: User) -> None:
+        """Reject every access token issued to the user before now."""
+        valid_after = datetime.utcnow()
+        await self.user_db.update(user, {"tokens_valid_after": valid_after})
+        token_denylist.invalidate_user(user.id, valid_after)
 
     async def on_after_forgot_password(
         self, user: User, token: str, request: Optional[Request] = None
@@ -74,29 +122,44 @@ class UserManager(BaseUserManager[User, UUID]):
         safe: bool = False,
         request: Optional[Request] = None,
     ) -> User:
-        """Create user with duplicate email/username validation."""
-        # Check if email already exists
-        existing_email = await self.user_db.session.execute(
-            select(User).where(User.email == user_create.email)
-        )
-        if existing_email.unique().scalar_one_or_none():
+        """
+        Create a user, checking email and username with one query.
+        Replaces BaseUserManager.create, whose get_by_email would run a second,
+        eager-joined SELECT before the INSERT.
+        """
+        await self.validate_password(user_create.password, user_create)
+
+        # Both uniqueness checks, columns only; lower(email) is indexed
+        conflicts = (await self.user_db.session.execute(
+            select(User.email, User.username).where(
+                or_(
+                    func.lower(User.email) == user_create.email.lower(),
+                    User.username == user_create.username,
+                )
+            )
+        )).all()
+
+        if any(email.lower() == user_create.email.lower() for email, _ in conflicts):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered. Please use a different email.",
             )
 
-        # Check if username already exists
-        existing_username = await self.user_db.session.execute(
-            select(User).where(User.username == user_create.username)
-        )
-        if existing_username.unique().scalar_one_or_none():
+        if conflicts:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Username already taken. Please choose a different username.",
             )
 
-        # Call parent create method if validation passes
-        return await super().create(user_create, safe=safe, request=request)
+        user_dict = (
+            user_create.create_update_dict()
+            if safe
+            else user_create.create_update_dict_superuser()
+        )
+        user_dict["hashed_password"] = self.password_helper.hash(user_dict.pop("password"))
+        created_user = await self.user_db.create(user_dict)
+        await self.on_after_register(created_user, request)
+        return created_user
 
     def parse_id(self, value: any) -> UUID:
         """Parse a string ID to UUID."""
@@ -110,18 +173,106 @@ class UserManager(BaseUserManager[User, UUID]):
             )
 
 
-async def get_user_manager(user_db: SQLAlchemyUserDatabase = Depends(get_user_db)):
+class RegisteringUserDatabase(SQLAlchemyUserDatabase):
+    """User database that enqueues the user.registered job in the user's INSERT transaction."""
+
+    async def create(self, create_dict: Dict[str, Any]) -> User:
+        user = self.user_table(**create_dict)
+        self.session.add(user)
+        await self.session.flush()
+        # Follow-up work runs in the background, not in the register request
+        job_runner.enqueue(self.session, "user.registered", {"user_id": str(user.id)})
+        await self.session.commit()
+        await self.session.refresh(user)
+        return user
+
+
+async def get_user_manager(session: AsyncSession = Depends(get_async_session)):
     """Get user manager dependency."""
+    yield UserManager(RegisteringUserDatabase(session, User, OAuthAccount))
+
+
+async def get_auth_user_manager(user_db: SQLAlchemyUserDatabase = Depends(get_auth_user_db)):
+    """Get user manager for authenticating requests."""
     yield UserManager(user_db)
 
 
+@job_runner.task("user.registered")
+async def user_registered(payload: dict) -> None:
+    """Post-registration work (welcome messages, analytics) for a new user."""
+    logging.info(f"User {payload['user_id']} has registered.")
+
+
 # JWT Bearer Transport and Strategy
 bearer_transport = BearerTransport(tokenUrl="auth/jwt/login")
 
 
-def get_jwt_strategy() -> JWTStrategy:
+class RevocableJWTStrategy(JWTStrategy[User, UUID]):
+    """
+    JWT strategy whose tokens can be revoked.
+    Tokens carry a `jti` and a sub-second `iat`. Logout adds the jti to the
+    revocation list; a password change rejects every token issued before it.
+    """
+
+    async def read_token(
+        self, token: Optional[str], user_manager: BaseUserManager[User, UUID]
+    ) -> Optional[User]:
+        if token is None:
+            return None
+
+        try:
+            data = decode_jwt(
+                token, self.decode_key, self.token_audience, algorithms=[self.algorithm]
+            )
+            user_id = data.get("sub")
+            if user_id is None:
+                return None
+        except jwt.PyJWTError:
+            return None
+
+        # In-memory check, before any database lookup
+        if token_denylist.is_revoked(data.get("jti")):
+            return None
+
+        try:
+            user = await user_manager.get(user_manager.parse_id(user_id))
+        except (exceptions.UserNotExists, exceptions.InvalidID):
+            return None
+
+        if user.tokens_valid_after is not None:
+            issued_at = datetime.fromtimestamp(data.get("iat", 0), timezone.utc).replace(tzinfo=None)
+            if issued_at < user.tokens_valid_after:
+                return None
+        return user
+
+    async def write_token(self, user: User) -> str:
+        data = {
+            "sub": str(user.id),
+            "aud": self.token_audience,
+            "jti": uuid4().hex,
+            "iat": time.time(),
+        }
+        return generate_jwt(
+            data, self.encode_key, self.lifetime_seconds, algorithm=self.algorithm
+        )
+
+    async def destroy_token(self, token: str, user: User) -> None:
+        """Revoke the token on logout, through the session that loaded the user."""
+        try:
+            data = decode_jwt(
+                token, self.decode_key, self.token_audience, algorithms=[self.algorithm]
+            )
+        except jwt.PyJWTError:
+            return
+        if data.get("jti") is None or data.get("exp") is None:
+            return
+        expires_at = datetime.fromtimestamp(data["exp"], timezone.utc).replace(tzinfo=None)
+        await token_denylist.revoke(async_object_session(user), data["jti"], user.id, expires_at)
+
+
+def get_jwt_strategy() -> RevocableJWTStrategy:
     """Get JWT strategy."""
-    return JWTStrategy(
+    return RevocableJWTStrategy(
         secret=settings.SECRET_KEY,
         lifetime_seconds=settings.JWT_EXPIRATION_HOURS * 3600,
         algorithm=settings.JWT_ALGORITHM,
@@ -141,6 +292,12 @@ fastapi_users = FastAPIUsers[User, UUID](
     [jwt_authentication],
 )
 
+# Authenticates requests through read-only user lookups
+authenticator = FastAPIUsers[User, UUID](
+    get_auth_user_manager,
+    [jwt_authentication],
+)
+
 # Current user dependencies
-current_active_user = fastapi_users.current_user(active=True)
-current_superuser = fastapi_users.current_user(active=True, superuser=True)
\ No newline at end of file
+current_active_user = authenticator.current_user(active=True)
+current_superuser = authenticator.current_user(active=True, superuser=True)
\ No newline at end of file
@@ -0,0 +1,129 @@
+"""
+Certificate issuance with conflict-ignoring inserts.
+
+(user_id, certificate_name) is unique, so issuing is an INSERT ... ON
+CONFLICT DO NOTHING: a certificate that already exists (or was issued
+concurrently) is skipped by the database instead of checked for first.
+
+Bulk issuance gives a named certificate to every user whose distinct passed
+levels cover the whole catalog. Eligible users are selected in keyset chunks
+by one aggregate query (which also excludes current holders), and each chunk
+is inserted with one multi-row statement and committed on its own, so a
+large run never holds a long transaction.
+"""
+
+import logging
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from uuid import UUID, uuid4
+
+from sqlalchemy import distinct, exists, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import database
+from src.config import settings
+from src.events import event_hub
+from src.jobs import job_runner
+from src.level_catalog import level_catalog
+from src.models import Certificate, Progress
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class BulkIssueResult:
+    certificate_name: str
+    issued: int = 0
+    # Selected as eligible but issued concurrently by someone else
+    skipped: int = 0
+    chunks: int = 0
+    # Users holding the certificate once the run finished
+    holders: int = 0
+
+
+async def insert_certificates(session: AsyncSession, rows: list[dict]) -> list[Certificate]:
+    """
+    Insert certificate rows, skipping any (user_id, certificate_name) that
+    already exists. Returns the inserted certificates (not attached to the
+    session). The caller commits.
+    """
+    if not rows:
+        return []
+    dialect = postgresql if session.get_bind().dialect.name == "postgresql" else sqlite
+    stmt = (
+        dialect.insert(Certificate)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=["user_id", "certificate_name"])
+        .returning(Certificate.id, Certificate.user_id, Certificate.certificate_name, Certificate.issued_at)
+    )
+    result = await session.execute(stmt)
+    return [Certificate(**row._mapping) for row in result]
+
+
+def certificate_row(user_id: UUID, certificate_name: str) -> dict:
+    return {
+        "id": uuid4(),
+        "user_id": user_id,
+        "certificate_name": certificate_name,
+        "issued_at": datetime.utcnow(),
+    }
+
+
+async def issue_to_completers(
+    session: AsyncSession, certificate_name: str, chunk_size: int
+) -> BulkIssueResult:
+    """Issue `certificate_name` to every user who passed every catalog level."""
+    total_levels = len(level_catalog)
+    result = BulkIssueResult(certificate_name=certificate_name)
+    after = None
+    while True:
+        stmt = (
+            select(Progress.user_id)
+            .where(
+                Progress.level.between(1, total_levels),
+                ~exists().where(
+                    Certificate.user_id == Progress.user_id,
+                    Certificate.certificate_name == certificate_name,
+                ),
+            )
+            .group_by(Progress.user_id)
+            .having(func.count(distinct(Progress.level)) == total_levels)
+            .order_by(Progress.user_id)
+            .limit(chunk_size)
+        )
+        if after is not None:
+            stmt = stmt.where(Progress.user_id > after)
+        user_ids = (await session.scalars(stmt)).all()
+        if not user_ids:
+            break
+
+        issued = await insert_certificates(
+            session, [certificate_row(user_id, certificate_name) for user_id in user_ids]
+        )
+        await session.commit()
+        for certificate in issued:
+            event_hub.publish_certificate_issued(
+                certificate.user_id, certificate.certificate_name, certificate.issued_at
+            )
+        result.issued += len(issued)
+        result.skipped += len(user_ids) - len(issued)
+        result.chunks += 1
+        after = user_ids[-1]
+        if len(user_ids) < chunk_size:
+            break
+
+    result.holders = await session.scalar(
+        select(func.count()).select_from(Certificate).where(Certificate.certificate_name == certificate_name)
+    )
+    return result
+
+
+@job_runner.task("certificates.bulk_issue", max_attempts=3)
+async def bulk_issue_job(payload: dict) -> None:
+    """Background variant of POST /certificates/bulk_issue; safe to retry."""
+    async with database.async_session_maker() as session:
+        result = await issue_to_completers(
+            session, payload["certificate_name"], settings.CERTIFICATE_BULK_CHUNK_SIZE
+        )
+    logger.info("Bulk certificate issuance finished: %s", asdict(result))
@@ -0,0 +1,135 @@
+"""
+Signed certificate tokens that can be verified without a database lookup.
+
+Revocations are stored on the certificate row (revoked_at). Every process
+mirrors the revoked ids in memory, so verification stays a set lookup.
+Revocations made by this process apply immediately; those made by other
+workers are picked up by the periodic incremental refresh
+(CERTIFICATE_REVOCATION_REFRESH_SECONDS), like the token denylist.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+import jwt
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config import settings
+from src.models import Certificate
+from src.token_revocation import REFRESH_OVERLAP
+
+logger = logging.getLogger(__name__)
+
+CERTIFICATE_TOKEN_AUDIENCE = "toxic-turtle:certificate"
+CERTIFICATE_TOKEN_ALGORITHM = "HS256"
+
+
+class CertificateRevocations:
+    """In-memory mirror of the ids of revoked certificates."""
+
+    def __init__(self):
+        self._ids: set[str] = set()
+        self._watermark: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, certificate_id: str) -> bool:
+        return certificate_id in self._ids
+
+    async def revoke(self, session: AsyncSession, certificate_id: UUID) -> bool:
+        """
+        Persist a revocation and apply it to this process right away.
+        Returns False when the certificate does not exist.
+        """
+        result = await session.execute(
+            update(Certificate)
+            .where(Certificate.id == certificate_id)
+            .values(revoked_at=func.coalesce(Certificate.revoked_at, datetime.utcnow()))
+        )
+        await session.commit()
+        if result.rowcount == 0:
+            return False
+        self._ids.add(str(certificate_id))
+        return True
+
+    async def refresh(self, session: AsyncSession) -> int:
+        """Load revocations newer than the last refresh (all of them the first time)."""
+        now = datetime.utcnow()
+        stmt = select(Certificate.id).where(Certificate.revoked_at.is_not(None))
+        if self._watermark is not None:
+            stmt = stmt.where(Certificate.revoked_at >= self._watermark - REFRESH_OVERLAP)
+        ids = (await session.scalars(stmt)).all()
+        self._ids.update(str(certificate_id) for certificate_id in ids)
+        self._watermark = now
+        return len(ids)
+
+    async def load(self, session_maker: async_sessionmaker) -> None:
+        """Rebuild from the database at startup."""
+        async with session_maker() as session:
+            self._ids.clear()
+            self._watermark = None
+            await self.refresh(session)
+
+    async def run(self, session_maker: async_sessionmaker, interval_seconds: float) -> None:
+        """Refresh incrementally until cancelled."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                async with session_maker() as session:
+                    await self.refresh(session)
+            except Exception:
+                logger.exception("Certificate revocation refresh failed")
+
+    def stats(self) -> dict:
+        return {"revoked_certificates": len(self._ids)}
+
+
+certificate_revocations = CertificateRevocations()
+
+
+def _signing_key() -> str:
+    return settings.CERTIFICATE_SIGNING_KEY or settings.SECRET_KEY
+
+
+def sign_certificate(certificate: Certificate) -> str:
+    """Issue a compact HMAC-signed token over the certificate fields."""
+    payload = {
+        "jti": str(certificate.id),
+        "sub": str(certificate.user_id),
+        "name": certificate.certificate_name,
+        "issued_at": certificate.issued_at.isoformat(),
+        "aud": CERTIFICATE_TOKEN_AUDIENCE,
+    }
+    return jwt.encode(payload, _signing_key(), algorithm=CERTIFICATE_TOKEN_ALGORITHM)
+
+
+def verify_certificate_token(token: str) -> Optional[dict]:
+    """
+    Validate a certificate token purely cryptographically.
+    Returns the certificate claims, or None if the token is invalid or revoked.
+    """
+    try:
+        claims = jwt.decode(
+            token,
+            _signing_key(),
+            algorithms=[CERTIFICATE_TOKEN_ALGORITHM],
+            audience=CERTIFICATE_TOKEN_AUDIENCE,
+            options={"require": ["jti", "sub", "name", "issued_at"]},
+        )
+    except jwt.PyJWTError:
+        return None
+
+    if claims["jti"] in certificate_revocations:
+        return None
+
+    return {
+        "id": UUID(claims["jti"]),
+        "user_id": UUID(claims["sub"]),
+        "certificate_name": claims["name"],
+        "issued_at": datetime.fromisoformat(claims["issued_at"]),
+    }
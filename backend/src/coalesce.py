@@ -0,0 +1,105 @@
+"""Single-flight coalescing of identical concurrent GET requests."""
+
+import asyncio
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.rate_limit import request_token
+from src.token_revocation import token_denylist
+
+# Reads the frontend fires several times in parallel for the same user
+COALESCED_PATHS = frozenset({
+    "/users/me",
+    "/game/current_level",
+    "/game/check_pass_all_level",
+    "/game/check_if_certified_exist",
+    "/game/get_certified_data",
+    "/game/user_progress_summary",
+})
+
+
+class CoalescingMetrics:
+    """Counters of coalesced requests, shared by the middleware and /health."""
+
+    def __init__(self):
+        self.requests = 0
+        self.deduplicated = 0
+
+    def stats(self) -> dict:
+        return {"requests": self.requests, "deduplicated": self.deduplicated}
+
+
+coalescing_metrics = CoalescingMetrics()
+
+
+class CoalescingMiddleware:
+    """
+    Share one in-flight response between identical concurrent reads.
+
+    GET requests to `paths` are keyed by (path, query string, bearer token).
+    The first request (the leader) runs normally while its response messages
+    are recorded; requests with the same key arriving before it finishes wait
+    and replay that response instead of authenticating and querying again.
+    Only requests carrying the very token the leader authenticated can join,
+    and never with a token revoked by logout or a password change.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        paths: frozenset[str] = COALESCED_PATHS,
+        metrics: CoalescingMetrics = coalescing_metrics,
+    ):
+        self.app = app
+        self.paths = paths
+        self.metrics = metrics
+        self._in_flight: dict[tuple, asyncio.Future] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or scope["path"] not in self.paths
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        credentials = request_token(scope)
+        if credentials is None or token_denylist.rejects(credentials[1]):
+            # Authentication turns these away; nothing to share
+            await self.app(scope, receive, send)
+            return
+
+        self.metrics.requests += 1
+        key = (scope["path"], scope["query_string"], credentials[0])
+
+        leader = self._in_flight.get(key)
+        if leader is not None:
+            messages: Optional[list[Message]] = await asyncio.shield(leader)
+            # None means the leader failed; serve this request on its own
+            if messages is not None:
+                self.metrics.deduplicated += 1
+                for message in messages:
+                    await send(message)
+                return
+            await self.app(scope, receive, send)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        recorded: list[Message] = []
+
+        async def record(message: Message) -> None:
+            recorded.append(message)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, record)
+        except BaseException:
+            future.set_result(None)
+            raise
+        else:
+            future.set_result(recorded)
+        finally:
+            del self._in_flight[key]
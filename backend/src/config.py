@@ -14,11 +14,90 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = "sqlite+aiosqlite:///./test.db"
+    # Apply migrations on startup (development only), adopting databases
+    # created before migrations existed. Production boots with this disabled
+    # and migrates out-of-band: `python -m src.migrate`
+    AUTO_CREATE_TABLES: bool = True
+    # Optional read replica for GET game endpoints (falls back to DATABASE_URL)
+    READ_DATABASE_URL: Optional[str] = None
+    # After a write, the same user's reads go to the primary for this long
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # Single-node SQLite mode (file DATABASE_URL): WAL and tuned pragmas, one
+    # writer connection, and a read-only connection pool for reads
+    SQLITE_TUNED: bool = True
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024
+    SQLITE_READ_POOL_SIZE: int = 8
+
+    # PostgreSQL monthly progress partitions (see src/progress_partitions.py):
+    # partitions kept ahead, and optional archival of months past retention
+    PROGRESS_PARTITION_MONTHS_AHEAD: int = 3
+    PROGRESS_RETENTION_MONTHS: Optional[int] = None
+    PROGRESS_ARCHIVE_DIR: str = "./archive/progress"
+    PROGRESS_PARTITION_MAINTENANCE_SECONDS: float = 6 * 3600
+
+    # How often per-level completion time sketches are merged into the database
+    DURATION_CHECKPOINT_SECONDS: float = 30.0
+
+    # Users per chunk (one SELECT and one INSERT each) in bulk certificate issuance
+    CERTIFICATE_BULK_CHUNK_SIZE: int = 1000
+
+    # Compiled level catalog (python -m src.level_packs); defaults to src/levels.py
+    LEVEL_CATALOG_PATH: Optional[str] = None
+
+    # Write-behind buffering of pass_level progress rows (off by default).
+    # A batch failing with a transient error is retried up to
+    # PROGRESS_FLUSH_MAX_ATTEMPTS times before rows that cannot be inserted are
+    # isolated and dropped; pass_level writes directly when the queue stays
+    # full for PROGRESS_ENQUEUE_TIMEOUT_MS
+    PROGRESS_WRITE_BEHIND: bool = False
+    PROGRESS_FLUSH_INTERVAL_MS: int = 50
+    PROGRESS_FLUSH_BATCH_SIZE: int = 500
+    PROGRESS_QUEUE_MAX_SIZE: int = 50_000
+    PROGRESS_FLUSH_MAX_ATTEMPTS: int = 10
+    PROGRESS_ENQUEUE_TIMEOUT_MS: int = 1000
+
+    # Background jobs (src/jobs.py): worker count per named queue, idle poll
+    # interval, lease after which a running job is presumed crashed, and
+    # exponential retry backoff
+    JOB_RUNNER_ENABLED: bool = True
+    JOB_QUEUES: dict[str, int] = {"default": 4}
+    JOB_POLL_INTERVAL_SECONDS: float = 5.0
+    JOB_LEASE_SECONDS: float = 300.0
+    JOB_RETRY_BASE_SECONDS: float = 2.0
+    JOB_RETRY_MAX_SECONDS: float = 600.0
+    JOB_RETENTION_HOURS: float = 168.0
+
+    # Admission control: per-user token buckets on /game routes and a global
+    # cap on concurrent DB-bound requests; excess requests get 429
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_PER_SECOND: float = 10.0
+    RATE_LIMIT_BURST: int = 30
+    MAX_CONCURRENT_DB_REQUESTS: int = 64
+
+    # Share one in-flight response between identical concurrent GETs per user
+    REQUEST_COALESCING_ENABLED: bool = True
+
+    # Live progress events: per-subscriber buffer (oldest dropped when full)
+    EVENT_SUBSCRIBER_QUEUE_SIZE: int = 64
+    EVENT_KEEPALIVE_SECONDS: float = 15.0
+
+    # Superuser-only sampling profiler (POST /admin/profile)
+    PROFILER_ENABLED: bool = True
 
     # JWT
     SECRET_KEY: str = "your-secret-key-change-this-in-production"
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRATION_HOURS: int = 24
+    # How often each worker picks up tokens revoked (logout) by other workers
+    TOKEN_DENYLIST_REFRESH_SECONDS: float = 5.0
+
+    # Certificates (falls back to SECRET_KEY when unset)
+    CERTIFICATE_SIGNING_KEY: Optional[str] = None
+    # How often each worker picks up certificates revoked by other workers
+    CERTIFICATE_REVOCATION_REFRESH_SECONDS: float = 5.0
 
     # OAuth - Google
     GOOGLE_OAUTH_CLIENT_ID: Optional[str] = None
@@ -1,23 +1,95 @@
 """Database configuration and models."""
 
+import time
 from typing import AsyncGenerator
+from uuid import UUID
 
 from fastapi import Depends
 from fastapi_users_db_sqlalchemy import SQLAlchemyBaseUserTableUUID, SQLAlchemyUserDatabase
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 from src.config import settings
 
+
+def is_sqlite_file(url: str) -> bool:
+    """Whether a database URL points at an on-disk SQLite file."""
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database not in (None, "", ":memory:")
+
+
+def sqlite_pragmas(read_only: bool = False) -> list[str]:
+    """Pragmas applied to every connection in single-node SQLite mode."""
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}",
+        f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def _apply_pragmas_on_connect(engine: AsyncEngine, pragmas: list[str]) -> None:
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+def create_sqlite_engines(url: str, echo: bool = False) -> tuple[AsyncEngine, AsyncEngine]:
+    """
+    Engines for single-node SQLite mode on one database file.
+    The writer has exactly one connection, so concurrent write transactions
+    queue in the pool instead of contending for SQLite's file lock ("database
+    is locked"); WAL lets the read-only reader pool run alongside it.
+    """
+    writer = create_async_engine(url, echo=echo, pool_size=1, max_overflow=0)
+    _apply_pragmas_on_connect(writer, sqlite_pragmas())
+    reader = create_async_engine(
+        url, echo=echo, pool_size=settings.SQLITE_READ_POOL_SIZE, max_overflow=0
+    )
+    _apply_pragmas_on_connect(reader, sqlite_pragmas(read_only=True))
+    return writer, reader
+
+
+# Tuned single-writer mode when the primary database is a SQLite file
+sqlite_mode = settings.SQLITE_TUNED and is_sqlite_file(settings.DATABASE_URL)
+
 # Create async engine
-engine = create_async_engine(settings.DATABASE_URL, echo=settings.DEBUG)
+if sqlite_mode:
+    engine, _sqlite_reader = create_sqlite_engines(settings.DATABASE_URL, echo=settings.DEBUG)
+else:
+    engine, _sqlite_reader = create_async_engine(settings.DATABASE_URL, echo=settings.DEBUG), None
 
 # Create async session factory
 async_session_maker = async_sessionmaker(
     engine, expire_on_commit=False
 )
 
+# Read-only engine (replica); in SQLite mode the reader pool on the same file,
+# otherwise shares the primary engine when not configured
+read_engine = (
+    create_async_engine(settings.READ_DATABASE_URL, echo=settings.DEBUG)
+    if settings.READ_DATABASE_URL
+    else _sqlite_reader or engine
+)
+
+read_session_maker = async_sessionmaker(
+    read_engine, expire_on_commit=False
+)
+
+# user id -> monotonic time of the user's last committed write
+_recent_writes: dict[UUID, float] = {}
+
+
 class Base(DeclarativeBase):
     """Base class for all database models."""
 
@@ -30,6 +102,48 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+if sqlite_mode and not settings.READ_DATABASE_URL:
+    async def get_auth_session() -> AsyncGenerator[AsyncSession, None]:
+        """
+        Get a session for per-request user lookups.
+        In SQLite mode this is the reader pool, so authentication never waits
+        behind the single writer connection.
+        """
+        async with read_session_maker() as session:
+            yield session
+else:
+    # Same dependency as the route's session, so one connection serves both
+    get_auth_session = get_async_session
+
+
+def mark_recent_write(user_id: UUID) -> None:
+    """Record that a user just wrote, so their reads stick to the primary."""
+    now = time.monotonic()
+    _recent_writes[user_id] = now
+
+    # Drop expired entries once the map grows, keeping it bounded by active writers
+    if len(_recent_writes) > 10_000:
+        cutoff = now - settings.READ_YOUR_WRITES_SECONDS
+        for stale_id in [uid for uid, at in _recent_writes.items() if at < cutoff]:
+            del _recent_writes[stale_id]
+
+
+def has_recent_write(user_id: UUID) -> bool:
+    """Whether a user wrote within the read-your-writes window."""
+    written_at = _recent_writes.get(user_id)
+    return (
+        written_at is not None
+        and time.monotonic() - written_at < settings.READ_YOUR_WRITES_SECONDS
+    )
+
+
+def read_session_maker_for(user_id: UUID) -> async_sessionmaker:
+    """Pick the replica session factory unless the user has a pending write."""
+    if read_engine is engine or has_recent_write(user_id):
+        return async_session_maker
+    return read_session_maker
+
+
 async def create_db_and_tables():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
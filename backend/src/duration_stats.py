@@ -0,0 +1,175 @@
+"""
+Per-level completion time percentiles from streaming quantile sketches.
+
+Each level has a DDSketch-style sketch: durations are counted in
+logarithmic buckets whose width is RELATIVE_ACCURACY of their value, so any
+quantile is estimated within 1% relative error from a few hundred counters
+per level, without keeping or scanning the individual durations. Sketches
+merge by adding bucket counts, which makes checkpoints from several workers
+exact.
+
+Each process records durations into its in-memory totals and into a
+pending sketch per level. The checkpoint task (DURATION_CHECKPOINT_SECONDS)
+merges pending counts into the level_duration_sketch rows, then reloads
+the rows, so every worker's totals also include the other workers'
+checkpointed durations.
+"""
+
+import asyncio
+import logging
+import math
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.models import LevelDurationSketch
+
+logger = logging.getLogger(__name__)
+
+RELATIVE_ACCURACY = 0.01
+
+
+class DurationSketch:
+    """Mergeable quantile sketch of millisecond durations."""
+
+    gamma = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+    _log_gamma = math.log(gamma)
+
+    def __init__(self, count: int = 0, zero_count: int = 0, bins: Optional[dict[int, int]] = None):
+        self.count = count
+        # Durations below 1 ms, which have no logarithmic bucket
+        self.zero_count = zero_count
+        self.bins: dict[int, int] = bins or {}
+
+    def add(self, duration_ms: float) -> None:
+        self.count += 1
+        if duration_ms < 1:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(duration_ms) / self._log_gamma)
+        self.bins[index] = self.bins.get(index, 0) + 1
+
+    def merge(self, other: "DurationSketch") -> None:
+        self.count += other.count
+        self.zero_count += other.zero_count
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated q-quantile (0 <= q <= 1) in ms, or None when empty."""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if rank < seen:
+                # Midpoint of (gamma^(i-1), gamma^i] that is within the relative accuracy
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+
+    def to_row(self) -> dict:
+        return {
+            "count": self.count,
+            "zero_count": self.zero_count,
+            "bins": {str(index): count for index, count in self.bins.items()},
+        }
+
+    @classmethod
+    def from_row(cls, row: LevelDurationSketch) -> "DurationSketch":
+        return cls(
+            count=row.count,
+            zero_count=row.zero_count,
+            bins={int(index): count for index, count in row.bins.items()},
+        )
+
+
+class LevelDurationStats:
+    """In-memory sketches per level, checkpointed to level_duration_sketch."""
+
+    def __init__(self):
+        self._totals: dict[int, DurationSketch] = {}
+        self._pending: dict[int, DurationSketch] = {}
+        self.checkpoints = 0
+        self.checkpoint_failures = 0
+
+    def record(self, level: int, duration_ms: float) -> None:
+        self._totals.setdefault(level, DurationSketch()).add(duration_ms)
+        self._pending.setdefault(level, DurationSketch()).add(duration_ms)
+
+    def sketch(self, level: int) -> DurationSketch:
+        return self._totals.get(level) or DurationSketch()
+
+    def _reload(self, rows) -> None:
+        totals = {row.level: DurationSketch.from_row(row) for row in rows}
+        # Durations recorded while the checkpoint was running are not in the rows yet
+        for level, pending in self._pending.items():
+            totals.setdefault(level, DurationSketch()).merge(pending)
+        self._totals = totals
+
+    async def load(self, session_maker: async_sessionmaker) -> None:
+        async with session_maker() as session:
+            self._reload((await session.scalars(select(LevelDurationSketch))).all())
+
+    async def checkpoint(self, session_maker: async_sessionmaker) -> None:
+        """Merge pending durations into the stored sketches and reload them."""
+        pending, self._pending = self._pending, {}
+        committed = False
+        try:
+            async with session_maker() as session:
+                if pending:
+                    stored = {
+                        row.level: row
+                        for row in (await session.scalars(
+                            select(LevelDurationSketch)
+                            .where(LevelDurationSketch.level.in_(pending))
+                            .with_for_update()
+                        )).all()
+                    }
+                    for level, delta in pending.items():
+                        row = stored.get(level)
+                        if row is None:
+                            session.add(LevelDurationSketch(level=level, **delta.to_row()))
+                            continue
+                        merged = DurationSketch.from_row(row)
+                        merged.merge(delta)
+                        for key, value in merged.to_row().items():
+                            setattr(row, key, value)
+                        row.updated_at = datetime.utcnow()
+                    await session.commit()
+                    committed = True
+                    self.checkpoints += 1
+                rows = (await session.scalars(select(LevelDurationSketch))).all()
+        except Exception:
+            # Keep the counts for the next checkpoint, unless they are stored
+            # already and only the reload failed
+            if not committed:
+                for level, delta in pending.items():
+                    self._pending.setdefault(level, DurationSketch()).merge(delta)
+            raise
+        self._reload(rows)
+
+    async def run(self, session_maker: async_sessionmaker, interval_seconds: float) -> None:
+        """Checkpoint periodically until cancelled."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.checkpoint(session_maker)
+            except Exception:
+                self.checkpoint_failures += 1
+                logger.exception("Duration sketch checkpoint failed")
+
+    def stats(self) -> dict:
+        return {
+            "levels": len(self._totals),
+            "pending": sum(sketch.count for sketch in self._pending.values()),
+            "checkpoints": self.checkpoints,
+            "checkpoint_failures": self.checkpoint_failures,
+        }
+
+
+level_duration_stats = LevelDurationStats()
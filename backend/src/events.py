@@ -0,0 +1,112 @@
+"""In-process pub/sub hub for live progress events."""
+
+import asyncio
+from collections import deque
+from datetime import datetime
+from typing import Iterable, Optional
+from uuid import UUID
+
+from src.config import settings
+from src.schemas.game_schemas import ProgressEvent
+from src.serialization import get_type_adapter
+
+LEVEL_PASSED = "level_passed"
+CERTIFICATE_ISSUED = "certificate_issued"
+
+
+class Subscriber:
+    """
+    One live connection: a bounded buffer of serialized events.
+    When the buffer is full the oldest event is dropped, so a slow client can
+    never make publishers wait or grow memory.
+    """
+
+    __slots__ = ("user_ids", "dropped", "_events", "_ready")
+
+    def __init__(self, user_ids: Optional[frozenset[UUID]], max_queue: int):
+        self.user_ids = user_ids
+        self.dropped = 0
+        self._events: deque[bytes] = deque(maxlen=max_queue)
+        self._ready = asyncio.Event()
+
+    def push(self, payload: bytes) -> None:
+        if len(self._events) == self._events.maxlen:
+            self.dropped += 1
+        self._events.append(payload)
+        self._ready.set()
+
+    async def drain(self, timeout: float) -> list[bytes]:
+        """Wait up to `timeout` seconds for events and take everything buffered."""
+        if not self._events:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        events = list(self._events)
+        self._events.clear()
+        self._ready.clear()
+        return events
+
+
+class EventHub:
+    """
+    Fan out progress events to subscribers filtered by user.
+
+    Subscribers are indexed by the user ids they follow (None = every user),
+    so publishing touches only interested subscribers, and each event is
+    serialized once and shared by all of them. Subscribers only see events
+    published by the same worker process.
+    """
+
+    def __init__(self, max_queue: int):
+        self.max_queue = max_queue
+        self._by_user: dict[UUID, set[Subscriber]] = {}
+        self._everyone: set[Subscriber] = set()
+        self.subscribers = 0
+        self.published = 0
+
+    def subscribe(self, user_ids: Optional[Iterable[UUID]] = None) -> Subscriber:
+        subscriber = Subscriber(
+            frozenset(user_ids) if user_ids is not None else None, self.max_queue
+        )
+        self.subscribers += 1
+        if subscriber.user_ids is None:
+            self._everyone.add(subscriber)
+        else:
+            for user_id in subscriber.user_ids:
+                self._by_user.setdefault(user_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self.subscribers -= 1
+        if subscriber.user_ids is None:
+            self._everyone.discard(subscriber)
+            return
+        for user_id in subscriber.user_ids:
+            followers = self._by_user.get(user_id)
+            if followers is not None:
+                followers.discard(subscriber)
+                if not followers:
+                    del self._by_user[user_id]
+
+    def publish(self, event: ProgressEvent) -> None:
+        payload = get_type_adapter(ProgressEvent).dump_json(event)
+        self.published += 1
+        for subscriber in self._everyone:
+            subscriber.push(payload)
+        for subscriber in self._by_user.get(event.user_id, ()):
+            subscriber.push(payload)
+
+    def publish_level_passed(self, user_id: UUID, level: int, at: datetime) -> None:
+        self.publish(ProgressEvent(type=LEVEL_PASSED, user_id=user_id, level=level, at=at))
+
+    def publish_certificate_issued(self, user_id: UUID, certificate_name: str, at: datetime) -> None:
+        self.publish(ProgressEvent(
+            type=CERTIFICATE_ISSUED, user_id=user_id, certificate_name=certificate_name, at=at
+        ))
+
+    def stats(self) -> dict:
+        return {"subscribers": self.subscribers, "published": self.published}
+
+
+event_hub = EventHub(max_queue=settings.EVENT_SUBSCRIBER_QUEUE_SIZE)
@@ -0,0 +1,76 @@
+"""
+Precomputed target geometry of every level.
+
+Each level's drawing is traced once from its movements at import time and
+kept as a packed little-endian binary blob:
+
+    offset  type        field
+    0       4 bytes     magic b"TTG1"
+    4       uint32      level number
+    8       uint32      point count N
+    12      4 x float32 bounding box (min_x, min_y, max_x, max_y)
+    28      N x 2 x f32 polyline points (x, y)
+
+Coordinates are grid units (one SPACE press) on a y-up grid, with the turtle
+starting at the origin facing up.
+
+`version` is a hash of the blob. /game/levels lists it so clients can fetch
+/game/levels/{n}/geometry?v=<version>, a URL whose content never changes.
+"""
+
+import hashlib
+import struct
+from dataclasses import dataclass
+
+from src.level_catalog import Level, level_catalog
+from src.turtle import trace
+
+MAGIC = b"TTG1"
+HEADER = struct.Struct("<4sII4f")
+
+
+@dataclass(frozen=True, slots=True)
+class LevelGeometry:
+    """The traced polyline of a level and its packed binary encoding."""
+
+    level: int
+    points: tuple[tuple[int, int], ...]
+    bbox: tuple[int, int, int, int]
+    packed: bytes
+    version: str
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.version}"'
+
+
+def pack_geometry(level: int, points: list[tuple[int, int]], bbox: tuple[int, int, int, int]) -> bytes:
+    coordinates = [value for point in points for value in point]
+    return HEADER.pack(MAGIC, level, len(points), *bbox) + struct.pack(f"<{len(coordinates)}f", *coordinates)
+
+
+def unpack_geometry(data: bytes) -> tuple[int, tuple[float, ...], list[tuple[float, float]]]:
+    """Decode a packed blob into (level, bbox, points)."""
+    magic, level, count, *bbox = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a level geometry blob")
+    coordinates = struct.unpack_from(f"<{2 * count}f", data, HEADER.size)
+    return level, tuple(bbox), list(zip(coordinates[::2], coordinates[1::2]))
+
+
+def build_geometry(level: Level) -> LevelGeometry:
+    points = trace(level.movements)
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    bbox = (min(xs), min(ys), max(xs), max(ys))
+    packed = pack_geometry(level.number, points, bbox)
+    return LevelGeometry(
+        level=level.number,
+        points=tuple(points),
+        bbox=bbox,
+        packed=packed,
+        version=hashlib.sha256(packed).hexdigest()[:32],
+    )
+
+
+level_geometry: dict[int, LevelGeometry] = {level.number: build_geometry(level) for level in level_catalog}
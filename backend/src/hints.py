@@ -0,0 +1,188 @@
+"""
+Precomputed hint tables: the next correct key from any turtle state.
+
+A player's state is the step they are on (how many moves of the solution
+they have matched) plus the turtle's grid position and heading. On the
+solution path the hint is simply the level's next move. Off the path (after
+a wrong key) it is the first key of a shortest way back to where the step
+expects the turtle to be. Hints are given on a grid around the level's
+drawing (HINT_MARGIN units on each side).
+
+The way back only depends on the turtle's position relative to the target
+and on the two headings, and a shortest path never leaves the rectangle
+between the two positions. So one return table serves every level and step
+whose hint area fits its radius: a breadth-first search from the origin for
+each target heading, stored as flat byte arrays indexed by
+((target_heading * size + dy + radius) * size + dx + radius) * 4 + heading.
+Answering a hint is a bounds check, one index computation and two byte
+reads. Headings are indexes into src.turtle.HEADINGS (0 up, 1 left, 2 down,
+3 right).
+
+Table size and build time grow with radius squared, and generated levels
+can be much larger than the built-in ones. So return tables are built on
+the first hint that needs them, for radii rounded up to a power of two
+(levels of similar size share one), and the radius is capped at
+MAX_RETURN_RADIUS (a table of about 135 KB, built in a fraction of a
+second). On a larger level, a turtle further than that from the expected
+state gets no hint, as if it had left the hint area.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from src.level_catalog import Level, level_catalog
+from src.turtle import INVERSE, MOVES, step
+
+HINT_MARGIN = 2
+MAX_DISTANCE = 0xFF
+MIN_RETURN_RADIUS = 8
+MAX_RETURN_RADIUS = 32
+
+_MOVE_CODES = {move: code for code, move in enumerate(MOVES)}
+
+
+@dataclass(frozen=True, slots=True)
+class ReturnTable:
+    """First key and distance from any offset and heading back to a target state."""
+
+    radius: int
+    # Move code (index into MOVES) of the first key towards the target
+    moves: bytes
+    # Keys needed to reach the target, capped at MAX_DISTANCE
+    distances: bytes
+
+    def lookup(self, dx: int, dy: int, heading: int, target_heading: int) -> Optional[tuple[int, int]]:
+        if not (-self.radius <= dx <= self.radius and -self.radius <= dy <= self.radius):
+            return None
+        size = 2 * self.radius + 1
+        index = ((target_heading * size + dy + self.radius) * size + dx + self.radius) * 4 + heading
+        return self.moves[index], self.distances[index]
+
+
+def build_return_table(radius: int) -> ReturnTable:
+    size = 2 * radius + 1
+    layer = size * size * 4
+    moves = bytearray(4 * layer)
+    distances = bytearray(4 * layer)
+    reached = bytearray(4 * layer)
+
+    for target_heading in range(4):
+        base = target_heading * layer
+
+        def index(x: int, y: int, heading: int) -> Optional[int]:
+            if -radius <= x <= radius and -radius <= y <= radius:
+                return base + ((y + radius) * size + x + radius) * 4 + heading
+            return None
+
+        # Search backwards from the target: a state one key away from a
+        # reached state gets that key as its hint
+        target = (0, 0, target_heading)
+        reached[index(*target)] = 1
+        queue = deque([target])
+        while queue:
+            state = queue.popleft()
+            distance = distances[index(*state)]
+            for move in MOVES:
+                previous = step(*state, INVERSE[move])
+                previous_index = index(*previous)
+                if previous_index is None or reached[previous_index]:
+                    continue
+                reached[previous_index] = 1
+                moves[previous_index] = _MOVE_CODES[move]
+                distances[previous_index] = min(distance + 1, MAX_DISTANCE)
+                queue.append(previous)
+
+    return ReturnTable(radius=radius, moves=bytes(moves), distances=bytes(distances))
+
+
+def return_radius(offset: int) -> int:
+    """Radius of the shared return table that covers offsets up to `offset`."""
+    radius = MIN_RETURN_RADIUS
+    while radius < offset and radius < MAX_RETURN_RADIUS:
+        radius *= 2
+    return radius
+
+
+@lru_cache(maxsize=None)
+def return_table(radius: int) -> ReturnTable:
+    """The return table of a radius from return_radius, built on first use."""
+    return build_return_table(radius)
+
+
+@dataclass(frozen=True, slots=True)
+class HintTable:
+    """Solution path and hint area of one level."""
+
+    level: int
+    steps: int
+    x_min: int
+    y_min: int
+    width: int
+    height: int
+    # Expected (x, y, heading) before each step
+    path: tuple[tuple[int, int, int], ...]
+    # Move code (index into MOVES) of each step's correct key
+    movements: bytes
+    return_radius: int
+
+    def lookup(self, step_index: int, x: int, y: int, heading: int) -> Optional[tuple[str, int]]:
+        """
+        (next key, keys to get back on the path), or None outside the hint area
+        or further from the expected state than the return table reaches.
+        """
+        if not (0 <= step_index < self.steps and 0 <= x - self.x_min < self.width
+                and 0 <= y - self.y_min < self.height and 0 <= heading < 4):
+            return None
+        target_x, target_y, target_heading = self.path[step_index]
+        if (x, y, heading) == (target_x, target_y, target_heading):
+            return MOVES[self.movements[step_index]], 0
+        found = return_table(self.return_radius).lookup(x - target_x, y - target_y, heading, target_heading)
+        if found is None:
+            return None
+        code, distance = found
+        return MOVES[code], distance
+
+
+def _solution_path(movements: tuple[str, ...]) -> list[tuple[int, int, int]]:
+    state = (0, 0, 0)
+    path = []
+    for move in movements:
+        path.append(state)
+        state = step(*state, move)
+    return path
+
+
+def _hint_area(path: list[tuple[int, int, int]]) -> tuple[int, int, int, int]:
+    """(x_min, y_min, width, height) of the grid hints are given on."""
+    positions = path + [(0, 0, 0)]
+    x_min = min(x for x, _, _ in positions) - HINT_MARGIN
+    y_min = min(y for _, y, _ in positions) - HINT_MARGIN
+    width = max(x for x, _, _ in positions) + HINT_MARGIN - x_min + 1
+    height = max(y for _, y, _ in positions) + HINT_MARGIN - y_min + 1
+    return x_min, y_min, width, height
+
+
+def build_hint_tables(levels: Iterable[Level]) -> dict[int, HintTable]:
+    paths = {level.number: (level, _solution_path(level.movements)) for level in levels}
+    areas = {number: _hint_area(path) for number, (_, path) in paths.items()}
+
+    return {
+        number: HintTable(
+            level=number,
+            steps=len(path),
+            x_min=areas[number][0],
+            y_min=areas[number][1],
+            width=areas[number][2],
+            height=areas[number][3],
+            path=tuple(path),
+            movements=bytes(_MOVE_CODES[move] for move in level.movements),
+            # Offsets between two states of one hint area are below its width and height
+            return_radius=return_radius(max(areas[number][2], areas[number][3]) - 1),
+        )
+        for number, (level, path) in paths.items()
+    }
+
+
+hint_tables: dict[int, HintTable] = build_hint_tables(level_catalog)
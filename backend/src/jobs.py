@@ -0,0 +1,315 @@
+"""
+In-process background jobs backed by the job table.
+
+Handlers are registered by name on a queue:
+
+    @job_runner.task("user.registered")
+    async def user_registered(payload: dict) -> None: ...
+
+and enqueued inside the request's own transaction, so a job exists exactly
+when the write that caused it commits:
+
+    job_runner.enqueue(session, "user.registered", {"user_id": str(user.id)})
+    await session.commit()   # the queue's workers are woken after commit
+
+Each queue in JOB_QUEUES runs that many worker tasks. A worker claims the
+oldest due job by flipping it from pending to running with a lease; a failed
+job is retried with exponential backoff until max_attempts, then marked
+failed. While a handler runs its lease is renewed every third of the lease,
+so long jobs keep it; jobs still running when their lease expires (the
+process crashed or was killed) are returned to pending, so nothing enqueued
+is lost.
+
+Stopping never cancels a task in the middle of a query: the sweeper and the
+lease heartbeats wait on events, and workers finish their current job.
+"""
+
+import asyncio
+import logging
+import random
+import traceback
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional
+from uuid import UUID
+
+from sqlalchemy import delete, event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src import database
+from src.config import settings
+from src.models import Job
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[dict], Awaitable[None]]
+
+
+@dataclass(frozen=True, slots=True)
+class JobType:
+    name: str
+    handler: JobHandler
+    queue: str
+    max_attempts: int
+
+
+class JobRunner:
+    def __init__(
+        self,
+        queues: dict[str, int],
+        poll_interval: float,
+        lease_seconds: float,
+        retry_base_seconds: float,
+        retry_max_seconds: float,
+    ):
+        self.queues = queues
+        self.poll_interval = poll_interval
+        self.lease = timedelta(seconds=lease_seconds)
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self._types: dict[str, JobType] = {}
+        self._wakeups: dict[str, asyncio.Event] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._sweeper_task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._stop_event = asyncio.Event()
+
+        # Metrics
+        self.completed = 0
+        self.retried = 0
+        self.failed = 0
+        self.recovered = 0
+
+    def task(self, name: str, queue: str = "default", max_attempts: int = 5):
+        """Register a coroutine function as the handler of a job name."""
+        def register(handler: JobHandler) -> JobHandler:
+            self._types[name] = JobType(name, handler, queue, max_attempts)
+            return handler
+        return register
+
+    def enqueue(
+        self, session: AsyncSession, name: str, payload: dict, delay_seconds: float = 0.0
+    ) -> Job:
+        """Add a job to the caller's transaction; it runs once that commits."""
+        job_type = self._types[name]
+        job = Job(
+            queue=job_type.queue,
+            name=name,
+            payload=payload,
+            max_attempts=job_type.max_attempts,
+            run_after=datetime.utcnow() + timedelta(seconds=delay_seconds),
+        )
+        session.add(job)
+        session.info.setdefault("job_queues", set()).add(job_type.queue)
+        return job
+
+    def notify(self, queue: str) -> None:
+        wakeup = self._wakeups.get(queue)
+        if wakeup is not None:
+            wakeup.set()
+
+    def retry_delay(self, attempts: int) -> float:
+        """Exponential backoff with jitter, capped at retry_max_seconds."""
+        delay = min(self.retry_base_seconds * 2 ** (attempts - 1), self.retry_max_seconds)
+        return delay * random.uniform(0.5, 1.0)
+
+    async def recover_expired(self) -> int:
+        """Return jobs whose lease ran out (crashed worker) to pending."""
+        async with database.async_session_maker() as session:
+            result = await session.execute(
+                update(Job)
+                .where(Job.status == "running", Job.locked_until < datetime.utcnow())
+                .values(status="pending", locked_until=None)
+            )
+            await session.commit()
+        self.recovered += result.rowcount
+        return result.rowcount
+
+    async def renew_lease(self, job_id: UUID) -> None:
+        async with database.async_session_maker() as session:
+            await session.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == "running")
+                .values(locked_until=datetime.utcnow() + self.lease)
+            )
+            await session.commit()
+
+    async def purge_finished(self, older_than: timedelta) -> None:
+        async with database.async_session_maker() as session:
+            await session.execute(
+                delete(Job).where(
+                    Job.status == "done", Job.finished_at < datetime.utcnow() - older_than
+                )
+            )
+            await session.commit()
+
+    async def _claim(self, queue: str) -> Optional[tuple[UUID, str, dict, int, int]]:
+        """Atomically move the oldest due job of a queue to running."""
+        async with database.async_session_maker() as session:
+            while True:
+                now = datetime.utcnow()
+                candidate = await session.scalar(
+                    select(Job.id)
+                    .where(Job.queue == queue, Job.status == "pending", Job.run_after <= now)
+                    .order_by(Job.run_after)
+                    .limit(1)
+                    .with_for_update(skip_locked=True)
+                )
+                if candidate is None:
+                    await session.rollback()
+                    return None
+                claimed = await session.execute(
+                    update(Job)
+                    .where(Job.id == candidate, Job.status == "pending")
+                    .values(status="running", attempts=Job.attempts + 1, locked_until=now + self.lease)
+                    .returning(Job.id, Job.name, Job.payload, Job.attempts, Job.max_attempts)
+                )
+                row = claimed.first()
+                await session.commit()
+                if row is not None:
+                    return tuple(row)
+                # Another worker claimed it first; look again
+
+    async def _finish(self, job_id: UUID, attempts: int, max_attempts: int, error: Optional[str]) -> None:
+        now = datetime.utcnow()
+        if error is None:
+            values = {"status": "done", "finished_at": now, "locked_until": None, "last_error": None}
+            self.completed += 1
+        elif attempts < max_attempts:
+            values = {
+                "status": "pending",
+                "run_after": now + timedelta(seconds=self.retry_delay(attempts)),
+                "locked_until": None,
+                "last_error": error,
+            }
+            self.retried += 1
+        else:
+            values = {"status": "failed", "finished_at": now, "locked_until": None, "last_error": error}
+            self.failed += 1
+        async with database.async_session_maker() as session:
+            await session.execute(update(Job).where(Job.id == job_id).values(**values))
+            await session.commit()
+
+    async def _run_one(self, queue: str) -> bool:
+        claimed = await self._claim(queue)
+        if claimed is None:
+            return False
+        job_id, name, payload, attempts, max_attempts = claimed
+        job_type = self._types.get(name)
+        error = None
+        if job_type is None:
+            error = f"No handler registered for job {name!r}"
+        else:
+            done = asyncio.Event()
+            heartbeat = asyncio.create_task(self._heartbeat(job_id, done))
+            try:
+                await job_type.handler(payload)
+            except Exception:
+                error = traceback.format_exc(limit=5)
+                logger.warning("Job %s (%s) failed on attempt %d", job_id, name, attempts)
+            finally:
+                done.set()
+                await heartbeat
+        await self._finish(job_id, attempts, max_attempts, error)
+        return True
+
+    async def _worker(self, queue: str) -> None:
+        wakeup = self._wakeups[queue]
+        while not self._stopping:
+            try:
+                if await self._run_one(queue):
+                    continue
+            except Exception:
+                logger.exception("Job worker for queue %r failed", queue)
+            # Idle: sleep until a commit enqueues work here, or the next poll
+            # (jobs from other processes and delayed retries)
+            wakeup.clear()
+            await self._wait(wakeup, self.poll_interval)
+
+    async def _heartbeat(self, job_id: UUID, done: asyncio.Event) -> None:
+        """Renew a running job's lease until `done` is set."""
+        while not await self._wait(done, self.lease.total_seconds() / 3):
+            try:
+                await self.renew_lease(job_id)
+            except Exception:
+                logger.exception("Renewing the lease of job %s failed", job_id)
+
+    @staticmethod
+    async def _wait(event: asyncio.Event, timeout: float) -> bool:
+        """Wait until `event` is set (True) or `timeout` seconds pass (False)."""
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def _sweeper(self) -> None:
+        while not self._stopping:
+            try:
+                recovered = await self.recover_expired()
+                if self._stopping:
+                    break
+                if recovered:
+                    for queue in self.queues:
+                        self.notify(queue)
+                await self.purge_finished(timedelta(hours=settings.JOB_RETENTION_HOURS))
+            except Exception:
+                logger.exception("Job sweeper failed")
+            await self._wait(self._stop_event, self.lease.total_seconds() / 2)
+
+    def start(self) -> None:
+        self._stopping = False
+        self._stop_event = asyncio.Event()
+        self._wakeups = {queue: asyncio.Event() for queue in self.queues}
+        self._sweeper_task = asyncio.create_task(self._sweeper())
+        self._tasks = [
+            asyncio.create_task(self._worker(queue))
+            for queue, concurrency in self.queues.items()
+            for _ in range(concurrency)
+        ]
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Let workers finish their current job, then cancel what is left."""
+        self._stopping = True
+        self._stop_event.set()
+        for wakeup in self._wakeups.values():
+            wakeup.set()
+        tasks = self._tasks + ([self._sweeper_task] if self._sweeper_task is not None else [])
+        self._tasks, self._sweeper_task = [], None
+        if not tasks:
+            return
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "queues": self.queues,
+            "completed": self.completed,
+            "retried": self.retried,
+            "failed": self.failed,
+            "recovered": self.recovered,
+        }
+
+
+job_runner = JobRunner(
+    queues=settings.JOB_QUEUES,
+    poll_interval=settings.JOB_POLL_INTERVAL_SECONDS,
+    lease_seconds=settings.JOB_LEASE_SECONDS,
+    retry_base_seconds=settings.JOB_RETRY_BASE_SECONDS,
+    retry_max_seconds=settings.JOB_RETRY_MAX_SECONDS,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_job_workers(session: Session) -> None:
+    """Wake the workers of queues that received jobs in the committed transaction."""
+    for queue in session.info.pop("job_queues", ()):
+        job_runner.notify(queue)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_jobs(session: Session) -> None:
+    session.info.pop("job_queues", None)
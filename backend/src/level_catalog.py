@@ -0,0 +1,143 @@
+"""Level catalog: indexed, paginated access to every playable level."""
+
+import hashlib
+import json
+from bisect import bisect_right
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from src.config import settings
+from src.levels import CODE_LEVELS, MOVEMENT_LEVELS, CURSOR_LEVELS
+
+DEFAULT_PACK = "core"
+DEFAULT_WORLD = 1
+ARTIFACT_FORMAT = 1
+
+
+@dataclass(frozen=True, slots=True)
+class Level:
+    """A single level. `number` is its 1-based position in the progression."""
+
+    number: int
+    pack: str
+    world: int
+    code: tuple[str, ...]
+    movements: tuple[str, ...]
+    cursor: tuple[int, ...]
+
+
+class LevelCatalog:
+    """
+    All levels ordered by number, with per-pack and per-world indexes so a
+    filtered keyset page is a bisect plus a slice, whatever the catalog size.
+    """
+
+    def __init__(self, levels: Iterable[Level]):
+        self._levels: list[Level] = sorted(levels, key=lambda level: level.number)
+        self._numbers = [level.number for level in self._levels]
+        if self._numbers != list(range(1, len(self._levels) + 1)):
+            raise ValueError("Level numbers must be contiguous and start at 1")
+
+        self._by_pack: dict[str, list[Level]] = {}
+        self._by_world: dict[int, list[Level]] = {}
+        self._by_pack_world: dict[tuple[str, int], list[Level]] = {}
+        for level in self._levels:
+            self._by_pack.setdefault(level.pack, []).append(level)
+            self._by_world.setdefault(level.world, []).append(level)
+            self._by_pack_world.setdefault((level.pack, level.world), []).append(level)
+
+    def __len__(self) -> int:
+        return len(self._levels)
+
+    def __iter__(self):
+        return iter(self._levels)
+
+    def get(self, number: int) -> Optional[Level]:
+        """Level by number, or None when out of range."""
+        if 1 <= number <= len(self._levels):
+            return self._levels[number - 1]
+        return None
+
+    def page(
+        self,
+        after: int = 0,
+        limit: int = 50,
+        pack: Optional[str] = None,
+        world: Optional[int] = None,
+    ) -> list[Level]:
+        """Up to `limit` levels numbered above `after`, optionally filtered."""
+        if pack is not None and world is not None:
+            candidates = self._by_pack_world.get((pack, world), [])
+        elif pack is not None:
+            candidates = self._by_pack.get(pack, [])
+        elif world is not None:
+            candidates = self._by_world.get(world, [])
+        else:
+            candidates = self._levels
+
+        start = bisect_right(candidates, after, key=lambda level: level.number)
+        return candidates[start:start + limit]
+
+
+def catalog_from_lists(
+    code_levels: list[list[str]],
+    movement_levels: list[list[str]],
+    cursor_levels: list[list[int]],
+    pack: str = DEFAULT_PACK,
+    world: int = DEFAULT_WORLD,
+) -> LevelCatalog:
+    """Build a catalog from the parallel level lists of src/levels.py."""
+    return LevelCatalog(
+        Level(
+            number=index + 1,
+            pack=pack,
+            world=world,
+            code=tuple(code),
+            movements=tuple(movements),
+            cursor=tuple(cursor),
+        )
+        for index, (code, movements, cursor) in enumerate(
+            zip(code_levels, movement_levels, cursor_levels, strict=True)
+        )
+    )
+
+
+def levels_checksum(levels: list[dict]) -> str:
+    """SHA-256 over the canonical JSON encoding of compiled levels."""
+    canonical = json.dumps(levels, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def catalog_from_artifact(path: str | Path) -> LevelCatalog:
+    """
+    Load a catalog compiled by `python -m src.level_packs`.
+    Levels were validated at compile time; only the checksum is verified here.
+    """
+    artifact = json.loads(Path(path).read_text())
+    if artifact.get("format") != ARTIFACT_FORMAT:
+        raise ValueError(f"Unsupported level catalog format in {path}")
+    if levels_checksum(artifact["levels"]) != artifact["sha256"]:
+        raise ValueError(f"Level catalog checksum mismatch in {path}")
+
+    return LevelCatalog(
+        Level(
+            number=level["number"],
+            pack=level["pack"],
+            world=level["world"],
+            code=tuple(level["code"]),
+            movements=tuple(level["movements"]),
+            cursor=tuple(level["cursor"]),
+        )
+        for level in artifact["levels"]
+    )
+
+
+def load_level_catalog() -> LevelCatalog:
+    """The compiled catalog when LEVEL_CATALOG_PATH is set, else the built-in levels."""
+    if settings.LEVEL_CATALOG_PATH:
+        return catalog_from_artifact(settings.LEVEL_CATALOG_PATH)
+    return catalog_from_lists(CODE_LEVELS, MOVEMENT_LEVELS, CURSOR_LEVELS)
+
+
+level_catalog = load_level_catalog()
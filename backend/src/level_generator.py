@@ -0,0 +1,159 @@
+"""
+Generate level packs procedurally from difficulty parameters.
+
+Candidates are random KTurtle programs (forward/backward runs separated by
+quarter turns). Their movements and cursors come from src.turtle, so every
+generated level is valid by construction. Candidates that draw the same
+figure as an earlier level, up to rotation and translation, are dropped: the
+traced polyline is rotated four ways, each shifted to the origin, and the
+smallest is hashed. Levels are ordered from easiest to hardest.
+
+    python -m src.level_generator --count 2000 -o packs/generated.json
+    python -m src.level_generator --count 2000 --artifact levels.catalog.json
+
+The first form writes a pack for src.level_packs; the second compiles the
+built-in levels plus the generated pack straight into a catalog artifact
+for LEVEL_CATALOG_PATH.
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from src.level_packs import builtin_pack, compile_packs
+from src.levels import DOWN, LEFT, RIGHT
+from src.turtle import STEP_UNITS, TURN_DEGREES, expand_code, trace
+
+# Give up after this many candidates per requested level
+MAX_ATTEMPTS_PER_LEVEL = 50
+
+
+@dataclass(frozen=True, slots=True)
+class Difficulty:
+    """Parameters of the programs to generate."""
+
+    min_commands: int = 2
+    max_commands: int = 6
+    # Longest single forward/backward, in grid steps
+    max_step: int = 4
+    # Chance that a turn follows a move, when the program is not over
+    turn_rate: float = 0.5
+    # Chance that a move is backward instead of forward
+    backward_rate: float = 0.0
+    # Longest solution, in key presses
+    max_moves: int = 40
+
+
+def random_code(rng: random.Random, difficulty: Difficulty) -> list[str]:
+    """A random program that starts and ends with a move and never turns twice in a row."""
+    count = rng.randint(difficulty.min_commands, difficulty.max_commands)
+    code: list[str] = []
+    while len(code) < count:
+        last_was_move = bool(code) and not code[-1].startswith("turn")
+        if last_was_move and len(code) < count - 1 and rng.random() < difficulty.turn_rate:
+            code.append(f"{rng.choice(('turnleft', 'turnright'))} {TURN_DEGREES}")
+            continue
+        command = "backward" if rng.random() < difficulty.backward_rate else "forward"
+        code.append(f"{command} {rng.randint(1, difficulty.max_step) * STEP_UNITS}")
+    return code
+
+
+def canonical_hash(movements: list[str]) -> str:
+    """Hash of the drawn polyline, the same for every rotation and translation of it."""
+    points = trace(movements)
+    variants = []
+    for _ in range(4):
+        min_x = min(x for x, _ in points)
+        min_y = min(y for _, y in points)
+        variants.append(tuple((x - min_x, y - min_y) for x, y in points))
+        points = [(-y, x) for x, y in points]
+    return hashlib.sha256(repr(min(variants)).encode()).hexdigest()[:32]
+
+
+def difficulty_score(movements: list[str]) -> int:
+    """Rough difficulty: key presses, with turns and backward steps weighing more."""
+    return len(movements) + sum(2 for move in movements if move in (LEFT, RIGHT)) + movements.count(DOWN)
+
+
+def generate_levels(
+    count: int,
+    difficulty: Difficulty,
+    seed: Optional[int] = None,
+    exclude: Optional[list[dict]] = None,
+) -> list[dict]:
+    """
+    Up to `count` distinct levels as pack entries, easiest first. Figures
+    already drawn by `exclude` levels are not generated again.
+    """
+    rng = random.Random(seed)
+    seen = {canonical_hash(level["movements"]) for level in exclude or []}
+    generated = []
+    for _ in range(count * MAX_ATTEMPTS_PER_LEVEL):
+        if len(generated) == count:
+            break
+        code = random_code(rng, difficulty)
+        movements, cursor = expand_code(code)
+        if len(movements) > difficulty.max_moves:
+            continue
+        key = canonical_hash(movements)
+        if key in seen:
+            continue
+        seen.add(key)
+        generated.append((difficulty_score(movements), key, {"code": code, "movements": movements, "cursor": cursor}))
+
+    generated.sort(key=lambda item: item[:2])
+    return [level for _, _, level in generated]
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    defaults = Difficulty()
+    parser = argparse.ArgumentParser(description="Generate a level pack.")
+    parser.add_argument("--count", type=int, default=1000, help="Levels to generate")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed, for reproducible packs")
+    parser.add_argument("--name", default="generated", help="Pack name")
+    parser.add_argument("--world", type=int, default=2, help="World of the generated levels")
+    parser.add_argument("--commands", type=int, nargs=2, metavar=("MIN", "MAX"),
+                        default=(defaults.min_commands, defaults.max_commands), help="Code lines per level")
+    parser.add_argument("--max-step", type=int, default=defaults.max_step, help="Longest move, in grid steps")
+    parser.add_argument("--turn-rate", type=float, default=defaults.turn_rate)
+    parser.add_argument("--backward-rate", type=float, default=defaults.backward_rate)
+    parser.add_argument("--max-moves", type=int, default=defaults.max_moves, help="Longest solution")
+    parser.add_argument("-o", "--output", help="Write the pack JSON here")
+    parser.add_argument("--artifact", help="Compile built-in + generated levels into a catalog artifact here")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Worker processes for --artifact")
+    args = parser.parse_args(argv)
+
+    difficulty = Difficulty(
+        min_commands=args.commands[0],
+        max_commands=args.commands[1],
+        max_step=args.max_step,
+        turn_rate=args.turn_rate,
+        backward_rate=args.backward_rate,
+        max_moves=args.max_moves,
+    )
+    core = builtin_pack()
+    levels = generate_levels(args.count, difficulty, seed=args.seed, exclude=core["levels"])
+    pack = {"name": args.name, "world": args.world, "levels": levels}
+    print(f"Generated {len(levels)} distinct levels (requested {args.count})")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(pack, separators=(",", ":")))
+        print(f"Wrote {args.output}")
+    if args.artifact:
+        artifact, errors = compile_packs([core, pack], workers=args.workers)
+        for error in errors:
+            print(f"ERROR {error}", file=sys.stderr)
+        if errors:
+            return 1
+        Path(args.artifact).write_text(json.dumps(artifact, separators=(",", ":")))
+        print(f"Wrote {args.artifact} ({len(artifact['levels'])} levels, sha256 {artifact['sha256']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+Validate level packs and compile them into a checksummed catalog artifact.
+
+A level pack is a JSON file:
+
+    {"name": "core", "world": 1,
+     "levels": [{"code": ["forward 10"], "movements": ["space"], "cursor": [0]}]}
+
+Every level is validated by simulation across a process pool, then all packs
+are numbered in the order given and written as one artifact that the server
+loads at startup (LEVEL_CATALOG_PATH) without re-validating:
+
+    python -m src.level_packs packs/*.json --output levels.catalog.json
+    python -m src.level_packs              # validate the built-in src/levels.py
+"""
+
+import argparse
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from src.level_catalog import (
+    ARTIFACT_FORMAT,
+    DEFAULT_PACK,
+    DEFAULT_WORLD,
+    levels_checksum,
+)
+from src.levels import CODE_LEVELS, CURSOR_LEVELS, MOVEMENT_LEVELS
+from src.turtle import MOVES, InvalidCommand, drawn_segments, expand_code
+
+
+def builtin_pack() -> dict:
+    """The levels defined in src/levels.py as a pack."""
+    return {
+        "name": DEFAULT_PACK,
+        "world": DEFAULT_WORLD,
+        "levels": [
+            {"code": code, "movements": movements, "cursor": cursor}
+            for code, movements, cursor in zip(CODE_LEVELS, MOVEMENT_LEVELS, CURSOR_LEVELS)
+        ],
+    }
+
+
+def load_pack(path: str | Path) -> dict:
+    """Read a pack file; the pack name defaults to the file name."""
+    pack = json.loads(Path(path).read_text())
+    pack.setdefault("name", Path(path).stem)
+    pack.setdefault("world", DEFAULT_WORLD)
+    return pack
+
+
+def validate_level(level: dict) -> list[str]:
+    """
+    Check one level; returns a list of problems (empty when valid).
+    The moves must be exactly the key presses of the code, each cursor entry
+    must point at the code line its move executes, and replaying the moves
+    must draw the same figure as running the code.
+    """
+    if not isinstance(level, dict):
+        return ["level must be an object"]
+    code = level.get("code")
+    movements = level.get("movements")
+    cursor = level.get("cursor")
+    if not isinstance(code, list) or not isinstance(movements, list) or not isinstance(cursor, list):
+        return ["code, movements and cursor must all be lists"]
+
+    errors = []
+    if not code:
+        errors.append("code is empty")
+    if len(movements) != len(cursor):
+        errors.append(f"{len(movements)} movements but {len(cursor)} cursor entries")
+    unknown = sorted({move for move in movements if move not in MOVES})
+    if unknown:
+        errors.append(f"unknown movements {unknown}")
+    out_of_range = [index for index in cursor if not (0 <= index < len(code))]
+    if out_of_range:
+        errors.append(f"cursor indices out of range: {out_of_range}")
+    if errors:
+        return errors
+
+    try:
+        expected_moves, expected_cursor = expand_code(code)
+    except InvalidCommand as exc:
+        return [str(exc)]
+
+    if movements != expected_moves:
+        errors.append(f"movements {movements} do not match code (expected {expected_moves})")
+    elif cursor != expected_cursor:
+        errors.append(f"cursor {cursor} does not follow code (expected {expected_cursor})")
+    if drawn_segments(movements) != drawn_segments(expected_moves):
+        errors.append("movements do not draw the code's figure")
+    return errors
+
+
+def compile_packs(packs: list[dict], workers: Optional[int] = None) -> tuple[dict, list[str]]:
+    """
+    Validate every level of every pack in parallel and build the artifact.
+    Returns the artifact and a list of "pack #n: problem" errors; levels
+    with problems are left out of the artifact, and the rest are numbered
+    without gaps.
+    """
+    entries = [
+        (pack, position, level)
+        for pack in packs
+        for position, level in enumerate(pack["levels"], start=1)
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(
+            validate_level, [level for _, _, level in entries], chunksize=max(1, len(entries) // 64)
+        ))
+
+    errors = []
+    levels = []
+    for (pack, position, level), problems in zip(entries, results):
+        if problems:
+            errors.extend(f"{pack['name']} #{position}: {problem}" for problem in problems)
+            continue
+        levels.append({
+            "number": len(levels) + 1,
+            "pack": pack["name"],
+            "world": level.get("world", pack["world"]),
+            "code": level["code"],
+            "movements": level["movements"],
+            "cursor": level["cursor"],
+        })
+
+    artifact = {
+        "format": ARTIFACT_FORMAT,
+        "packs": [pack["name"] for pack in packs],
+        "sha256": levels_checksum(levels),
+        "levels": levels,
+    }
+    return artifact, errors
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Validate and compile level packs.")
+    parser.add_argument("packs", nargs="*", help="Pack JSON files (default: built-in levels)")
+    parser.add_argument("-o", "--output", help="Write the compiled catalog artifact here")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Worker processes")
+    args = parser.parse_args(argv)
+
+    packs = [load_pack(path) for path in args.packs] or [builtin_pack()]
+    artifact, errors = compile_packs(packs, workers=args.workers)
+
+    for error in errors:
+        print(f"ERROR {error}", file=sys.stderr)
+    if errors:
+        return 1
+
+    print(f"{len(artifact['levels'])} levels in {len(packs)} pack(s) valid, sha256 {artifact['sha256']}")
+    if args.output:
+        Path(args.output).write_text(json.dumps(artifact, separators=(",", ":")))
+        print(f"Wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
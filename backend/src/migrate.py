@@ -0,0 +1,172 @@
+"""
+Bring the database schema up to the latest migration.
+
+    python -m src.migrate
+
+Runs `alembic upgrade head`. Databases created before the schema was managed
+by Alembic (tables made by Base.metadata.create_all, no alembic_version
+table) are adopted first: the newest revision whose schema the database
+fully contains is stamped, then the remaining migrations run as usual. A
+database holding objects of a later revision than the one it can be stamped
+at (create_all added new tables but could not alter existing ones) cannot be
+adopted automatically; the error says which revisions are incomplete.
+"""
+
+import asyncio
+import logging
+import sys
+import warnings
+from pathlib import Path
+from typing import Callable
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import SAWarning
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+SchemaCheck = Callable[[Connection], bool]
+
+
+def _tables(*names: str) -> SchemaCheck:
+    return lambda conn: all(inspect(conn).has_table(name) for name in names)
+
+
+def _column(table: str, column: str) -> SchemaCheck:
+    def check(conn: Connection) -> bool:
+        inspector = inspect(conn)
+        return inspector.has_table(table) and column in {c["name"] for c in inspector.get_columns(table)}
+    return check
+
+
+def _unique(table: str, name: str) -> SchemaCheck:
+    def check(conn: Connection) -> bool:
+        inspector = inspect(conn)
+        if not inspector.has_table(table):
+            return False
+        constraints = {c["name"] for c in inspector.get_unique_constraints(table)}
+        indexes = {i["name"] for i in inspector.get_indexes(table) if i["unique"]}
+        return name in constraints | indexes
+    return check
+
+
+def _index(table: str, name: str) -> SchemaCheck:
+    def check(conn: Connection) -> bool:
+        inspector = inspect(conn)
+        if not inspector.has_table(table):
+            return False
+        with warnings.catch_warnings():
+            # SQLite cannot reflect expression indexes (ix_user_email_lower);
+            # they are never markers, so skipping them is fine
+            warnings.filterwarnings("ignore", "Skipped unsupported reflection", SAWarning)
+            return name in {i["name"] for i in inspector.get_indexes(table)}
+    return check
+
+
+def _progress_partitioned(conn: Connection) -> bool:
+    # Partitioning (0002) only exists on PostgreSQL
+    if conn.dialect.name != "postgresql":
+        return True
+    return bool(conn.scalar(text(
+        "SELECT count(*) FROM pg_partitioned_table WHERE partrelid = 'progress'::regclass"
+    )))
+
+
+def _all(*checks: SchemaCheck) -> SchemaCheck:
+    return lambda conn: all(check(conn) for check in checks)
+
+
+# What each revision adds, for recognising schemas built by create_all.
+# Schemas are managed by migrations only from here on, so revisions after
+# these never need an entry.
+SCHEMA_MARKERS: tuple[tuple[str, SchemaCheck], ...] = (
+    ("0001", _tables("user", "certificate", "oauth_account", "progress")),
+    ("0002", _progress_partitioned),
+    ("0003", _all(_tables("revoked_token"), _column("user", "tokens_valid_after"))),
+    ("0004", _tables("job")),
+    ("0005", _tables("play_session")),
+    ("0006", _all(_tables("level_duration_sketch"), _column("progress", "duration_ms"))),
+    ("0007", _unique("certificate", "uq_certificate_user_id_certificate_name")),
+    ("0008", _tables("sync_device")),
+    ("0009", _index("user", "ix_user_tokens_valid_after")),
+)
+
+# Indexes of 0001 that the earliest create_all schemas did not have yet
+INITIAL_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS ix_progress_user_id_level ON progress (user_id, level)",
+    "CREATE INDEX IF NOT EXISTS ix_certificate_user_id_issued_at_id ON certificate (user_id, issued_at, id)",
+)
+
+
+def adoptable_revision(conn: Connection) -> str | None:
+    """
+    Revision to stamp an unversioned database at, or None when it is empty
+    (or already versioned). Raises RuntimeError for mixed schemas.
+    """
+    inspector = inspect(conn)
+    if inspector.has_table("alembic_version") or not inspector.has_table("user"):
+        return None
+
+    present = [check(conn) for _, check in SCHEMA_MARKERS]
+    complete = present.index(False) if False in present else len(present)
+    if complete == 0:
+        raise RuntimeError("Unversioned database without the initial schema; cannot adopt it")
+    later = [revision for (revision, _), found in zip(SCHEMA_MARKERS[complete:], present[complete:]) if found]
+    if later:
+        missing = [revision for (revision, _), found in zip(SCHEMA_MARKERS, present) if not found]
+        raise RuntimeError(
+            f"Unversioned database contains objects of revisions {', '.join(later)} but lacks "
+            f"parts of {', '.join(missing)}. Complete those by hand and run "
+            f"`alembic stamp {later[-1]}`, or recreate the database."
+        )
+
+    for statement in INITIAL_INDEXES:
+        conn.execute(text(statement))
+    return SCHEMA_MARKERS[complete - 1][0]
+
+
+def alembic_config() -> Config:
+    config = Config(str(ALEMBIC_INI))
+    # Keep the application's logging setup when run from the app
+    config.attributes["configure_logger"] = False
+    return config
+
+
+async def _adopt(url: str) -> str | None:
+    engine = create_async_engine(url)
+    try:
+        async with engine.begin() as conn:
+            return await conn.run_sync(adoptable_revision)
+    finally:
+        await engine.dispose()
+
+
+def upgrade_database() -> None:
+    """Adopt a pre-migration schema if needed, then upgrade to head (blocking)."""
+    config = alembic_config()
+    revision = asyncio.run(_adopt(settings.DATABASE_URL))
+    if revision is not None:
+        logger.warning("Adopting unversioned database schema at revision %s", revision)
+        command.stamp(config, revision)
+    command.upgrade(config, "head")
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO)
+    try:
+        upgrade_database()
+    except RuntimeError as exc:
+        print(f"ERROR {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
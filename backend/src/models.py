@@ -1,6 +1,7 @@
 """Database models."""
 
 from datetime import datetime, timezone
+from typing import Optional
 from uuid import uuid4, UUID
 
 from fastapi import Depends
@@ -9,11 +10,13 @@ from fastapi_users_db_sqlalchemy import (
     SQLAlchemyUserDatabase,
     SQLAlchemyBaseOAuthAccountTableUUID,
 )
-from sqlalchemy import Boolean, DateTime, String, Integer, ForeignKey
+from sqlalchemy import (
+    JSON, Boolean, DateTime, String, Integer, ForeignKey, Index, LargeBinary, Text, UniqueConstraint, func, text,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, relationship, mapped_column
 
-from src.database import Base, get_async_session
+from src.database import Base, get_async_session, get_auth_session
 
 
 class OAuthAccount(SQLAlchemyBaseOAuthAccountTableUUID, Base):
@@ -26,6 +29,10 @@ class User(SQLAlchemyBaseUserTableUUID, Base):
     """User model with UUID primary key and OAuth2 support."""
 
     __tablename__ = "user"
+    __table_args__ = (
+        # Emails are compared case-insensitively (registration, login)
+        Index("ix_user_email_lower", func.lower(text("email"))),
+    )
 
     # UUID primary key - auto-generated
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
@@ -47,21 +54,25 @@ class User(SQLAlchemyBaseUserTableUUID, Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
+    # Access tokens issued before this moment are rejected (set on password change)
+    tokens_valid_after: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, index=True)
+    # Last progress.seq handed out for this user (see src/progress_sequence.py)
+    progress_seq: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
     
     # OAuth2 accounts relationship
     oauth_accounts: Mapped[list[OAuthAccount]] = relationship(
         "OAuthAccount", lazy="joined", cascade="all, delete-orphan"
     )
     
-    # Game progress relationship
+    # Game progress relationship (not joined: loading a user must not pull its history)
     progress_records: Mapped[list["Progress"]] = relationship(
-        "Progress", lazy="joined", cascade="all, delete-orphan",
+        "Progress", lazy="select", cascade="all, delete-orphan",
         back_populates="user"
     )
     
     # Certificates relationship
     certificates: Mapped[list["Certificate"]] = relationship(
-        "Certificate", lazy="joined", cascade="all, delete-orphan",
+        "Certificate", lazy="select", cascade="all, delete-orphan",
         back_populates="user"
     )
 
@@ -70,6 +81,10 @@ class Progress(Base):
     """Progress model - tracks user level completion."""
 
     __tablename__ = "progress"
+    __table_args__ = (
+        Index("ix_progress_user_id_level", "user_id", "level"),
+        Index("ix_progress_user_id_seq", "user_id", "seq"),
+    )
 
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
     user_id: Mapped[UUID] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"), index=True)
@@ -77,6 +92,10 @@ class Progress(Base):
     passed_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, index=True
     )
+    # Play time reported by the client, when it sent one
+    duration_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # Commit-ordered position among the user's progress rows (sync cursors)
+    seq: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     user: Mapped[User] = relationship("User", back_populates="progress_records")
 
 
@@ -84,6 +103,10 @@ class Certificate(Base):
     """Certificate model - tracks user certifications."""
 
     __tablename__ = "certificate"
+    __table_args__ = (
+        Index("ix_certificate_user_id_issued_at_id", "user_id", "issued_at", "id"),
+        UniqueConstraint("user_id", "certificate_name", name="uq_certificate_user_id_certificate_name"),
+    )
 
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
     user_id: Mapped[UUID] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"), index=True)
@@ -91,9 +114,94 @@ class Certificate(Base):
     issued_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, index=True
     )
+    # Set when revoked; its verification token is rejected from then on
+    revoked_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, index=True)
     user: Mapped[User] = relationship("User", back_populates="certificates")
 
 
+class RevokedToken(Base):
+    """Revoked access token (logout), kept until the token's own expiry."""
+
+    __tablename__ = "revoked_token"
+
+    jti: Mapped[str] = mapped_column(String(64), primary_key=True)
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"), index=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, index=True)
+    revoked_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, index=True
+    )
+
+
+class Job(Base):
+    """Background job (see src/jobs.py), durable so it survives a crash."""
+
+    __tablename__ = "job"
+    __table_args__ = (
+        Index("ix_job_queue_status_run_after", "queue", "status", "run_after"),
+    )
+
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
+    queue: Mapped[str] = mapped_column(String(64))
+    name: Mapped[str] = mapped_column(String(128))
+    payload: Mapped[dict] = mapped_column(JSON, default=dict)
+    # pending -> running -> done | failed (running -> pending again on retry)
+    status: Mapped[str] = mapped_column(String(16), default="pending", index=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, default=5)
+    run_after: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    locked_until: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+
+class LevelDurationSketch(Base):
+    """Checkpointed completion time sketch of a level (see src/duration_stats.py)."""
+
+    __tablename__ = "level_duration_sketch"
+
+    level: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    count: Mapped[int] = mapped_column(Integer, default=0)
+    zero_count: Mapped[int] = mapped_column(Integer, default=0)
+    # Logarithmic bucket index -> count
+    bins: Mapped[dict] = mapped_column(JSON, default=dict)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class PlaySession(Base):
+    """Recorded key presses of one attempt at a level (blob format: src/recording.py)."""
+
+    __tablename__ = "play_session"
+    __table_args__ = (
+        Index("ix_play_session_user_id_level_started_at", "user_id", "level", "started_at"),
+    )
+
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"))
+    level: Mapped[int] = mapped_column(Integer)
+    started_at: Mapped[datetime] = mapped_column(DateTime)
+    event_count: Mapped[int] = mapped_column(Integer)
+    duration_ms: Mapped[int] = mapped_column(Integer)
+    events: Mapped[bytes] = mapped_column(LargeBinary)
+    uploaded_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class SyncDevice(Base):
+    """Highest progress event sequence applied from one of a user's devices (see /game/sync)."""
+
+    __tablename__ = "sync_device"
+
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"), primary_key=True)
+    device_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    last_sequence: Mapped[int] = mapped_column(Integer, default=0)
+    last_synced_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
 async def get_user_db(session: AsyncSession = Depends(get_async_session)):
     """Get user database dependency for fastapi-users."""
     yield SQLAlchemyUserDatabase(session, User, OAuthAccount)
+
+
+async def get_auth_user_db(session: AsyncSession = Depends(get_auth_session)):
+    """User database for authenticating requests (read-only lookups)."""
+    yield SQLAlchemyUserDatabase(session, User, OAuthAccount)
@@ -0,0 +1,171 @@
+"""
+On-demand sampling profiler for a running worker.
+
+A daemon thread samples the event loop thread's Python stack every few
+milliseconds through sys._current_frames() and counts identical stacks.
+The result is the collapsed-stack format read by flamegraph.pl, speedscope
+and similar tools: one line per distinct stack, frames root-first separated
+by ';', then a space and the sample count.
+
+Samples show where the event loop thread is running (or blocked), which is
+what stalls every in-flight request. Coroutines suspended on I/O cost the
+loop nothing and are not on the stack.
+
+A session either runs for a fixed time or covers the next N requests whose
+path starts with a prefix; in the latter case samples are only taken while
+such a request is in flight. When no session is active the middleware costs
+one attribute check per request and there is no sampling thread.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+from collections import Counter
+from typing import Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+_SITE_PACKAGES = "site-packages" + os.sep
+_SOURCE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+
+
+class ProfilerBusy(RuntimeError):
+    """A profiling session is already running in this worker."""
+
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    if _SITE_PACKAGES in filename:
+        filename = filename.split(_SITE_PACKAGES, 1)[1]
+    elif filename.startswith(_SOURCE_ROOT):
+        filename = filename[len(_SOURCE_ROOT):]
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ",")
+
+
+class SamplingProfiler:
+    def __init__(self):
+        self.route_prefix: Optional[str] = None
+        self._lock = threading.Lock()
+        self._running = False
+        self._session = 0
+        self._in_flight = 0
+        self._requests_left = 0
+        self._requests_done: Optional[asyncio.Event] = None
+        self._samples: Counter[str] = Counter()
+        self._labels: dict = {}
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def _collapse(self, frame) -> str:
+        labels = self._labels
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            label = labels.get(code)
+            if label is None:
+                label = labels[code] = _frame_label(code)
+            names.append(label)
+            frame = frame.f_back
+        names.reverse()
+        return ";".join(names)
+
+    def _sample_loop(self, thread_id: int, interval: float, stop: threading.Event) -> None:
+        while not stop.wait(interval):
+            if self.route_prefix is not None and self._in_flight == 0:
+                continue
+            frame = sys._current_frames().get(thread_id)
+            if frame is not None:
+                self._samples[self._collapse(frame)] += 1
+
+    def _begin(self) -> None:
+        with self._lock:
+            if self._running:
+                raise ProfilerBusy("A profiling session is already running")
+            self._running = True
+        self._session += 1
+        self._samples = Counter()
+        self._labels = {}
+
+    async def _sample_while(self, interval: float, waiter) -> str:
+        stop = threading.Event()
+        sampler = threading.Thread(
+            target=self._sample_loop,
+            args=(threading.get_ident(), interval, stop),
+            name="sampling-profiler",
+            daemon=True,
+        )
+        sampler.start()
+        try:
+            await waiter
+        finally:
+            stop.set()
+            await asyncio.to_thread(sampler.join)
+            self.route_prefix = None
+            self._running = False
+        return self.collapsed()
+
+    async def profile_for(self, seconds: float, interval: float) -> str:
+        """Sample the event loop thread for `seconds`."""
+        self._begin()
+        return await self._sample_while(interval, asyncio.sleep(seconds))
+
+    async def profile_requests(self, prefix: str, count: int, interval: float, timeout: float) -> str:
+        """Sample while requests under `prefix` run, until `count` have finished or `timeout`."""
+        self._begin()
+        self._in_flight = 0
+        self._requests_left = count
+        self._requests_done = asyncio.Event()
+        self.route_prefix = prefix
+
+        async def wait_for_requests():
+            try:
+                await asyncio.wait_for(self._requests_done.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+        return await self._sample_while(interval, wait_for_requests())
+
+    def request_started(self) -> int:
+        self._in_flight += 1
+        return self._session
+
+    def request_finished(self, session: int) -> None:
+        # Ignore requests that outlived the session they started in
+        if session != self._session:
+            return
+        self._in_flight -= 1
+        self._requests_left -= 1
+        if self._requests_left <= 0 and self._requests_done is not None:
+            self._requests_done.set()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self._samples.most_common())
+
+    def stats(self) -> dict:
+        return {"running": self._running, "samples": sum(self._samples.values())}
+
+
+class ProfilerMiddleware:
+    """Marks requests under the profiled route prefix as in flight."""
+
+    def __init__(self, app: ASGIApp, profiler: "SamplingProfiler"):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        prefix = self.profiler.route_prefix
+        if prefix is None or scope["type"] != "http" or not scope["path"].startswith(prefix):
+            await self.app(scope, receive, send)
+            return
+
+        session = self.profiler.request_started()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.profiler.request_finished(session)
+
+
+profiler = SamplingProfiler()
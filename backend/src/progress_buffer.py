@@ -0,0 +1,240 @@
+"""Write-behind buffer for progress rows recorded by pass_level."""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import database
+from src.config import settings
+from src.models import Progress
+from src.progress_sequence import assign_progress_seq
+
+logger = logging.getLogger(__name__)
+
+# Queue marker telling the flush task to finish the current batch and exit
+_STOP = object()
+
+# Longest pause between attempts to flush a failing batch, in seconds
+MAX_RETRY_DELAY = 5.0
+
+
+class ProgressBufferFull(Exception):
+    """The queue stayed full for longer than the enqueue timeout."""
+
+
+class ProgressWriteBuffer:
+    """
+    Acknowledge progress immediately and persist it in batches.
+
+    pass_level validates against an in-memory "highest level passed" per user
+    and enqueues the row; a background task flushes the queue with one
+    multi-row INSERT every PROGRESS_FLUSH_INTERVAL_MS or PROGRESS_FLUSH_BATCH_SIZE
+    rows, whichever comes first. Rows become visible to reads after the flush.
+
+    A batch that fails is retried with backoff; after max_attempts (or at
+    once for integrity errors, which retrying cannot fix) it is split in
+    halves until the rows that cannot be inserted are isolated, and those
+    are logged and dropped so one bad row never wedges the queue. The
+    in-memory level is only kept for users with rows still queued.
+    """
+
+    def __init__(
+        self,
+        flush_interval_ms: int,
+        batch_size: int,
+        max_queue_size: int,
+        max_attempts: int = 10,
+        enqueue_timeout_ms: int = 1000,
+    ):
+        self.flush_interval = flush_interval_ms / 1000
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.enqueue_timeout = enqueue_timeout_ms / 1000
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=max_queue_size)
+        self._max_level: dict[UUID, int] = {}
+        # Rows queued or being flushed, per user
+        self._unflushed: dict[UUID, int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.rows_flushed = 0
+        self.rows_dropped = 0
+        self.batches_flushed = 0
+        self.flush_failures = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+
+    async def highest_level_passed(self, user_id: UUID, session: AsyncSession, refresh: bool = False) -> int:
+        """Highest level passed by a user, loaded from the database on first use."""
+        cached = self._max_level.get(user_id)
+        if cached is None or refresh:
+            stored = await session.scalar(
+                select(func.max(Progress.level)).where(Progress.user_id == user_id)
+            )
+            # Rows still queued in this process may be ahead of the database
+            cached = max(stored or 0, cached or 0)
+            if user_id in self._unflushed:
+                self._max_level[user_id] = cached
+        return cached
+
+    async def can_pass(self, user_id: UUID, level: int, session: AsyncSession) -> bool:
+        """Whether every level before `level` has been passed."""
+        if level <= await self.highest_level_passed(user_id, session) + 1:
+            return True
+        # Another worker may have recorded progress for this user; re-check once
+        return level <= await self.highest_level_passed(user_id, session, refresh=True) + 1
+
+    async def enqueue(self, user_id: UUID, level: int, duration_ms: Optional[int] = None) -> dict:
+        """
+        Queue a progress row and return it as it will be stored. Raises
+        ProgressBufferFull when the queue stays full for enqueue_timeout.
+        """
+        row = {
+            "id": uuid4(),
+            "user_id": user_id,
+            "level": level,
+            "passed_at": datetime.utcnow(),
+            "duration_ms": duration_ms,
+        }
+        try:
+            await asyncio.wait_for(self.queue.put(row), self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            raise ProgressBufferFull(f"Progress queue full ({self.queue.maxsize} rows)")
+        self._unflushed[user_id] = self._unflushed.get(user_id, 0) + 1
+        self._max_level[user_id] = max(self._max_level.get(user_id, 0), level)
+        return row
+
+    def _forget(self, rows: list[dict]) -> None:
+        """Drop the in-memory level of users whose rows have all left the buffer."""
+        for row in rows:
+            user_id = row["user_id"]
+            remaining = self._unflushed.get(user_id, 1) - 1
+            if remaining > 0:
+                self._unflushed[user_id] = remaining
+            else:
+                self._unflushed.pop(user_id, None)
+                self._max_level.pop(user_id, None)
+
+    async def _next_batch(self) -> tuple[list[dict], bool]:
+        """
+        Wait for the first row, then collect until the batch is full or the
+        interval ends. Also returns whether the stop marker was reached.
+        """
+        row = await self.queue.get()
+        if row is _STOP:
+            return [], True
+        batch = [row]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                row = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if row is _STOP:
+                return batch, True
+            batch.append(row)
+        return batch, False
+
+    async def _flush(self, batch: list[dict]) -> None:
+        """Insert a batch with one multi-row INSERT and record its latency."""
+        start = time.perf_counter()
+        async with database.async_session_maker() as session:
+            # Numbered at flush time, so sync cursors see these rows in commit order
+            await assign_progress_seq(session, batch)
+            await session.execute(insert(Progress), batch)
+            await session.commit()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.rows_flushed += len(batch)
+        self.batches_flushed += 1
+        self.last_flush_ms = elapsed_ms
+        self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+
+    async def _flush_isolating(self, batch: list[dict]) -> None:
+        """Flush what can be inserted, halving the batch around rows that fail."""
+        try:
+            await self._flush(batch)
+            return
+        except Exception:
+            self.flush_failures += 1
+            if len(batch) == 1:
+                self.rows_dropped += 1
+                logger.exception("Dropped progress row that cannot be inserted: %s", batch[0])
+                return
+        middle = len(batch) // 2
+        await self._flush_isolating(batch[:middle])
+        await self._flush_isolating(batch[middle:])
+
+    async def _flush_with_retries(self, batch: list[dict], stopping: bool) -> None:
+        attempts = 0
+        while True:
+            try:
+                await self._flush(batch)
+                return
+            except (IntegrityError, DataError):
+                # Retrying the same rows cannot succeed
+                self.flush_failures += 1
+                logger.warning("Flushing %d progress rows violated a constraint; isolating", len(batch))
+                break
+            except Exception:
+                self.flush_failures += 1
+                attempts += 1
+                if stopping or attempts >= self.max_attempts:
+                    logger.exception("Failed to flush %d progress rows; isolating", len(batch))
+                    break
+                logger.exception("Failed to flush %d progress rows; retrying", len(batch))
+                await asyncio.sleep(min(self.flush_interval * 2 ** attempts, MAX_RETRY_DELAY))
+        await self._flush_isolating(batch)
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = await self._next_batch()
+            if not batch:
+                continue
+            try:
+                await self._flush_with_retries(batch, stopping)
+            finally:
+                self._forget(batch)
+
+    def start(self) -> None:
+        """Start the background flush task."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush everything queued so far and stop the background task."""
+        if self._task is None:
+            return
+        await self.queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    def stats(self) -> dict:
+        """Queue depth and flush metrics."""
+        return {
+            "queue_depth": self.queue.qsize(),
+            "rows_flushed": self.rows_flushed,
+            "rows_dropped": self.rows_dropped,
+            "batches_flushed": self.batches_flushed,
+            "flush_failures": self.flush_failures,
+            "last_flush_ms": round(self.last_flush_ms, 3),
+            "max_flush_ms": round(self.max_flush_ms, 3),
+        }
+
+
+progress_buffer = ProgressWriteBuffer(
+    flush_interval_ms=settings.PROGRESS_FLUSH_INTERVAL_MS,
+    batch_size=settings.PROGRESS_FLUSH_BATCH_SIZE,
+    max_queue_size=settings.PROGRESS_QUEUE_MAX_SIZE,
+    max_attempts=settings.PROGRESS_FLUSH_MAX_ATTEMPTS,
+    enqueue_timeout_ms=settings.PROGRESS_ENQUEUE_TIMEOUT_MS,
+)
@@ -0,0 +1,210 @@
+"""
+Monthly range partitions of the progress table on PostgreSQL.
+
+Migration 0002 turns `progress` into a table partitioned by `passed_at`
+month (plus a DEFAULT partition as a safety net). This module keeps it
+healthy:
+
+- partitions are created a few months ahead, so inserts never land in the
+  default partition;
+- with PROGRESS_RETENTION_MONTHS set, partitions older than the retention
+  window are written to `<PROGRESS_ARCHIVE_DIR>/<partition>.csv.gz`, then
+  detached and dropped.
+
+Archiving must not change what the game sees, so before a partition is
+detached, every (user, level) whose only pass lives in it is carried forward
+as one row stamped at the start of the retention window. Unlock state,
+current level and progress summaries stay the same; the archive keeps the
+original rows.
+
+The app runs maintenance in the background on PostgreSQL; it can also be
+run from cron:
+
+    python -m src.progress_partitions
+"""
+
+import asyncio
+import csv
+import gzip
+import logging
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "progress"
+PARTITION_NAME = re.compile(r"^progress_p(\d{4})_(\d{2})$")
+ARCHIVE_COLUMNS = ("id", "user_id", "level", "passed_at", "duration_ms", "seq")
+ARCHIVE_CHUNK_ROWS = 10_000
+
+
+def month_start(moment: datetime) -> datetime:
+    return datetime(moment.year, moment.month, 1)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"progress_p{month.year:04d}_{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[datetime]:
+    """The month a partition covers, or None for tables that are not monthly partitions."""
+    match = PARTITION_NAME.match(name)
+    return datetime(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def create_partition_sql(month: datetime) -> str:
+    return (
+        f'CREATE TABLE IF NOT EXISTS "{partition_name(month)}" PARTITION OF {PARENT_TABLE} '
+        f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+    )
+
+
+async def is_partitioned(conn: AsyncConnection) -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+    return bool(await conn.scalar(text(
+        "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = :parent AND c.relnamespace = current_schema()::regnamespace"
+    ), {"parent": PARENT_TABLE}))
+
+
+async def attached_partitions(conn: AsyncConnection) -> list[str]:
+    rows = await conn.scalars(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :parent AND p.relnamespace = current_schema()::regnamespace"
+    ), {"parent": PARENT_TABLE})
+    return sorted(name for name in rows if partition_month(name))
+
+
+async def ensure_partitions(conn: AsyncConnection, now: datetime, months_ahead: int) -> list[str]:
+    """Create the current month's partition and `months_ahead` following ones."""
+    existing = set(await attached_partitions(conn))
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(month_start(now), offset)
+        if partition_name(month) not in existing:
+            await conn.execute(text(create_partition_sql(month)))
+            created.append(partition_name(month))
+    return created
+
+
+def _write_archive_chunk(path: Path, rows: list, header: bool) -> None:
+    with gzip.open(path, "at", newline="") as archive:
+        writer = csv.writer(archive)
+        if header:
+            writer.writerow(ARCHIVE_COLUMNS)
+        writer.writerows(rows)
+
+
+async def _export_table(conn: AsyncConnection, name: str, archive_dir: Path) -> Path:
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    path = archive_dir / f"{name}.csv.gz"
+    partial = path.with_suffix(".gz.partial")
+    partial.unlink(missing_ok=True)
+
+    result = await conn.stream(text(
+        f'SELECT {", ".join(ARCHIVE_COLUMNS)} FROM "{name}" ORDER BY passed_at, id'
+    ))
+    header = True
+    async for rows in result.partitions(ARCHIVE_CHUNK_ROWS):
+        await asyncio.to_thread(_write_archive_chunk, partial, [tuple(row) for row in rows], header)
+        header = False
+    if header:
+        await asyncio.to_thread(_write_archive_chunk, partial, [], True)
+
+    partial.replace(path)
+    return path
+
+
+async def archive_partition(conn: AsyncConnection, name: str, cutoff: datetime, archive_dir: Path) -> Path:
+    """
+    Archive, carry forward sole passes, detach and drop one partition.
+    Runs in the caller's transaction: if anything fails the partition stays
+    attached, and the next run rewrites the archive file.
+
+    The export runs first, under a SHARE lock on the partition alone (reads
+    continue, writes to that month wait), so the ACCESS EXCLUSIVE lock that
+    DETACH takes on the parent is only held for the detach and drop at the
+    end of the transaction.
+    """
+    await conn.execute(text(f'LOCK TABLE "{name}" IN SHARE MODE'))
+    path = await _export_table(conn, name, archive_dir)
+    await conn.execute(text(
+        f"INSERT INTO {PARENT_TABLE} (id, user_id, level, passed_at, duration_ms, seq) "
+        f"SELECT DISTINCT ON (old.user_id, old.level) "
+        f"old.id, old.user_id, old.level, :cutoff, old.duration_ms, old.seq "
+        f'FROM "{name}" old '
+        f"WHERE NOT EXISTS (SELECT 1 FROM {PARENT_TABLE} kept WHERE kept.user_id = old.user_id "
+        f"AND kept.level = old.level AND kept.passed_at >= :cutoff) "
+        f"ORDER BY old.user_id, old.level, old.passed_at"
+    ), {"cutoff": cutoff})
+    await conn.execute(text(f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION "{name}"'))
+    await conn.execute(text(f'DROP TABLE "{name}"'))
+    return path
+
+
+async def maintain_partitions(engine: AsyncEngine, now: Optional[datetime] = None) -> dict:
+    """Create upcoming partitions and archive expired ones; a no-op when not partitioned."""
+    now = now or datetime.utcnow()
+    report = {"created": [], "archived": []}
+
+    async with engine.begin() as conn:
+        if not await is_partitioned(conn):
+            return report
+        report["created"] = await ensure_partitions(conn, now, settings.PROGRESS_PARTITION_MONTHS_AHEAD)
+
+    if settings.PROGRESS_RETENTION_MONTHS is None:
+        return report
+
+    cutoff = add_months(month_start(now), -settings.PROGRESS_RETENTION_MONTHS)
+    archive_dir = Path(settings.PROGRESS_ARCHIVE_DIR)
+    async with engine.connect() as conn:
+        expired = [name for name in await attached_partitions(conn) if partition_month(name) < cutoff]
+
+    # One transaction per partition; each takes ACCESS EXCLUSIVE on the
+    # parent only for its final detach and drop
+    for name in expired:
+        async with engine.begin() as conn:
+            path = await archive_partition(conn, name, cutoff, archive_dir)
+        logger.info("Archived progress partition %s to %s", name, path)
+        report["archived"].append(name)
+
+    return report
+
+
+async def run_partition_maintenance(engine: AsyncEngine, interval_seconds: float) -> None:
+    """Background loop used by the app lifespan."""
+    while True:
+        try:
+            report = await maintain_partitions(engine)
+            if report["created"] or report["archived"]:
+                logger.info("Progress partition maintenance: %s", report)
+        except Exception:
+            logger.exception("Progress partition maintenance failed")
+        await asyncio.sleep(interval_seconds)
+
+
+async def main() -> None:
+    from src.database import engine
+
+    report = await maintain_partitions(engine)
+    print(f"created: {report['created'] or 'none'}")
+    print(f"archived: {report['archived'] or 'none'}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
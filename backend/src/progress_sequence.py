@@ -0,0 +1,48 @@
+"""
+Per-user, commit-ordered sequence numbers for progress rows.
+
+/game/sync hands out cursors over a user's progress. A cursor on passed_at
+(or any value fixed before commit) can skip rows: a transaction that
+stamped its rows earlier may commit after a reader already moved past them.
+So every inserted progress row gets the next value of its user's
+user.progress_seq counter, taken by an UPDATE in the inserting transaction.
+The UPDATE locks the user row until commit, so a user's transactions that
+insert progress commit in the order of their numbers, and a reader that has
+seen number N will never see a smaller number commit later.
+"""
+
+from collections import Counter
+
+from sqlalchemy import case, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import User
+
+
+async def assign_progress_seq(session: AsyncSession, rows: list[dict]) -> None:
+    """
+    Set `seq` on progress rows (dicts with user_id), numbering each user's
+    rows in list order. Rows of users that no longer exist get no number
+    (their INSERT fails on the foreign key anyway).
+    """
+    counts = Counter(row["user_id"] for row in rows)
+    if not counts:
+        return
+    user_ids = sorted(counts)
+    # Lock in a fixed order so two multi-user batches cannot deadlock
+    await session.execute(
+        select(User.id).where(User.id.in_(user_ids)).order_by(User.id).with_for_update()
+    )
+    result = await session.execute(
+        update(User)
+        .where(User.id.in_(user_ids))
+        .values(progress_seq=User.progress_seq + case(counts, value=User.id))
+        .returning(User.id, User.progress_seq)
+        .execution_options(synchronize_session=False)
+    )
+    next_seq = {user_id: last - counts[user_id] + 1 for user_id, last in result}
+    for row in rows:
+        seq = next_seq.get(row["user_id"])
+        if seq is not None:
+            row["seq"] = seq
+            next_seq[row["user_id"]] = seq + 1
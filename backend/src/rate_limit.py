@@ -0,0 +1,138 @@
+"""ASGI admission control: per-user token buckets and a global concurrency cap."""
+
+import math
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import jwt
+from fastapi_users.jwt import decode_jwt
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.auth import get_jwt_strategy
+
+
+_jwt_strategy = get_jwt_strategy()
+
+
+def request_token(scope: Scope) -> Optional[tuple[str, dict]]:
+    """Bearer token of an HTTP request and its verified claims, or None when absent or invalid."""
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer" or not token:
+                return None
+            try:
+                return token, decode_jwt(
+                    token,
+                    _jwt_strategy.decode_key,
+                    _jwt_strategy.token_audience,
+                    algorithms=[_jwt_strategy.algorithm],
+                )
+            except jwt.PyJWTError:
+                return None
+    return None
+
+
+def request_subject(scope: Scope) -> Optional[str]:
+    """JWT subject (user id) of an HTTP request, or None when absent or invalid."""
+    credentials = request_token(scope)
+    return credentials[1].get("sub") if credentials is not None else None
+
+
+class TokenBuckets:
+    """
+    Token buckets keyed by user, stored as (tokens, updated_at) tuples in an
+    OrderedDict kept in last-use order. A bucket left idle for burst / rate
+    seconds is full again, which is the same as having no bucket, so idle
+    buckets are evicted from the front of the dict in O(1) per request.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = float(burst)
+        self.idle_seconds = burst / rate
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def consume(self, key: str, now: Optional[float] = None) -> float:
+        """Take one token. Returns 0 when allowed, else seconds until a token is available."""
+        now = time.monotonic() if now is None else now
+        self._evict_idle(now)
+
+        tokens, updated_at = self._buckets.pop(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+        if tokens >= 1:
+            self._buckets[key] = (tokens - 1, now)
+            return 0.0
+
+        self._buckets[key] = (tokens, now)
+        return (1 - tokens) / self.rate
+
+    def _evict_idle(self, now: float) -> None:
+        cutoff = now - self.idle_seconds
+        while self._buckets:
+            _, updated_at = next(iter(self._buckets.values()))
+            if updated_at > cutoff:
+                break
+            self._buckets.popitem(last=False)
+
+
+class RateLimitMiddleware:
+    """
+    Shed load before it reaches SQLAlchemy.
+
+    Requests under `user_prefixes` carrying a valid JWT spend a token from the
+    bucket of their subject. Every request under `db_prefixes` also counts
+    against `max_concurrent`. Either limit answers 429 with Retry-After.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rate: float,
+        burst: int,
+        max_concurrent: int,
+        user_prefixes: tuple[str, ...] = ("/game/",),
+        db_prefixes: tuple[str, ...] = ("/game/", "/auth/", "/users/"),
+    ):
+        self.app = app
+        self.buckets = TokenBuckets(rate, burst)
+        self.max_concurrent = max_concurrent
+        self.user_prefixes = user_prefixes
+        self.db_prefixes = db_prefixes
+        self.in_flight = 0
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send, retry_after: float) -> None:
+        response = JSONResponse(
+            {"detail": "Too many requests"},
+            status_code=429,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+        await response(scope, receive, send)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.db_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        if scope["path"].startswith(self.user_prefixes):
+            subject = request_subject(scope)
+            if subject is not None:
+                retry_after = self.buckets.consume(subject)
+                if retry_after:
+                    await self._reject(scope, receive, send, retry_after)
+                    return
+
+        if self.in_flight >= self.max_concurrent:
+            await self._reject(scope, receive, send, 1)
+            return
+
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
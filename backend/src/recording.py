@@ -0,0 +1,90 @@
+"""
+Compact binary encoding of recorded play sessions.
+
+A session is the key presses of one attempt at a level, each with its time
+in milliseconds since the session started. It is stored as one blob:
+
+    offset  type            field
+    0       4 bytes         magic b"TTR1"
+    4       uint32 LE       event count N
+    8       ceil(N/4) bytes moves, 2 bits each, 4 per byte, lowest bits first
+    ...     N varints       time deltas in ms (unsigned LEB128), the first
+                            one relative to the session start
+
+Human key presses are a few hundred milliseconds apart, so a typical event
+costs 2.25 bytes (2-bit move + 2-byte delta).
+"""
+
+import struct
+from typing import Iterator
+
+from src.turtle import MOVES
+
+MAGIC = b"TTR1"
+HEADER = struct.Struct("<4sI")
+MOVE_CODES = {move: code for code, move in enumerate(MOVES)}
+MAX_EVENTS = 10_000
+
+
+def encode_session(moves: list[str], offsets_ms: list[int]) -> bytes:
+    """Pack moves and their non-decreasing millisecond offsets into a blob."""
+    if len(moves) != len(offsets_ms):
+        raise ValueError("moves and offsets_ms must have the same length")
+    if len(moves) > MAX_EVENTS:
+        raise ValueError(f"A session holds at most {MAX_EVENTS} events")
+
+    try:
+        codes = [MOVE_CODES[move] for move in moves]
+    except KeyError as exc:
+        raise ValueError(f"Unknown move {exc.args[0]!r}")
+    codes.extend([0] * (-len(codes) % 4))
+    packed_moves = bytes(
+        a | b << 2 | c << 4 | d << 6
+        for a, b, c, d in zip(codes[0::4], codes[1::4], codes[2::4], codes[3::4])
+    )
+
+    deltas = bytearray()
+    previous = 0
+    for offset in offsets_ms:
+        delta = offset - previous
+        if delta < 0:
+            raise ValueError("offsets_ms must be non-decreasing and non-negative")
+        while delta >= 0x80:
+            deltas.append(delta & 0x7F | 0x80)
+            delta >>= 7
+        deltas.append(delta)
+        previous = offset
+
+    return HEADER.pack(MAGIC, len(moves)) + packed_moves + bytes(deltas)
+
+
+def iter_session(data: bytes) -> Iterator[tuple[int, str]]:
+    """Decode a blob lazily into (offset_ms, move) events."""
+    magic, count = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a recorded session")
+
+    moves_start = HEADER.size
+    position = moves_start + (count + 3) // 4
+    offset = 0
+    for index in range(count):
+        delta = shift = 0
+        while True:
+            byte = data[position]
+            position += 1
+            delta |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        offset += delta
+        code = data[moves_start + index // 4] >> (index % 4 * 2) & 0b11
+        yield offset, MOVES[code]
+
+
+def decode_session(data: bytes) -> tuple[list[str], list[int]]:
+    """Decode a blob into parallel moves and offsets_ms lists."""
+    moves, offsets = [], []
+    for offset, move in iter_session(data):
+        offsets.append(offset)
+        moves.append(move)
+    return moves, offsets
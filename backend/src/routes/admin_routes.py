@@ -0,0 +1,48 @@
+"""Superuser diagnostics routes."""
+
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from src.auth import current_superuser
+from src.models import User
+from src.profiler import ProfilerBusy, profiler
+
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.post("/profile", response_class=PlainTextResponse)
+async def profile(
+    seconds: float | None = Query(None, gt=0, le=300, description="Profile this worker for N seconds"),
+    requests: int | None = Query(None, ge=1, le=10_000, description="...or for the next N matching requests"),
+    path: str = Query("/", description="Path prefix of the requests to profile"),
+    timeout: float = Query(60, gt=0, le=600, description="Give up waiting for requests after this long"),
+    interval_ms: float = Query(5, ge=1, le=100, description="Sampling interval"),
+    user: User = Depends(current_superuser),
+):
+    """
+    Sample this worker's event loop and return collapsed stacks, ready for
+    flamegraph.pl or speedscope (superuser only).
+    Give either `seconds`, or `requests` with an optional `path` prefix.
+    """
+    if (seconds is None) == (requests is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Give exactly one of seconds or requests",
+        )
+    
+    try:
+        if seconds is not None:
+            collapsed = await profiler.profile_for(seconds, interval_ms / 1000)
+        else:
+            collapsed = await profiler.profile_requests(path, requests, interval_ms / 1000, timeout)
+    except ProfilerBusy as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
+    
+    filename = f"profile-{datetime.utcnow():%Y%m%dT%H%M%S}.collapsed"
+    return PlainTextResponse(
+        collapsed,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -6,8 +6,9 @@ from src.auth import jwt_authentication, fastapi_users
 from src.config import settings
 from src.database import get_async_session
 from src.models import User
-from src.oauth_config import google_oauth_client
-from src.schemas.user_schemas import UserCreate, UserRead, UserUpdate
+from src.schemas.user_schemas import AvailabilityRead, UserCreate, UserRead, UserUpdate
+from src.serialization import ModelJSONResponse
+from src.username_index import username_index
 
 
 auth_routes = APIRouter(
@@ -29,6 +30,25 @@ auth_routes.include_router(
     tags=["auth"],
 )
 
+@auth_routes.get("/auth/availability", response_model=AvailabilityRead, tags=["auth"])
+async def check_availability(
+    username: str | None = Query(None, min_length=1, max_length=255),
+):
+    """
+    Check whether a username can still be registered, with suggestions when
+    it is taken. Served from the in-memory index, so the register form can
+    call it on every keystroke. Emails are not checked here, so the endpoint
+    cannot be used to find out who has an account.
+    """
+    response = AvailabilityRead()
+    if username is not None:
+        response.username = username
+        response.username_available = not username_index.username_taken(username)
+        if not response.username_available:
+            response.suggestions = username_index.suggest(username)
+    return ModelJSONResponse(response)
+
+
 # User profile routes (get, update, delete)
 auth_routes.include_router(
     fastapi_users.get_users_router(UserRead, UserUpdate),
@@ -37,6 +57,9 @@ auth_routes.include_router(
 )
 
 if settings.GOOGLE_OAUTH_CLIENT_ID and settings.GOOGLE_OAUTH_CLIENT_SECRET:
+    # OAuth clients are only imported when OAuth is configured
+    from src.oauth_config import google_oauth_client
+
     auth_routes.include_router(
         fastapi_users.get_oauth_router(google_oauth_client, jwt_authentication, settings.SECRET_KEY),
         prefix="/auth/google",
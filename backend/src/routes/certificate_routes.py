@@ -0,0 +1,86 @@
+"""Public certificate verification routes."""
+
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth import current_superuser
+from src.certificate_issuance import issue_to_completers
+from src.certificates import certificate_revocations, verify_certificate_token
+from src.config import settings
+from src.database import get_async_session
+from src.jobs import job_runner
+from src.models import User
+from src.schemas.game_schemas import (
+    BulkCertificateIssue,
+    BulkCertificateIssueResult,
+    CertificateVerification,
+)
+from src.serialization import ModelJSONResponse
+
+
+router = APIRouter(prefix="/certificates", tags=["certificates"])
+
+
+@router.get("/verify", response_model=CertificateVerification)
+async def verify_certificate(
+    token: str = Query(..., description="Signed certificate token"),
+):
+    """
+    Verify a certificate token issued by /game/register_certificate.
+    Validation is purely cryptographic and never touches the database.
+    """
+    claims = verify_certificate_token(token)
+    if claims is None:
+        return ModelJSONResponse(CertificateVerification(valid=False))
+
+    return ModelJSONResponse(CertificateVerification(valid=True, **claims))
+
+
+@router.post("/{certificate_id}/revoke", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke(
+    certificate_id: UUID,
+    user: User = Depends(current_superuser),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Revoke a certificate so its token no longer verifies (superuser only)."""
+    if not await certificate_revocations.revoke(session, certificate_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Certificate not found",
+        )
+
+
+@router.post("/bulk_issue", response_model=BulkCertificateIssueResult)
+async def bulk_issue(
+    request: BulkCertificateIssue,
+    user: User = Depends(current_superuser),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Issue a certificate to every user who passed every level and does not
+    hold it yet (superuser only). Runs in chunks of CERTIFICATE_BULK_CHUNK_SIZE
+    users and returns the counts, or with `background` enqueues a job and
+    returns its id (202).
+    """
+    if request.background:
+        job = job_runner.enqueue(
+            session, "certificates.bulk_issue", {"certificate_name": request.certificate_name}
+        )
+        await session.commit()
+        return ModelJSONResponse(
+            BulkCertificateIssueResult(certificate_name=request.certificate_name, job_id=job.id),
+            status_code=status.HTTP_202_ACCEPTED,
+        )
+
+    result = await issue_to_completers(
+        session, request.certificate_name, settings.CERTIFICATE_BULK_CHUNK_SIZE
+    )
+    return ModelJSONResponse(BulkCertificateIssueResult(
+        certificate_name=result.certificate_name,
+        issued=result.issued,
+        skipped=result.skipped,
+        chunks=result.chunks,
+        holders=result.holders,
+    ))
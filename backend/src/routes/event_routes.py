@@ -0,0 +1,123 @@
+"""
+Live progress event streams over Server-Sent Events and WebSocket.
+
+Streams are filtered by user. There is no class (group) model, so a teacher
+follows a class by passing each pupil's id as a repeated `user_id`.
+"""
+
+import asyncio
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth import current_active_user, get_jwt_strategy, get_auth_user_manager, UserManager
+from src.config import settings
+from src.database import get_auth_session
+from src.events import event_hub
+from src.models import User
+
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+def _allowed_user_ids(user: User, user_ids: list[UUID]) -> Optional[list[UUID]]:
+    """
+    Resolve which users a subscriber may follow.
+    Superusers (teachers) may follow any users, or everyone when none are given;
+    other users may only follow themselves.
+    """
+    if user.is_superuser:
+        return user_ids or None
+    if any(user_id != user.id for user_id in user_ids):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only superusers can follow other users' progress",
+        )
+    return [user.id]
+
+
+async def _sse_frames(user_ids: Optional[list[UUID]]):
+    # Subscribed only once the response body is iterated, so a client that
+    # disconnects before then leaves nothing behind in the hub
+    subscriber = event_hub.subscribe(user_ids)
+    try:
+        while True:
+            events = await subscriber.drain(settings.EVENT_KEEPALIVE_SECONDS)
+            if not events:
+                yield b": keepalive\n\n"
+                continue
+            yield b"".join(b"data: " + payload + b"\n\n" for payload in events)
+    finally:
+        event_hub.unsubscribe(subscriber)
+
+
+@router.get("/stream")
+async def progress_event_stream(
+    user_id: list[UUID] = Query([], description="Users to follow (superusers only)"),
+    user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_auth_session),
+):
+    """
+    Stream progress events (level_passed, certificate_issued) as Server-Sent Events,
+    for the given users (a class: one `user_id` per pupil) or, by default, yourself.
+    """
+    allowed = _allowed_user_ids(user, user_id)
+    # Authentication is done; don't hold a pooled connection for the stream's lifetime
+    await session.close()
+
+    return StreamingResponse(
+        _sse_frames(allowed),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def progress_event_websocket(
+    websocket: WebSocket,
+    token: str = Query(..., description="JWT access token"),
+    user_id: list[UUID] = Query([]),
+    user_manager: UserManager = Depends(get_auth_user_manager),
+    session: AsyncSession = Depends(get_auth_session),
+):
+    """
+    Stream progress events as JSON text messages over a WebSocket.
+    Browsers cannot set headers on WebSocket requests, so the token is a query parameter.
+    """
+    user = await get_jwt_strategy().read_token(token, user_manager)
+    await session.close()
+    if user is None or not user.is_active:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    try:
+        allowed = _allowed_user_ids(user, user_id)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    subscriber = event_hub.subscribe(allowed)
+    # Watch for the client going away while waiting for events
+    receive = asyncio.ensure_future(websocket.receive())
+    try:
+        while True:
+            drain = asyncio.ensure_future(subscriber.drain(settings.EVENT_KEEPALIVE_SECONDS))
+            await asyncio.wait({receive, drain}, return_when=asyncio.FIRST_COMPLETED)
+            # Both can finish in the same wait: send what was drained before
+            # looking at the client message, or those events would be lost
+            if drain.done():
+                for payload in drain.result():
+                    await websocket.send_text(payload.decode())
+            else:
+                drain.cancel()
+            if receive.done():
+                if receive.result()["type"] == "websocket.disconnect":
+                    break
+                # Client messages are ignored
+                receive = asyncio.ensure_future(websocket.receive())
+    finally:
+        receive.cancel()
+        event_hub.unsubscribe(subscriber)
@@ -1,23 +1,72 @@
 """Game routes for level progression and certificates."""
 
+import base64
+from datetime import datetime
+from typing import AsyncGenerator, Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy import select, func, and_
+from fastapi import APIRouter, Depends, HTTPException, Header, Response, status, Query
+from sqlalchemy import select, func, and_, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.auth import current_active_user
-from src.database import get_async_session
+from src.certificate_issuance import certificate_row, insert_certificates
+from src.certificates import sign_certificate
+from src.database import get_async_session, mark_recent_write, read_session_maker_for
+from src.duration_stats import level_duration_stats
+from src.events import event_hub
+from src.geometry import level_geometry
+from src.hints import hint_tables
 from src.models import User, Progress, Certificate
-from src.schemas.game_schemas import ProgressCreate, ProgressRead, CertificateCreate, CertificateRead
-from src.levels import CODE_LEVELS, MOVEMENT_LEVELS, CURSOR_LEVELS
+from src.schemas.game_schemas import (
+    ProgressCreate,
+    ProgressRead,
+    CertificateCreate,
+    CertificateRead,
+    UserProgressSummary,
+    CurrentLevelRead,
+    LevelsPassedStatus,
+    LevelData,
+    LevelGeometryRead,
+    LevelHint,
+    LevelDurationPercentiles,
+    Bootstrap,
+    CertificateExistence,
+    LevelSummary,
+    LevelPage,
+)
+from src.config import settings
+from src.level_catalog import level_catalog
+from src.progress_buffer import ProgressBufferFull, progress_buffer
+from src.progress_sequence import assign_progress_seq
+from src.schemas.user_schemas import UserRead
+from src.serialization import ModelJSONResponse
 
 # Get total number of levels
-TOTAL_LEVELS = len(CODE_LEVELS)
+TOTAL_LEVELS = len(level_catalog)
 
 router = APIRouter(prefix="/game", tags=["game"])
 
 
+async def get_read_session(
+    user: User = Depends(current_active_user),
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get a session for read-only endpoints.
+    Uses the read replica, except right after the user's own writes
+    (read-your-writes), when the primary is used instead.
+    """
+    async with read_session_maker_for(user.id)() as session:
+        yield session
+
+
+def _certificate_response(certificate: Certificate) -> CertificateRead:
+    """Build a certificate response with its embedded verification token."""
+    response = CertificateRead.model_validate(certificate)
+    response.verification_token = sign_certificate(certificate)
+    return response
+
+
 async def _check_user_can_play_level(
     user_id: UUID,
     level: int,
@@ -61,10 +110,51 @@ async def _check_user_can_play_level(
     return True
 
 
-@router.get("/current_level", response_model=dict)
+@router.get("/bootstrap", response_model=Bootstrap)
+async def get_bootstrap(
+    user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_read_session),
+):
+    """
+    Get the current user, their progress, the level lock map and their
+    latest certificate in one response (what the home page needs on load).
+    Besides authentication this is two indexed queries: the distinct levels
+    passed and the latest certificate.
+    """
+    passed = sorted(
+        level
+        for level in (await session.scalars(
+            select(func.distinct(Progress.level)).where(Progress.user_id == user.id)
+        )).all()
+        if 1 <= level <= TOTAL_LEVELS
+    )
+    certificate = await session.scalar(
+        select(Certificate)
+        .where(Certificate.user_id == user.id)
+        .order_by(Certificate.issued_at.desc(), Certificate.id.desc())
+        .limit(1)
+    )
+    
+    passed_set = set(passed)
+    return ModelJSONResponse(Bootstrap(
+        user=UserRead.model_validate(user),
+        current_level=passed[-1] if passed else None,
+        levels_passed=len(passed),
+        total_levels=TOTAL_LEVELS,
+        all_levels_passed=len(passed) == TOTAL_LEVELS,
+        passed_levels=passed,
+        unlocked_levels=[
+            level for level in range(1, TOTAL_LEVELS + 1)
+            if level == 1 or level - 1 in passed_set
+        ],
+        certificate=_certificate_response(certificate) if certificate else None,
+    ))
+
+
+@router.get("/current_level", response_model=CurrentLevelRead)
 async def get_current_level(
     user: User = Depends(current_active_user),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     """
     Get the maximum level passed by the current user.
@@ -75,11 +165,11 @@ async def get_current_level(
     
     max_level = result if result is not None else None
     
-    return {
-        "user_id": str(user.id),
-        "current_level": max_level,
-        "total_levels": TOTAL_LEVELS,
-    }
+    return ModelJSONResponse(CurrentLevelRead(
+        user_id=user.id,
+        current_level=max_level,
+        total_levels=TOTAL_LEVELS,
+    ))
 
 
 @router.post("/pass_level", response_model=ProgressRead)
@@ -101,7 +191,10 @@ async def pass_level(
         )
     
     # Check if user can play this level (all previous levels must be passed)
-    can_play = await _check_user_can_play_level(user.id, progress_data.level, session)
+    if settings.PROGRESS_WRITE_BEHIND:
+        can_play = await progress_buffer.can_pass(user.id, progress_data.level, session)
+    else:
+        can_play = await _check_user_can_play_level(user.id, progress_data.level, session)
     if not can_play:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -124,23 +217,43 @@ async def pass_level(
     #         detail=f"Level {progress_data.level} already passed by this user",
     #     )
     
+    # Write-behind mode: acknowledge now, the row is inserted by the next batch flush
+    if settings.PROGRESS_WRITE_BEHIND:
+        # End the read transaction first: while the queue is full the flusher
+        # may need this connection (the only writer in SQLite mode)
+        await session.commit()
+        try:
+            row = await progress_buffer.enqueue(user.id, progress_data.level, progress_data.duration_ms)
+        except ProgressBufferFull:
+            # The flusher is not keeping up; write this row directly below
+            row = None
+        if row is not None:
+            mark_recent_write(user.id)
+            if progress_data.duration_ms is not None:
+                level_duration_stats.record(progress_data.level, progress_data.duration_ms)
+            event_hub.publish_level_passed(user.id, row["level"], row["passed_at"])
+            return ModelJSONResponse(ProgressRead(**row))
+    
     # Create new progress record
-    progress = Progress(
-        user_id=user.id,
-        level=progress_data.level,
-    )
+    row = {"user_id": user.id, "level": progress_data.level, "duration_ms": progress_data.duration_ms}
+    await assign_progress_seq(session, [row])
+    progress = Progress(**row)
     
     session.add(progress)
+    # id and passed_at are set client-side on flush; no refresh round trip
     await session.commit()
-    await session.refresh(progress)
+    mark_recent_write(user.id)
+    if progress.duration_ms is not None:
+        level_duration_stats.record(progress.level, progress.duration_ms)
+    event_hub.publish_level_passed(user.id, progress.level, progress.passed_at)
     
-    return progress
+    return ModelJSONResponse(ProgressRead.model_validate(progress))
 
 
-@router.get("/check_pass_all_level", response_model=dict)
+@router.get("/check_pass_all_level", response_model=LevelsPassedStatus)
 async def check_pass_all_levels(
     user: User = Depends(current_active_user),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     """
     Check if the current user has passed all available levels.
@@ -154,12 +267,12 @@ async def check_pass_all_levels(
     
     all_levels_passed = levels_passed == TOTAL_LEVELS
     
-    return {
-        "user_id": str(user.id),
-        "all_levels_passed": all_levels_passed,
-        "levels_passed": levels_passed or 0,
-        "total_levels": TOTAL_LEVELS,
-    }
+    return ModelJSONResponse(LevelsPassedStatus(
+        user_id=user.id,
+        all_levels_passed=all_levels_passed,
+        levels_passed=levels_passed or 0,
+        total_levels=TOTAL_LEVELS,
+    ))
 
 
 @router.post("/register_certificate", response_model=CertificateRead, status_code=status.HTTP_201_CREATED)
@@ -172,39 +285,30 @@ async def register_certificate(
     Register a new certificate for the current user.
     Certificate name must be unique per user (cannot register the same certificate twice).
     """
-    # Check if certificate already exists for this user
-    existing = await session.scalar(
-        select(Certificate).where(
-            and_(
-                Certificate.user_id == user.id,
-                Certificate.certificate_name == certificate_data.certificate_name,
-            )
-        )
+    # One conflict-ignoring insert; nothing returned means the user already holds it
+    inserted = await insert_certificates(
+        session, [certificate_row(user.id, certificate_data.certificate_name)]
     )
-    
-    if existing:
+    if not inserted:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"Certificate '{certificate_data.certificate_name}' already registered for this user",
         )
     
-    # Create new certificate
-    certificate = Certificate(
-        user_id=user.id,
-        certificate_name=certificate_data.certificate_name,
-    )
-    
-    session.add(certificate)
+    certificate = inserted[0]
     await session.commit()
-    await session.refresh(certificate)
+    mark_recent_write(user.id)
+    event_hub.publish_certificate_issued(user.id, certificate.certificate_name, certificate.issued_at)
     
-    return certificate
+    return ModelJSONResponse(
+        _certificate_response(certificate), status_code=status.HTTP_201_CREATED
+    )
 
 
 @router.get("/get_certified_data", response_model=CertificateRead)
 async def get_certified_data(
     user: User = Depends(current_active_user),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     """
     Get the latest certificate registered for the current user.
@@ -212,7 +316,7 @@ async def get_certified_data(
     """
     stmt = select(Certificate).where(
         Certificate.user_id == user.id
-    ).order_by(Certificate.issued_at.desc()).limit(1)
+    ).order_by(Certificate.issued_at.desc(), Certificate.id.desc()).limit(1)
     
     certificate = await session.scalar(stmt)
     
@@ -222,13 +326,13 @@ async def get_certified_data(
             detail="No certificate found for this user",
         )
     
-    return certificate
+    return ModelJSONResponse(_certificate_response(certificate))
 
 
-@router.get("/check_if_certified_exist", response_model=dict)
+@router.get("/check_if_certified_exist", response_model=CertificateExistence)
 async def check_if_certified_exist(
     user: User = Depends(current_active_user),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     """
     Check if a specific certificate exists for the current user.
@@ -243,64 +347,94 @@ async def check_if_certified_exist(
     
     exists = cert is not None
     
-    return {
-        "user_id": str(user.id),
-        "exists": exists,
-        "issued_at": cert.issued_at if cert else None,
-    }
+    return ModelJSONResponse(CertificateExistence(
+        user_id=user.id,
+        exists=exists,
+        issued_at=cert.issued_at if cert else None,
+    ))
+
+
+def _encode_certificate_cursor(certificate: Certificate) -> str:
+    """Encode the keyset position (issued_at, id) of a certificate."""
+    raw = f"{certificate.issued_at.isoformat()}|{certificate.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_certificate_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decode a certificate cursor produced by _encode_certificate_cursor."""
+    try:
+        issued_at, certificate_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(issued_at), UUID(certificate_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid certificates cursor",
+        )
 
 
-@router.get("/user_progress_summary", response_model=dict)
+@router.get("/user_progress_summary", response_model=UserProgressSummary)
 async def get_user_progress_summary(
+    certificates_limit: int = Query(20, ge=1, le=100, description="Certificates per page"),
+    certificates_cursor: str | None = Query(None, description="Cursor from a previous page"),
     user: User = Depends(current_active_user),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     """
     Get a comprehensive summary of user's game progress and certificates.
+    Statistics are computed with SQL aggregates; certificates are returned
+    newest first, one keyset page at a time.
     """
-    # Get all progress records
-    progress_stmt = select(Progress).where(
-        Progress.user_id == user.id
-    ).order_by(Progress.level)
-    progress_records = await session.scalars(progress_stmt)
-    progress_list = progress_records.all()
-    
-    # Get all certificates
-    cert_stmt = select(Certificate).where(
-        Certificate.user_id == user.id
-    ).order_by(Certificate.issued_at.desc())
-    certificates = await session.scalars(cert_stmt)
-    cert_list = certificates.all()
-    
-    # Calculate statistics
-    max_level = max([p.level for p in progress_list], default=0)
-    levels_passed = len(progress_list)
-    all_levels_passed = levels_passed == TOTAL_LEVELS
-    
-    return {
-        "user_id": str(user.id),
-        "username": user.username,
-        "max_level": max_level,
-        "levels_passed": levels_passed,
-        "total_levels": TOTAL_LEVELS,
-        "all_levels_passed": all_levels_passed,
-        "progress_percentage": round((levels_passed / TOTAL_LEVELS) * 100, 2),
-        "certificates_count": len(cert_list),
-        "certificates": [
-            {
-                "id": str(c.id),
-                "certificate_name": c.certificate_name,
-                "issued_at": c.issued_at.isoformat(),
-            }
-            for c in cert_list
-        ],
-    }
+    # Aggregates in a single statement
+    stats_stmt = select(
+        select(func.max(Progress.level))
+        .where(Progress.user_id == user.id)
+        .scalar_subquery(),
+        select(func.count(func.distinct(Progress.level)))
+        .where(Progress.user_id == user.id)
+        .scalar_subquery(),
+        select(func.count(Certificate.id))
+        .where(Certificate.user_id == user.id)
+        .scalar_subquery(),
+    )
+    max_level, levels_passed, certificates_count = (await session.execute(stats_stmt)).one()
+
+    # Keyset-paginated certificates, newest first
+    cert_stmt = select(Certificate).where(Certificate.user_id == user.id)
+    if certificates_cursor:
+        issued_at, certificate_id = _decode_certificate_cursor(certificates_cursor)
+        cert_stmt = cert_stmt.where(
+            tuple_(Certificate.issued_at, Certificate.id) < tuple_(issued_at, certificate_id)
+        )
+    cert_stmt = cert_stmt.order_by(
+        Certificate.issued_at.desc(), Certificate.id.desc()
+    ).limit(certificates_limit + 1)
+    cert_list = (await session.scalars(cert_stmt)).all()
+
+    next_cursor = None
+    if len(cert_list) > certificates_limit:
+        cert_list = cert_list[:certificates_limit]
+        next_cursor = _encode_certificate_cursor(cert_list[-1])
+
+    levels_passed = levels_passed or 0
 
-@router.get("/get_level_data", response_model=dict)
+    return ModelJSONResponse(UserProgressSummary(
+        user_id=user.id,
+        username=user.username,
+        max_level=max_level or 0,
+        levels_passed=levels_passed,
+        total_levels=TOTAL_LEVELS,
+        all_levels_passed=levels_passed == TOTAL_LEVELS,
+        progress_percentage=round((levels_passed / TOTAL_LEVELS) * 100, 2),
+        certificates_count=certificates_count,
+        certificates=[CertificateRead.model_validate(c) for c in cert_list],
+        next_certificates_cursor=next_cursor,
+    ))
+
+@router.get("/get_level_data", response_model=LevelData)
 async def get_level_data(
     level: int = Query(..., ge=1, description="Level number"),
     user: User = Depends(current_active_user),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     """
     Get level data (code, movements, cursor) for a specific level.
@@ -329,14 +463,195 @@ async def get_level_data(
             detail=f"Cannot access level {level}. Must pass all previous levels first.",
         )
     
-    index_level = level - 1
+    level_definition = level_catalog.get(level)
 
     # Return level data
-    return {
-        "user_id": str(user.id),
-        "level_number": level,
-        "code": CODE_LEVELS[index_level],
-        "movements": MOVEMENT_LEVELS[index_level],
-        "cursor": CURSOR_LEVELS[index_level],
-        "can_play": True,
-    }
+    return ModelJSONResponse(LevelData(
+        user_id=user.id,
+        level_number=level,
+        code=level_definition.code,
+        movements=level_definition.movements,
+        cursor=level_definition.cursor,
+        can_play=True,
+    ))
+
+
+# A URL carrying the current content version never changes content
+GEOMETRY_CACHE_CONTROL = "private, max-age=31536000, immutable"
+# Without it (or with a stale one) the content changes when the level catalog
+# is recompiled: revalidate every time, unchanged content gets a bodiless 304
+GEOMETRY_REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+@router.get(
+    "/levels/{level}/geometry",
+    response_class=Response,
+    responses={200: {"content": {"application/octet-stream": {}, "application/json": {}}}},
+)
+async def get_level_geometry(
+    level: int,
+    format: Literal["binary", "json"] = Query("binary", description="binary (packed float32) or json"),
+    v: str | None = Query(None, description="geometry_version from /game/levels"),
+    if_none_match: str | None = Header(None),
+    user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_read_session),
+):
+    """
+    Get the precomputed target drawing of a level, as packed float32
+    coordinates (see src/geometry.py) or JSON. Requested with the current
+    version (`v`) the response is cached as immutable. Otherwise it carries an
+    ETag to revalidate; a matching If-None-Match gets a 304 without a lock check.
+    """
+    geometry = level_geometry.get(level)
+    if geometry is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Level {level} not found",
+        )
+    
+    etag = geometry.etag if format == "binary" else f'"{geometry.version}-json"'
+    if v == geometry.version:
+        headers = {"Cache-Control": GEOMETRY_CACHE_CONTROL}
+    else:
+        headers = {"ETag": etag, "Cache-Control": GEOMETRY_REVALIDATE_CACHE_CONTROL}
+        if if_none_match == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    if not await _check_user_can_play_level(user.id, level, session):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Cannot access level {level}. Must pass all previous levels first.",
+        )
+    
+    if format == "json":
+        return ModelJSONResponse(
+            LevelGeometryRead(level=geometry.level, bbox=geometry.bbox, points=list(geometry.points)),
+            headers=headers,
+        )
+    return Response(geometry.packed, media_type="application/octet-stream", headers=headers)
+
+
+@router.get("/levels/{level}/hint", response_model=LevelHint)
+async def get_level_hint(
+    level: int,
+    step: int = Query(..., ge=0, description="Moves of the solution matched so far"),
+    x: int | None = Query(None, description="Turtle grid position (omit x, y and heading when on the path)"),
+    y: int | None = Query(None),
+    heading: int | None = Query(None, ge=0, le=3, description="0 up, 1 left, 2 down, 3 right"),
+    user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_read_session),
+):
+    """
+    Get the next correct key for a player on `step` of a level, from
+    precomputed tables (see src/hints.py). With the turtle's state, an
+    off-path player gets the first key of the shortest way back; `move` is
+    null when the turtle has wandered outside the level's hint area.
+    """
+    table = hint_tables.get(level)
+    if table is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Level {level} not found",
+        )
+    if step >= table.steps:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid step {step} for level {level}",
+        )
+    
+    state = (x, y, heading)
+    if state == (None, None, None):
+        state = table.path[step]
+    elif None in state:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Give all of x, y and heading, or none of them",
+        )
+    
+    if not await _check_user_can_play_level(user.id, level, session):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Cannot access level {level}. Must pass all previous levels first.",
+        )
+    
+    hint = table.lookup(step, *state)
+    return ModelJSONResponse(LevelHint(
+        level=level,
+        step=step,
+        move=hint[0] if hint else None,
+        moves_to_path=hint[1] if hint else None,
+    ))
+
+
+@router.get("/stats/levels/{level}/durations", response_model=LevelDurationPercentiles)
+async def get_level_durations(
+    level: int,
+    user: User = Depends(current_active_user),
+):
+    """
+    Get estimated p50/p90/p99 completion times of a level, in milliseconds,
+    from its in-memory quantile sketch (see src/duration_stats.py); no
+    progress rows are read. Percentiles are null until a duration is recorded.
+    """
+    if level < 1 or level > TOTAL_LEVELS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Level {level} not found",
+        )
+    
+    sketch = level_duration_stats.sketch(level)
+    return ModelJSONResponse(LevelDurationPercentiles(
+        level=level,
+        count=sketch.count,
+        p50_ms=sketch.quantile(0.5),
+        p90_ms=sketch.quantile(0.9),
+        p99_ms=sketch.quantile(0.99),
+    ))
+
+
+@router.get("/levels", response_model=LevelPage)
+async def list_levels(
+    after: int = Query(0, ge=0, description="Return levels numbered above this cursor"),
+    limit: int = Query(50, ge=1, le=200, description="Levels per page"),
+    pack: str | None = Query(None, description="Only levels from this pack"),
+    world: int | None = Query(None, ge=1, description="Only levels from this world"),
+    user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_read_session),
+):
+    """
+    List the level catalog one keyset page at a time, with the current user's
+    passed/unlocked state for each level.
+    A level is unlocked when it is level 1 or the level before it was passed.
+    """
+    levels = level_catalog.page(after=after, limit=limit + 1, pack=pack, world=world)
+    has_more = len(levels) > limit
+    levels = levels[:limit]
+    
+    # One query for the passed levels that decide this page's lock state
+    passed: set[int] = set()
+    if levels:
+        passed_stmt = select(func.distinct(Progress.level)).where(
+            and_(
+                Progress.user_id == user.id,
+                Progress.level.between(levels[0].number - 1, levels[-1].number),
+            )
+        )
+        passed = set((await session.scalars(passed_stmt)).all())
+    
+    return ModelJSONResponse(LevelPage(
+        user_id=user.id,
+        levels=[
+            LevelSummary(
+                number=level.number,
+                pack=level.pack,
+                world=level.world,
+                steps=len(level.movements),
+                geometry_version=level_geometry[level.number].version,
+                passed=level.number in passed,
+                unlocked=level.number == 1 or level.number - 1 in passed,
+            )
+            for level in levels
+        ],
+        next_cursor=levels[-1].number if has_more else None,
+        total_levels=TOTAL_LEVELS,
+    ))
@@ -0,0 +1,165 @@
+"""Recorded play sessions: batched upload and replay."""
+
+import asyncio
+import json
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID, uuid4
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth import current_active_user
+from src.database import get_async_session, mark_recent_write
+from src.models import PlaySession, User
+from src.recording import encode_session, iter_session
+from src.routes.game_routes import TOTAL_LEVELS, get_read_session
+from src.schemas.game_schemas import PlaySessionBatch, PlaySessionList, PlaySessionRead
+from src.serialization import ModelJSONResponse
+
+
+router = APIRouter(prefix="/game/sessions", tags=["game"])
+
+# Events per chunk when replaying without pacing
+REPLAY_CHUNK_EVENTS = 512
+
+
+@router.post("", response_model=PlaySessionList, status_code=status.HTTP_201_CREATED)
+async def upload_sessions(
+    batch: PlaySessionBatch,
+    user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Store a batch of recorded play sessions for the current user.
+    Each session is encoded into a compact blob (see src/recording.py) and
+    the whole batch is written with a single multi-row insert.
+    """
+    rows = []
+    for index, recorded in enumerate(batch.sessions):
+        if recorded.level < 1 or recorded.level > TOTAL_LEVELS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Session {index}: invalid level {recorded.level}",
+            )
+        try:
+            events = encode_session(recorded.moves, recorded.offsets_ms)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Session {index}: {exc}",
+            )
+        # Stored naive UTC like every other timestamp column (naive input is UTC)
+        started_at = recorded.started_at
+        if started_at.tzinfo is not None:
+            started_at = started_at.astimezone(timezone.utc).replace(tzinfo=None)
+        rows.append({
+            "id": uuid4(),
+            "user_id": user.id,
+            "level": recorded.level,
+            "started_at": started_at,
+            "event_count": len(recorded.moves),
+            "duration_ms": recorded.offsets_ms[-1] if recorded.offsets_ms else 0,
+            "events": events,
+            "uploaded_at": datetime.utcnow(),
+        })
+
+    await session.execute(insert(PlaySession), rows)
+    await session.commit()
+    mark_recent_write(user.id)
+
+    return ModelJSONResponse(
+        PlaySessionList(sessions=[PlaySessionRead.model_validate(row) for row in rows]),
+        status_code=status.HTTP_201_CREATED,
+    )
+
+
+@router.get("", response_model=PlaySessionList)
+async def list_sessions(
+    user_id: Optional[UUID] = Query(None, description="Whose sessions (superusers only for others)"),
+    level: Optional[int] = Query(None, ge=1),
+    limit: int = Query(50, ge=1, le=200),
+    user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_read_session),
+):
+    """List recorded sessions, newest first, without their events."""
+    owner_id = user_id or user.id
+    if owner_id != user.id and not user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only superusers can list other users' sessions",
+        )
+
+    stmt = (
+        select(
+            PlaySession.id,
+            PlaySession.user_id,
+            PlaySession.level,
+            PlaySession.started_at,
+            PlaySession.event_count,
+            PlaySession.duration_ms,
+        )
+        .where(PlaySession.user_id == owner_id)
+        .order_by(PlaySession.started_at.desc())
+        .limit(limit)
+    )
+    if level is not None:
+        stmt = stmt.where(PlaySession.level == level)
+    rows = (await session.execute(stmt)).all()
+
+    return ModelJSONResponse(
+        PlaySessionList(sessions=[PlaySessionRead.model_validate(row) for row in rows])
+    )
+
+
+async def _replay_lines(events: bytes, speed: Optional[float]):
+    if speed is None:
+        chunk = []
+        for offset, move in iter_session(events):
+            chunk.append(json.dumps({"t": offset, "move": move}) + "\n")
+            if len(chunk) == REPLAY_CHUNK_EVENTS:
+                yield "".join(chunk)
+                chunk = []
+        if chunk:
+            yield "".join(chunk)
+        return
+
+    previous = 0
+    for offset, move in iter_session(events):
+        await asyncio.sleep((offset - previous) / 1000 / speed)
+        previous = offset
+        yield json.dumps({"t": offset, "move": move}) + "\n"
+
+
+@router.get("/{session_id}/replay")
+async def replay_session(
+    session_id: UUID,
+    speed: Optional[float] = Query(
+        None, gt=0, le=16, description="Pace events in real time at this speed; all at once if omitted"
+    ),
+    user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_read_session),
+):
+    """
+    Stream a recorded session's key presses as NDJSON lines {"t": ms, "move": ...}.
+    Users can replay their own sessions; superusers (teachers) any session.
+    """
+    row = (await session.execute(
+        select(PlaySession.user_id, PlaySession.events).where(PlaySession.id == session_id)
+    )).first()
+    # The blob is in memory; don't hold a pooled connection while streaming
+    await session.close()
+
+    if row is None or (row.user_id != user.id and not user.is_superuser):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found",
+        )
+
+    return StreamingResponse(
+        _replay_lines(row.events, speed),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
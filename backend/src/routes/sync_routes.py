@@ -0,0 +1,164 @@
+"""Offline progress sync: batched, sequenced level_passed events per device."""
+
+from datetime import datetime
+from uuid import UUID, uuid4
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth import current_active_user
+from src.config import settings
+from src.database import get_async_session, mark_recent_write
+from src.duration_stats import level_duration_stats
+from src.events import event_hub
+from src.models import Progress, SyncDevice, User
+from src.progress_buffer import progress_buffer
+from src.progress_sequence import assign_progress_seq
+from src.routes.game_routes import TOTAL_LEVELS
+from src.schemas.game_schemas import ProgressRead, SyncRejected, SyncRequest, SyncResponse
+from src.serialization import ModelJSONResponse
+
+
+router = APIRouter(prefix="/game", tags=["game"])
+
+# Progress rows returned per sync; has_more tells the device to sync again
+SYNC_CHANGES_LIMIT = 500
+
+
+def _decode_sync_cursor(cursor: str) -> int:
+    """Decode a cursor: the progress.seq of the last row the device received."""
+    try:
+        seq = int(cursor)
+    except ValueError:
+        seq = -1
+    if seq < 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid sync cursor",
+        )
+    return seq
+
+
+async def _lock_device(session: AsyncSession, user_id: UUID, device_id: str) -> SyncDevice:
+    """Get the device's sync row, creating it if needed, locked until commit."""
+    dialect = postgresql if session.get_bind().dialect.name == "postgresql" else sqlite
+    await session.execute(
+        dialect.insert(SyncDevice)
+        .values(user_id=user_id, device_id=device_id, last_sequence=0, last_synced_at=datetime.utcnow())
+        .on_conflict_do_nothing(index_elements=["user_id", "device_id"])
+    )
+    return await session.scalar(
+        select(SyncDevice)
+        .where(SyncDevice.user_id == user_id, SyncDevice.device_id == device_id)
+        .with_for_update()
+    )
+
+
+@router.post("/sync", response_model=SyncResponse)
+async def sync_progress(
+    request: SyncRequest,
+    user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Apply a device's queued progress events and return progress since its cursor.
+
+    Events are deduplicated by (device, sequence): the device row keeps the
+    highest sequence applied, so a retried batch (or its already-applied
+    prefix) is acknowledged without being stored twice. New events are
+    checked in sequence order against the levels passed so far, including
+    earlier events of the same batch, and stored with one multi-row insert in
+    the same transaction that advances the device's sequence. Events for
+    locked or unknown levels are acknowledged and reported in `rejected`;
+    resending them will not change the outcome.
+
+    `changes` are the user's progress rows after the request's cursor (from
+    every device, including the rows just applied), in commit order, and
+    `cursor` is where the next sync continues from. Cursors are progress.seq
+    values (see src/progress_sequence.py), so rows that commit after a cursor
+    was returned, such as write-behind rows flushed later, still come after it.
+    """
+    sequences = [event.sequence for event in request.events]
+    if any(later <= earlier for earlier, later in zip(sequences, sequences[1:])):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Event sequences must be strictly increasing",
+        )
+    after = _decode_sync_cursor(request.cursor) if request.cursor else 0
+
+    device = await _lock_device(session, user.id, request.device_id)
+    new_events = [event for event in request.events if event.sequence > device.last_sequence]
+
+    rows = []
+    rejected = []
+    if new_events:
+        passed = set((await session.scalars(
+            select(func.distinct(Progress.level)).where(Progress.user_id == user.id)
+        )).all())
+        if settings.PROGRESS_WRITE_BEHIND:
+            # Rows still queued in this process are not in the database yet
+            passed.update(range(1, await progress_buffer.highest_level_passed(user.id, session) + 1))
+
+        now = datetime.utcnow()
+        for event in new_events:
+            if event.level < 1 or event.level > TOTAL_LEVELS:
+                rejected.append(SyncRejected(
+                    sequence=event.sequence,
+                    detail=f"Invalid level. Must be between 1 and {TOTAL_LEVELS}",
+                ))
+                continue
+            if event.level > 1 and event.level - 1 not in passed:
+                rejected.append(SyncRejected(
+                    sequence=event.sequence,
+                    detail=f"Cannot pass level {event.level}. Must pass all previous levels first.",
+                ))
+                continue
+            passed.add(event.level)
+            rows.append({
+                "id": uuid4(),
+                "user_id": user.id,
+                "level": event.level,
+                "passed_at": now,
+                "duration_ms": event.duration_ms,
+            })
+
+        if rows:
+            await assign_progress_seq(session, rows)
+            await session.execute(insert(Progress), rows)
+        device.last_sequence = new_events[-1].sequence
+    device.last_synced_at = datetime.utcnow()
+    acked_sequence = device.last_sequence
+    await session.commit()
+
+    if rows:
+        mark_recent_write(user.id)
+    for row in rows:
+        if row["duration_ms"] is not None:
+            level_duration_stats.record(row["level"], row["duration_ms"])
+        event_hub.publish_level_passed(user.id, row["level"], row["passed_at"])
+
+    changes_stmt = (
+        select(Progress.id, Progress.user_id, Progress.level, Progress.passed_at,
+               Progress.duration_ms, Progress.seq)
+        .where(Progress.user_id == user.id, Progress.seq > after)
+        .order_by(Progress.seq)
+        .limit(SYNC_CHANGES_LIMIT + 1)
+    )
+    changes = [dict(row._mapping) for row in await session.execute(changes_stmt)]
+
+    has_more = len(changes) > SYNC_CHANGES_LIMIT
+    changes = changes[:SYNC_CHANGES_LIMIT]
+    cursor = str(changes[-1]["seq"]) if changes else request.cursor
+
+    return ModelJSONResponse(SyncResponse(
+        device_id=request.device_id,
+        acked_sequence=acked_sequence,
+        applied=len(rows),
+        duplicates=len(request.events) - len(new_events),
+        rejected=rejected,
+        changes=[ProgressRead(**change) for change in changes],
+        cursor=cursor,
+        has_more=has_more,
+    ))
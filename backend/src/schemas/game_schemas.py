@@ -1,14 +1,20 @@
 """Pydantic schemas for game-related endpoints."""
 
 from datetime import datetime
+from typing import Literal
 from uuid import UUID
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from src.recording import MAX_EVENTS
+from src.schemas.user_schemas import UserRead
 
 
 class ProgressCreate(BaseModel):
     """Schema for creating progress records."""
 
     level: int
+    # How long the level took to play, if the client measured it
+    duration_ms: int | None = Field(None, ge=0, le=24 * 3600 * 1000)
 
 
 class ProgressRead(BaseModel):
@@ -18,11 +24,168 @@ class ProgressRead(BaseModel):
     user_id: UUID
     level: int
     passed_at: datetime
+    duration_ms: int | None = None
 
     class Config:
         from_attributes = True
 
 
+class CurrentLevelRead(BaseModel):
+    """Schema for the highest level passed by a user."""
+
+    user_id: UUID
+    current_level: int | None
+    total_levels: int
+
+
+class LevelsPassedStatus(BaseModel):
+    """Schema for whether a user has passed every level."""
+
+    user_id: UUID
+    all_levels_passed: bool
+    levels_passed: int
+    total_levels: int
+
+
+class LevelData(BaseModel):
+    """Schema for the playable content of a level."""
+
+    user_id: UUID
+    level_number: int
+    code: list[str]
+    movements: list[str]
+    cursor: list[int]
+    can_play: bool
+
+
+class LevelGeometryRead(BaseModel):
+    """JSON fallback for a level's packed target geometry, in grid units."""
+
+    level: int
+    bbox: tuple[float, float, float, float]
+    points: list[tuple[float, float]]
+
+
+class LevelSummary(BaseModel):
+    """Schema for a level in the catalog listing, with the user's lock state."""
+
+    number: int
+    pack: str
+    world: int
+    steps: int
+    # Pass as ?v= to /game/levels/{number}/geometry for an immutable response
+    geometry_version: str
+    passed: bool
+    unlocked: bool
+
+
+class LevelPage(BaseModel):
+    """Schema for a keyset-paginated page of the level catalog."""
+
+    user_id: UUID
+    levels: list[LevelSummary]
+    next_cursor: int | None = None
+    total_levels: int
+
+
+class LevelDurationPercentiles(BaseModel):
+    """Schema for a level's estimated completion time percentiles."""
+
+    level: int
+    count: int
+    p50_ms: float | None
+    p90_ms: float | None
+    p99_ms: float | None
+
+
+class LevelHint(BaseModel):
+    """Schema for the next correct key from a player's current state."""
+
+    level: int
+    step: int
+    move: str | None
+    # Keys needed to get back on the solution path; 0 when on it
+    moves_to_path: int | None
+
+
+class PlaySessionCreate(BaseModel):
+    """Schema for one recorded play session: key presses and their times."""
+
+    level: int
+    started_at: datetime
+    moves: list[Literal["space", "left", "right", "down"]] = Field(max_length=MAX_EVENTS)
+    # Milliseconds since started_at, one per move, non-decreasing
+    offsets_ms: list[int] = Field(max_length=MAX_EVENTS)
+
+
+class PlaySessionBatch(BaseModel):
+    """Schema for uploading several recorded sessions in one request."""
+
+    sessions: list[PlaySessionCreate] = Field(min_length=1, max_length=100)
+
+
+class PlaySessionRead(BaseModel):
+    """Schema for a stored play session's metadata."""
+
+    id: UUID
+    user_id: UUID
+    level: int
+    started_at: datetime
+    event_count: int
+    duration_ms: int
+
+    class Config:
+        from_attributes = True
+
+
+class PlaySessionList(BaseModel):
+    """Schema for a list of stored play sessions."""
+
+    sessions: list[PlaySessionRead]
+
+
+class SyncEvent(BaseModel):
+    """Schema for one progress event queued on a device while offline."""
+
+    # Per-device counter, increasing by at least 1 with every queued event
+    sequence: int = Field(ge=1)
+    type: Literal["level_passed"] = "level_passed"
+    level: int
+    duration_ms: int | None = Field(None, ge=0, le=24 * 3600 * 1000)
+
+
+class SyncRequest(BaseModel):
+    """Schema for syncing a device's queued progress events."""
+
+    device_id: str = Field(min_length=1, max_length=64)
+    # Events not yet acknowledged, in sequence order
+    events: list[SyncEvent] = Field(default_factory=list, max_length=500)
+    # Cursor from the previous sync response, None on the first sync
+    cursor: str | None = None
+
+
+class SyncRejected(BaseModel):
+    """Schema for a synced event that was acknowledged but not applied."""
+
+    sequence: int
+    detail: str
+
+
+class SyncResponse(BaseModel):
+    """Schema for the result of a sync: what was applied and what changed since the cursor."""
+
+    device_id: str
+    # Every event up to this sequence is stored; the device can drop them
+    acked_sequence: int
+    applied: int
+    duplicates: int
+    rejected: list[SyncRejected]
+    # Progress committed since the request's cursor (from any device), in commit order
+    changes: list[ProgressRead]
+    cursor: str | None = None
+    has_more: bool
+
+
 class CertificateCreate(BaseModel):
     """Schema for creating certificate records."""
 
@@ -36,20 +199,84 @@ class CertificateRead(BaseModel):
     user_id: UUID
     certificate_name: str
     issued_at: datetime
+    verification_token: str | None = None
 
     class Config:
         from_attributes = True
 
 
+class BulkCertificateIssue(BaseModel):
+    """Schema for issuing a certificate to every user who passed all levels."""
+
+    certificate_name: str
+    # Enqueue as a background job instead of running within the request
+    background: bool = False
+
+
+class BulkCertificateIssueResult(BaseModel):
+    """Schema for the counts of a bulk certificate issuance."""
+
+    certificate_name: str
+    issued: int | None = None
+    skipped: int | None = None
+    chunks: int | None = None
+    holders: int | None = None
+    job_id: UUID | None = None
+
+
+class CertificateExistence(BaseModel):
+    """Schema for whether a user holds any certificate."""
+
+    user_id: UUID
+    exists: bool
+    issued_at: datetime | None = None
+
+
+class CertificateVerification(BaseModel):
+    """Schema for the result of verifying a signed certificate token."""
+
+    valid: bool
+    id: UUID | None = None
+    user_id: UUID | None = None
+    certificate_name: str | None = None
+    issued_at: datetime | None = None
+
+
 class UserProgressSummary(BaseModel):
-    """Schema for user progress summary."""
+    """Schema for user progress summary with a keyset-paginated certificate page."""
 
     user_id: UUID
-    current_level: int
-    total_levels_passed: int
-    latest_progress: ProgressRead | None = None
+    username: str
+    max_level: int
+    levels_passed: int
+    total_levels: int
+    all_levels_passed: bool
+    progress_percentage: float
     certificates_count: int
     certificates: list[CertificateRead] = []
+    next_certificates_cursor: str | None = None
 
-    class Config:
-        from_attributes = True
+
+class Bootstrap(BaseModel):
+    """Schema for everything the home page needs on load, in one response."""
+
+    user: UserRead
+    current_level: int | None
+    levels_passed: int
+    total_levels: int
+    all_levels_passed: bool
+    # Level lock map: a level is unlocked when it is 1 or the one before it was passed
+    passed_levels: list[int]
+    unlocked_levels: list[int]
+    # Latest certificate, if any
+    certificate: CertificateRead | None = None
+
+
+class ProgressEvent(BaseModel):
+    """Schema for a live progress event (level passed or certificate issued)."""
+
+    type: str
+    user_id: UUID
+    level: int | None = None
+    certificate_name: str | None = None
+    at: datetime
@@ -1,6 +1,7 @@
 """Pydantic schemas for request/response validation."""
 
 from fastapi_users import schemas
+from pydantic import BaseModel
 from typing import Optional
 from uuid import UUID
 
@@ -23,3 +24,9 @@ class UserUpdate(schemas.BaseUserUpdate):
     username: Optional[str] = None
 
 
+class AvailabilityRead(BaseModel):
+    """Schema for the registration typeahead; fields are None when not asked."""
+
+    username: Optional[str] = None
+    username_available: Optional[bool] = None
+    suggestions: list[str] = []
@@ -0,0 +1,33 @@
+"""Fast JSON responses built from cached Pydantic TypeAdapters."""
+
+from functools import lru_cache
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from src.schemas.game_schemas import CertificateRead, ProgressRead, UserProgressSummary
+
+
+@lru_cache(maxsize=None)
+def get_type_adapter(tp: Any) -> TypeAdapter:
+    """Return a TypeAdapter for a type, building its core schema only once."""
+    return TypeAdapter(tp)
+
+
+# Precompile adapters for the hot response models at import time
+for _model in (ProgressRead, CertificateRead, UserProgressSummary):
+    get_type_adapter(_model)
+
+
+class ModelJSONResponse(Response):
+    """
+    JSON response rendered directly to bytes by pydantic-core.
+    Skips FastAPI's validate -> dict -> json.dumps round trip for values that
+    are already typed response models.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return get_type_adapter(type(content)).dump_json(content)
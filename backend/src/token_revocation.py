@@ -0,0 +1,139 @@
+"""
+Revoked access tokens (logout).
+
+Revocations are rows in the revoked_token table, keyed by the token's `jti`
+and kept until the token would have expired anyway. Every process mirrors
+the unexpired rows in memory, so checking a token on the auth path is one
+dict lookup. Revocations made by this process apply immediately; those made
+by other workers are picked up by the periodic incremental refresh
+(TOKEN_DENYLIST_REFRESH_SECONDS).
+
+Password changes do not go through this list: they move the user's
+tokens_valid_after forward, which invalidates every older token at once.
+The authoritative check reads the user row, but the cut-offs of users whose
+tokens are not all expired yet are mirrored here as well (refreshed the same
+way), so checks that run before authentication, such as joining a coalesced
+request, can reject those tokens without a query.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config import settings
+from src.models import RevokedToken, User
+
+logger = logging.getLogger(__name__)
+
+# Re-read this much before the refresh watermark, so rows committed late by
+# other workers (clock skew, long transactions) are not missed
+REFRESH_OVERLAP = timedelta(seconds=30)
+
+# Tokens issued before a password change are expired after this long
+TOKEN_LIFETIME = timedelta(hours=settings.JWT_EXPIRATION_HOURS)
+
+
+class TokenDenylist:
+    """In-memory mirror of revoked_token (jti -> expiry) and of recent tokens_valid_after."""
+
+    def __init__(self):
+        self._expires: dict[str, datetime] = {}
+        # User id (as in the token's `sub`) -> tokens_valid_after
+        self._valid_after: dict[str, datetime] = {}
+        self._watermark: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        return jti is not None and jti in self._expires
+
+    def add(self, jti: str, expires_at: datetime) -> None:
+        self._expires[jti] = expires_at
+
+    def invalidate_user(self, user_id: UUID, valid_after: datetime) -> None:
+        """Reject the user's tokens issued before `valid_after` (a password change)."""
+        key = str(user_id)
+        self._valid_after[key] = max(valid_after, self._valid_after.get(key, valid_after))
+
+    def rejects(self, claims: dict) -> bool:
+        """Whether decoded token claims were revoked by a logout or a password change."""
+        if self.is_revoked(claims.get("jti")):
+            return True
+        valid_after = self._valid_after.get(claims.get("sub"))
+        if valid_after is None:
+            return False
+        issued_at = datetime.fromtimestamp(claims.get("iat", 0), timezone.utc).replace(tzinfo=None)
+        return issued_at < valid_after
+
+    async def revoke(
+        self, session: AsyncSession, jti: str, user_id: UUID, expires_at: datetime
+    ) -> None:
+        """Persist a revocation and apply it to this process right away."""
+        if jti not in self._expires:
+            session.add(RevokedToken(jti=jti, user_id=user_id, expires_at=expires_at))
+            await session.commit()
+        self.add(jti, expires_at)
+
+    def _prune(self, now: datetime) -> None:
+        for jti in [jti for jti, expires_at in self._expires.items() if expires_at <= now]:
+            del self._expires[jti]
+        for user_id in [
+            user_id for user_id, valid_after in self._valid_after.items()
+            if valid_after <= now - TOKEN_LIFETIME
+        ]:
+            del self._valid_after[user_id]
+
+    async def refresh(self, session: AsyncSession) -> int:
+        """Load revocations newer than the last refresh (all of them the first time)."""
+        now = datetime.utcnow()
+        stmt = select(RevokedToken.jti, RevokedToken.expires_at).where(RevokedToken.expires_at > now)
+        if self._watermark is not None:
+            stmt = stmt.where(RevokedToken.revoked_at >= self._watermark - REFRESH_OVERLAP)
+        rows = (await session.execute(stmt)).all()
+        for jti, expires_at in rows:
+            self.add(jti, expires_at)
+
+        users_stmt = select(User.id, User.tokens_valid_after).where(
+            User.tokens_valid_after > now - TOKEN_LIFETIME
+        )
+        if self._watermark is not None:
+            users_stmt = users_stmt.where(User.tokens_valid_after >= self._watermark - REFRESH_OVERLAP)
+        for user_id, valid_after in (await session.execute(users_stmt)).all():
+            self.invalidate_user(user_id, valid_after)
+        self._watermark = now
+        self._prune(now)
+        return len(rows)
+
+    async def purge_expired(self, session: AsyncSession) -> None:
+        """Delete rows of tokens that have expired on their own."""
+        await session.execute(delete(RevokedToken).where(RevokedToken.expires_at <= datetime.utcnow()))
+        await session.commit()
+
+    async def load(self, session_maker: async_sessionmaker) -> None:
+        """Rebuild from the database at startup."""
+        async with session_maker() as session:
+            await self.purge_expired(session)
+            self._watermark = None
+            await self.refresh(session)
+
+    async def run(self, session_maker: async_sessionmaker, interval_seconds: float) -> None:
+        """Refresh incrementally until cancelled."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                async with session_maker() as session:
+                    await self.refresh(session)
+            except Exception:
+                logger.exception("Token denylist refresh failed")
+
+    def stats(self) -> dict:
+        return {"revoked_tokens": len(self._expires), "password_changes": len(self._valid_after)}
+
+
+token_denylist = TokenDenylist()
@@ -0,0 +1,102 @@
+"""Turtle semantics shared by level validation, geometry and hints.
+
+A level's code is KTurtle-style commands. Each key the player presses is one
+move: SPACE steps forward one grid unit (STEP_UNITS turtle units), DOWN steps
+backward, LEFT/RIGHT turn 90 degrees.
+"""
+
+from typing import Iterable
+
+from src.levels import DOWN, LEFT, RIGHT, SPACE
+
+STEP_UNITS = 10
+TURN_DEGREES = 90
+
+# Every key the player can press, in the order of their 2-bit codes
+MOVES = (SPACE, LEFT, RIGHT, DOWN)
+# The move that undoes each move
+INVERSE = {SPACE: DOWN, DOWN: SPACE, LEFT: RIGHT, RIGHT: LEFT}
+
+# Headings as unit vectors on a y-up grid, in counter-clockwise order
+HEADINGS = ((0, 1), (-1, 0), (0, -1), (1, 0))  # up, left, down, right
+
+
+class InvalidCommand(ValueError):
+    """A code line the game cannot express as key presses."""
+
+
+def command_moves(line: str) -> list[str]:
+    """Key presses that execute one code line."""
+    parts = line.split()
+    if len(parts) != 2:
+        raise InvalidCommand(f"Expected '<command> <amount>', got {line!r}")
+    command, amount = parts
+    try:
+        value = int(amount)
+    except ValueError:
+        raise InvalidCommand(f"Amount must be an integer in {line!r}")
+
+    if command in ("forward", "backward"):
+        if value <= 0 or value % STEP_UNITS:
+            raise InvalidCommand(f"Distance must be a positive multiple of {STEP_UNITS} in {line!r}")
+        return [SPACE if command == "forward" else DOWN] * (value // STEP_UNITS)
+    if command in ("turnleft", "turnright"):
+        if value <= 0 or value % TURN_DEGREES:
+            raise InvalidCommand(f"Angle must be a positive multiple of {TURN_DEGREES} in {line!r}")
+        return [LEFT if command == "turnleft" else RIGHT] * (value // TURN_DEGREES)
+    raise InvalidCommand(f"Unknown command {command!r}")
+
+
+def expand_code(code: Iterable[str]) -> tuple[list[str], list[int]]:
+    """Expected moves for a program, and the code line index of each move."""
+    moves: list[str] = []
+    cursor: list[int] = []
+    for index, line in enumerate(code):
+        line_moves = command_moves(line)
+        moves.extend(line_moves)
+        cursor.extend([index] * len(line_moves))
+    return moves, cursor
+
+
+def step(x: int, y: int, heading: int, move: str) -> tuple[int, int, int]:
+    """Apply one move to a turtle state (grid position and heading index)."""
+    if move == LEFT:
+        return x, y, (heading + 1) % 4
+    if move == RIGHT:
+        return x, y, (heading - 1) % 4
+    dx, dy = HEADINGS[heading]
+    if move == DOWN:
+        dx, dy = -dx, -dy
+    return x + dx, y + dy, heading
+
+
+def trace(moves: Iterable[str]) -> list[tuple[int, int]]:
+    """
+    Polyline drawn by a move sequence, in grid units, starting at the origin
+    facing up. Turns add no points; consecutive collinear steps are merged.
+    """
+    x, y, heading = 0, 0, 0
+    points = [(0, 0)]
+    for move in moves:
+        x, y, heading = step(x, y, heading, move)
+        if (x, y) == points[-1]:
+            continue
+        if len(points) >= 2:
+            (x0, y0), (x1, y1) = points[-2], points[-1]
+            if (x1 - x0) * (y - y1) == (y1 - y0) * (x - x1) and (x1 - x0) * (x - x1) + (y1 - y0) * (y - y1) > 0:
+                points[-1] = (x, y)
+                continue
+        points.append((x, y))
+    return points
+
+
+def drawn_segments(moves: Iterable[str]) -> set[frozenset[tuple[int, int]]]:
+    """Unit segments drawn by a move sequence, independent of drawing order."""
+    x, y, heading = 0, 0, 0
+    segments = set()
+    for move in moves:
+        nx, ny, heading = step(x, y, heading, move)
+        if (nx, ny) != (x, y):
+            segments.add(frozenset(((x, y), (nx, ny))))
+        x, y = nx, ny
+    return segments
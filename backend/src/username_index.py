@@ -0,0 +1,71 @@
+"""
+In-memory index of taken usernames for the registration typeahead.
+
+Usernames are kept in a sorted list, so the names sharing a prefix are one
+bisect slice; that slice is all that is needed to suggest free variants of a
+taken name. Emails are deliberately not indexed: an unauthenticated email
+check would tell anyone which addresses have an account.
+
+The index is loaded at startup and updated by UserManager on register,
+update and delete. It is advisory: registration itself is still checked
+against the database, so a name taken through another worker since startup
+is only reported at submit time.
+"""
+
+from bisect import bisect_left, insort
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.models import User
+
+MAX_SUGGESTIONS = 3
+
+
+class UsernameIndex:
+    def __init__(self):
+        self._usernames: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._usernames)
+
+    def rebuild(self, usernames) -> None:
+        self._usernames = sorted(usernames)
+
+    async def load(self, session_maker: async_sessionmaker) -> None:
+        async with session_maker() as session:
+            self.rebuild((await session.scalars(select(User.username))).all())
+
+    def username_taken(self, username: str) -> bool:
+        index = bisect_left(self._usernames, username)
+        return index < len(self._usernames) and self._usernames[index] == username
+
+    def with_prefix(self, prefix: str) -> list[str]:
+        """Taken usernames starting with `prefix`, in sorted order."""
+        start = bisect_left(self._usernames, prefix)
+        end = bisect_left(self._usernames, prefix + "\U0010ffff", lo=start)
+        return self._usernames[start:end]
+
+    def suggest(self, username: str, limit: int = MAX_SUGGESTIONS) -> list[str]:
+        """Free variants of a username: the name followed by the lowest free numbers."""
+        taken = set(self.with_prefix(username))
+        suggestions = []
+        number = 1
+        while len(suggestions) < limit:
+            candidate = f"{username}{number}"
+            if candidate not in taken:
+                suggestions.append(candidate)
+            number += 1
+        return suggestions
+
+    def add(self, username: str) -> None:
+        if not self.username_taken(username):
+            insort(self._usernames, username)
+
+    def remove(self, username: str) -> None:
+        index = bisect_left(self._usernames, username)
+        if index < len(self._usernames) and self._usernames[index] == username:
+            del self._usernames[index]
+
+
+username_index = UsernameIndex()
@@ -7,8 +7,9 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy import text, inspect
 
 from src.app import app
-from src.database import Base, get_async_session, create_db_and_tables
+from src.database import Base, get_async_session, get_auth_session, create_db_and_tables
 from src.auth import current_active_user
+from src.routes.game_routes import get_read_session
 from src.models import User, OAuthAccount, Progress, Certificate
 
 
@@ -74,8 +75,10 @@ async def test_db_session(test_engine):
         async with async_session_maker() as session:
             yield session
     
-    # Override the get_async_session dependency
+    # Override the get_async_session, read-replica and auth session dependencies
     app.dependency_overrides[get_async_session] = override_get_db
+    app.dependency_overrides[get_read_session] = override_get_db
+    app.dependency_overrides[get_auth_session] = override_get_db
     
     async with async_session_maker() as session:
         yield session
@@ -145,6 +148,8 @@ async def test_session_with_verified_migrations(db_with_verified_migrations):
             yield session
     
     app.dependency_overrides[get_async_session] = override_get_db
+    app.dependency_overrides[get_read_session] = override_get_db
+    app.dependency_overrides[get_auth_session] = override_get_db
     
     async with async_session_maker() as session:
         yield session
@@ -2,6 +2,7 @@
 
 import pytest
 from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event
 
 from src.app import app
 
@@ -31,6 +32,34 @@ async def test_register_user(test_db_session):
         assert data["username"] == "testuser"
 
 
+@pytest.mark.asyncio
+async def test_register_checks_uniqueness_with_one_query(test_engine, test_db_session):
+    """Test that registration runs a single SELECT before inserting the user."""
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement.lstrip().split()[0].upper())
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.post(
+                "/auth/register",
+                json={"email": "Single@example.com", "username": "single", "password": "password123"},
+            )
+            assert response.status_code == 201
+
+            response = await client.post(
+                "/auth/register",
+                json={"email": "single@EXAMPLE.com", "username": "other", "password": "password123"},
+            )
+            assert response.status_code == 400
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+
+    assert statements[:statements.index("INSERT")] == ["SELECT"]
+
+
 @pytest.mark.asyncio
 async def test_register_duplicate_email(test_db_session):
     """
@@ -74,3 +103,85 @@ async def test_health_check(test_db_session):
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "ok"
+
+
+async def _register_and_login(client: AsyncClient, email: str, username: str, password: str) -> dict:
+    await client.post(
+        "/auth/register",
+        json={"email": email, "username": username, "password": password},
+    )
+    response = await client.post("/auth/jwt/login", data={"username": email, "password": password})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_token(test_db_session):
+    """Test that a token stops working after logout, while a new login works."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        headers = await _register_and_login(client, "logout@example.com", "logoutuser", "password123")
+        assert (await client.get("/users/me", headers=headers)).status_code == 200
+        
+        response = await client.post("/auth/jwt/logout", headers=headers)
+        assert response.status_code == 204
+        assert (await client.get("/users/me", headers=headers)).status_code == 401
+        assert (await client.get("/game/current_level", headers=headers)).status_code == 401
+        
+        new_headers = await _register_and_login(client, "logout@example.com", "logoutuser", "password123")
+        assert (await client.get("/users/me", headers=new_headers)).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_password_change_revokes_existing_tokens(test_db_session):
+    """Test that changing the password invalidates tokens issued before it."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        headers = await _register_and_login(client, "change@example.com", "changeuser", "password123")
+        
+        response = await client.patch("/users/me", headers=headers, json={"password": "newpassword456"})
+        assert response.status_code == 200
+        assert (await client.get("/users/me", headers=headers)).status_code == 401
+        
+        new_headers = await _register_and_login(client, "change@example.com", "changeuser", "newpassword456")
+        assert (await client.get("/users/me", headers=new_headers)).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_availability_follows_registration(test_db_session):
+    """Test the availability typeahead before and after a registration."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        params = {"username": "typeahead", "email": "typeahead@example.com"}
+        data = (await client.get("/auth/availability", params=params)).json()
+        assert data["username_available"] is True
+        # Emails are never reported
+        assert "email_available" not in data
+        assert data["suggestions"] == []
+        
+        await client.post(
+            "/auth/register",
+            json={"email": "typeahead@example.com", "username": "typeahead", "password": "password123"},
+        )
+        await client.post(
+            "/auth/register",
+            json={"email": "typeahead1@example.com", "username": "typeahead1", "password": "password123"},
+        )
+        
+        data = (await client.get("/auth/availability", params=params)).json()
+        assert data["username_available"] is False
+        assert "email_available" not in data
+        assert data["suggestions"] == ["typeahead2", "typeahead3", "typeahead4"]
+
+
+@pytest.mark.asyncio
+async def test_register_duplicate_username(test_db_session):
+    """Test registration with a taken username but a new email."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        await client.post(
+            "/auth/register",
+            json={"email": "first@example.com", "username": "samename", "password": "password123"},
+        )
+        response = await client.post(
+            "/auth/register",
+            json={"email": "second@example.com", "username": "samename", "password": "password123"},
+        )
+        assert response.status_code == 400
+        assert "Username" in response.json()["detail"]
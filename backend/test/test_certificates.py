@@ -0,0 +1,143 @@
+"""Tests for signed certificate verification."""
+
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from src.app import app
+from src.auth import current_superuser
+from src.certificates import CertificateRevocations
+
+
+@pytest.mark.asyncio
+async def test_register_certificate_returns_verifiable_token(test_db_session, mock_authenticated_user):
+    """Test that an issued certificate token verifies without a session."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(
+            "/game/register_certificate",
+            json={"certificate_name": "Turtle Master"},
+        )
+        assert response.status_code == 201
+        certificate = response.json()
+        assert certificate["verification_token"]
+
+        response = await client.get(
+            "/certificates/verify",
+            params={"token": certificate["verification_token"]},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["valid"] is True
+        assert data["id"] == certificate["id"]
+        assert data["user_id"] == str(mock_authenticated_user.id)
+        assert data["certificate_name"] == "Turtle Master"
+
+
+@pytest.mark.asyncio
+async def test_verify_tampered_token(test_db_session, mock_authenticated_user):
+    """Test that a modified token is rejected."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(
+            "/game/register_certificate",
+            json={"certificate_name": "Turtle Master"},
+        )
+        token = response.json()["verification_token"]
+        header, payload, signature = token.split(".")
+
+        response = await client.get(
+            "/certificates/verify",
+            params={"token": f"{header}.{payload}.{signature[::-1]}"},
+        )
+        assert response.status_code == 200
+        assert response.json()["valid"] is False
+
+
+@pytest.mark.asyncio
+async def test_verify_revoked_token(test_db_session, mock_authenticated_user):
+    """Test that a revoked certificate no longer verifies."""
+    async def override_superuser():
+        return mock_authenticated_user
+
+    app.dependency_overrides[current_superuser] = override_superuser
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(
+            "/game/register_certificate",
+            json={"certificate_name": "Turtle Master"},
+        )
+        certificate = response.json()
+
+        response = await client.post(f"/certificates/{certificate['id']}/revoke")
+        assert response.status_code == 204
+
+        response = await client.get(
+            "/certificates/verify",
+            params={"token": certificate["verification_token"]},
+        )
+        assert response.json()["valid"] is False
+
+        response = await client.post(f"/certificates/{uuid4()}/revoke")
+        assert response.status_code == 404
+
+    # Another worker (or a restart) picks the revocation up from the database
+    other_worker = CertificateRevocations()
+    assert await other_worker.refresh(test_db_session) == 1
+    assert certificate["id"] in other_worker
+
+
+@pytest.mark.asyncio
+async def test_bulk_issue_to_users_who_passed_every_level(
+    test_db_session, mock_authenticated_user, monkeypatch
+):
+    """Test chunked bulk issuance, skipping holders and incomplete users."""
+    from uuid import UUID, uuid4
+
+    from sqlalchemy import func, select
+
+    from src.config import settings
+    from src.level_catalog import level_catalog
+    from src.models import Certificate, Job, Progress, User
+
+    async def override_superuser():
+        return mock_authenticated_user
+
+    app.dependency_overrides[current_superuser] = override_superuser
+    monkeypatch.setattr(settings, "CERTIFICATE_BULK_CHUNK_SIZE", 1)
+
+    users = [
+        User(id=uuid4(), email=f"bulk{i}@example.com", username=f"bulk{i}",
+             hashed_password="x", is_active=True, is_superuser=False, is_verified=True)
+        for i in range(4)
+    ]
+    test_db_session.add_all(users)
+    for user in users[:3]:
+        for level in range(1, len(level_catalog) + 1):
+            test_db_session.add(Progress(user_id=user.id, level=level))
+    # Passing a level twice still counts once; the last user misses the final level
+    test_db_session.add(Progress(user_id=users[0].id, level=1))
+    for level in range(1, len(level_catalog)):
+        test_db_session.add(Progress(user_id=users[3].id, level=level))
+    test_db_session.add(Certificate(user_id=users[2].id, certificate_name="Turtle Graduate"))
+    await test_db_session.commit()
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/certificates/bulk_issue", json={"certificate_name": "Turtle Graduate"})
+        assert response.status_code == 200
+        result = response.json()
+        assert (result["issued"], result["skipped"], result["chunks"], result["holders"]) == (2, 0, 2, 3)
+
+        response = await client.post("/certificates/bulk_issue", json={"certificate_name": "Turtle Graduate"})
+        assert (response.json()["issued"], response.json()["holders"]) == (0, 3)
+
+        response = await client.post(
+            "/certificates/bulk_issue", json={"certificate_name": "Turtle Expert", "background": True}
+        )
+        assert response.status_code == 202
+        job_id = UUID(response.json()["job_id"])
+
+    holders = await test_db_session.scalars(
+        select(Certificate.user_id).where(Certificate.certificate_name == "Turtle Graduate")
+    )
+    assert set(holders) == {user.id for user in users[:3]}
+    assert await test_db_session.scalar(select(func.count()).select_from(Job).where(Job.id == job_id)) == 1
@@ -0,0 +1,108 @@
+"""Tests for single-flight request coalescing."""
+
+import asyncio
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import jwt
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient, ASGITransport
+
+from src.auth import get_jwt_strategy
+from src import coalesce
+from src.coalesce import CoalescingMetrics, CoalescingMiddleware
+from src.models import User
+from src.token_revocation import TokenDenylist
+
+
+def _make_app(metrics: CoalescingMetrics) -> tuple[FastAPI, asyncio.Event, list]:
+    release = asyncio.Event()
+    calls = []
+    app = FastAPI()
+    
+    @app.get("/game/current_level")
+    async def current_level():
+        calls.append(1)
+        await release.wait()
+        return {"current_level": len(calls)}
+    
+    app.add_middleware(CoalescingMiddleware, metrics=metrics)
+    return app, release, calls
+
+
+async def _auth_header() -> dict:
+    user = User(id=uuid4(), email="coalesce@example.com", username="coalesce")
+    token = await get_jwt_strategy().write_token(user)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_reads_share_one_execution():
+    """Test that parallel identical GETs by one user run the handler once."""
+    metrics = CoalescingMetrics()
+    app, release, calls = _make_app(metrics)
+    headers = await _auth_header()
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        requests = [
+            asyncio.create_task(client.get("/game/current_level", headers=headers))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0.05)
+        release.set()
+        responses = await asyncio.gather(*requests)
+    
+    assert len(calls) == 1
+    assert [r.status_code for r in responses] == [200, 200, 200]
+    assert all(r.json() == {"current_level": 1} for r in responses)
+    assert metrics.stats() == {"requests": 3, "deduplicated": 2}
+
+
+@pytest.mark.asyncio
+async def test_reads_by_different_users_are_not_shared():
+    """Test that coalescing is keyed by user."""
+    metrics = CoalescingMetrics()
+    app, release, calls = _make_app(metrics)
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        requests = [
+            asyncio.create_task(client.get("/game/current_level", headers=await _auth_header()))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0.05)
+        release.set()
+        await asyncio.gather(*requests)
+    
+    assert len(calls) == 2
+    assert metrics.deduplicated == 0
+
+
+@pytest.mark.asyncio
+async def test_revoked_tokens_do_not_join_flights(monkeypatch):
+    """Test that flights are keyed by token and never joined with a revoked one."""
+    denylist = TokenDenylist()
+    monkeypatch.setattr(coalesce, "token_denylist", denylist)
+    metrics = CoalescingMetrics()
+    app, release, calls = _make_app(metrics)
+    user = User(id=uuid4(), email="coalesce@example.com", username="coalesce")
+    strategy = get_jwt_strategy()
+    live = {"Authorization": f"Bearer {await strategy.write_token(user)}"}
+    logged_out = await strategy.write_token(user)
+    denylist.add(jwt.decode(logged_out, options={"verify_signature": False})["jti"], datetime.max)
+    before_password_change = {"Authorization": f"Bearer {await strategy.write_token(user)}"}
+    denylist.invalidate_user(user.id, datetime.utcnow() + timedelta(seconds=1))
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        leader = asyncio.create_task(client.get("/game/current_level", headers=live))
+        await asyncio.sleep(0.05)
+        others = [
+            asyncio.create_task(client.get("/game/current_level", headers=headers))
+            for headers in ({"Authorization": f"Bearer {logged_out}"}, before_password_change)
+        ]
+        await asyncio.sleep(0.05)
+        release.set()
+        await asyncio.gather(leader, *others)
+
+    assert len(calls) == 3
+    assert metrics.deduplicated == 0
@@ -0,0 +1,102 @@
+"""Tests for per-level completion time sketches."""
+
+import random
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.app import app
+from src.duration_stats import RELATIVE_ACCURACY, DurationSketch, LevelDurationStats
+from src.routes import game_routes
+
+
+def test_sketch_quantiles_within_relative_accuracy():
+    """Test sketch quantiles against exact ones, including after a merge."""
+    rng = random.Random(3)
+    durations = [rng.lognormvariate(9, 1) for _ in range(20_000)] + [0] * 50
+    left, right = DurationSketch(), DurationSketch()
+    for index, duration in enumerate(durations):
+        (left if index % 2 else right).add(duration)
+    left.merge(right)
+
+    durations.sort()
+    assert left.count == len(durations)
+    for q in (0.5, 0.9, 0.99):
+        exact = durations[int(q * (len(durations) - 1))]
+        assert abs(left.quantile(q) - exact) <= exact * RELATIVE_ACCURACY * 1.01
+    assert left.quantile(0.0) == 0.0
+    assert DurationSketch().quantile(0.5) is None
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_merges_workers(test_engine):
+    """Test that two workers' checkpoints add up instead of overwriting each other."""
+    session_maker = async_sessionmaker(test_engine, expire_on_commit=False)
+    first, second = LevelDurationStats(), LevelDurationStats()
+    for duration in (1000, 2000, 3000):
+        first.record(1, duration)
+    second.record(1, 4000)
+    second.record(2, 500)
+
+    await first.checkpoint(session_maker)
+    await second.checkpoint(session_maker)
+    await first.checkpoint(session_maker)
+
+    for stats in (first, second):
+        assert stats.sketch(1).count == 4
+        assert stats.sketch(2).count == 1
+    assert first.stats()["pending"] == 0
+
+    fresh = LevelDurationStats()
+    await fresh.load(session_maker)
+    assert fresh.sketch(1).count == 4
+    assert abs(fresh.sketch(1).quantile(1.0) - 4000) <= 4000 * RELATIVE_ACCURACY
+
+
+@pytest.mark.asyncio
+async def test_failed_reload_does_not_count_twice(test_engine):
+    """Test that durations committed before a failed reload are not checkpointed again."""
+    class FailingReloadSession(AsyncSession):
+        committed = False
+
+        async def commit(self):
+            await super().commit()
+            self.committed = True
+
+        async def scalars(self, statement, *args, **kwargs):
+            if self.committed:
+                raise RuntimeError("reload failed")
+            return await super().scalars(statement, *args, **kwargs)
+
+    stats = LevelDurationStats()
+    stats.record(1, 1000)
+    with pytest.raises(RuntimeError):
+        await stats.checkpoint(async_sessionmaker(test_engine, class_=FailingReloadSession))
+    assert stats.stats()["pending"] == 0
+
+    await stats.checkpoint(async_sessionmaker(test_engine, expire_on_commit=False))
+    assert stats.sketch(1).count == 1
+
+
+@pytest.mark.asyncio
+async def test_pass_level_records_duration(test_db_session, mock_authenticated_user, monkeypatch):
+    """Test that pass_level durations show up in the level's percentiles."""
+    monkeypatch.setattr(game_routes, "level_duration_stats", LevelDurationStats())
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/game/stats/levels/1/durations")
+        assert response.json() == {"level": 1, "count": 0, "p50_ms": None, "p90_ms": None, "p99_ms": None}
+
+        response = await client.post("/game/pass_level", json={"level": 1, "duration_ms": 12_000})
+        assert response.status_code == 200
+        assert response.json()["duration_ms"] == 12_000
+        await client.post("/game/pass_level", json={"level": 1})
+
+        stats = (await client.get("/game/stats/levels/1/durations")).json()
+        assert stats["count"] == 1
+        assert abs(stats["p50_ms"] - 12_000) <= 12_000 * RELATIVE_ACCURACY
+
+        assert (await client.get("/game/stats/levels/999/durations")).status_code == 404
+        response = await client.post("/game/pass_level", json={"level": 2, "duration_ms": -1})
+        assert response.status_code == 422
@@ -0,0 +1,132 @@
+"""Tests for the live progress event hub and streams."""
+
+import asyncio
+import json
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from src.app import app
+from src.events import EventHub, event_hub
+from src.routes import event_routes
+from src.routes.event_routes import _sse_frames
+
+
+@pytest.mark.asyncio
+async def test_hub_filters_by_user():
+    """Test that subscribers only receive events for the users they follow."""
+    hub = EventHub(max_queue=8)
+    alice, bob = uuid4(), uuid4()
+    follows_alice = hub.subscribe([alice])
+    follows_everyone = hub.subscribe()
+    
+    hub.publish_level_passed(alice, 1, datetime.utcnow())
+    hub.publish_level_passed(bob, 1, datetime.utcnow())
+    
+    assert [json.loads(e)["user_id"] for e in await follows_alice.drain(0)] == [str(alice)]
+    assert len(await follows_everyone.drain(0)) == 2
+    
+    hub.unsubscribe(follows_alice)
+    hub.unsubscribe(follows_everyone)
+    assert hub.stats()["subscribers"] == 0
+
+
+@pytest.mark.asyncio
+async def test_hub_drops_oldest_when_subscriber_is_full():
+    """Test drop-oldest backpressure on a slow subscriber."""
+    hub = EventHub(max_queue=2)
+    user_id = uuid4()
+    subscriber = hub.subscribe([user_id])
+    
+    for level in [1, 2, 3]:
+        hub.publish_level_passed(user_id, level, datetime.utcnow())
+    
+    assert [json.loads(e)["level"] for e in await subscriber.drain(0)] == [2, 3]
+    assert subscriber.dropped == 1
+
+
+@pytest.mark.asyncio
+async def test_sse_frames_format_events():
+    """Test that buffered events are written as SSE data frames."""
+    user_id = uuid4()
+    subscribers = event_hub.subscribers
+    
+    # A stream that is never iterated never subscribes
+    await _sse_frames([user_id]).aclose()
+    assert event_hub.subscribers == subscribers
+    
+    frames = _sse_frames([user_id])
+    next_frame = asyncio.ensure_future(frames.__anext__())
+    await asyncio.sleep(0)
+    event_hub.publish_certificate_issued(user_id, "Turtle Master", datetime.utcnow())
+    frame = await next_frame
+    await frames.aclose()
+    assert event_hub.subscribers == subscribers
+    
+    assert frame.startswith(b"data: ") and frame.endswith(b"\n\n")
+    assert json.loads(frame[len(b"data: "):])["certificate_name"] == "Turtle Master"
+
+
+@pytest.mark.asyncio
+async def test_pass_level_publishes_event(test_db_session, mock_authenticated_user):
+    """Test that pass_level publishes a level_passed event."""
+    subscriber = event_hub.subscribe([mock_authenticated_user.id])
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/game/pass_level", json={"level": 1})
+        assert response.status_code == 200
+    
+    events = [json.loads(e) for e in await subscriber.drain(0)]
+    event_hub.unsubscribe(subscriber)
+    assert events[0]["type"] == "level_passed"
+    assert events[0]["level"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_rejects_following_other_users(test_db_session, mock_authenticated_user):
+    """Test that non-superusers can only follow their own progress."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/events/stream", params={"user_id": str(uuid4())})
+        assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_websocket_sends_events_drained_with_a_client_message(authenticated_user, monkeypatch):
+    """Test that events drained in the same wait as a client message are still sent."""
+    class FakeStrategy:
+        async def read_token(self, token, user_manager):
+            return authenticated_user
+
+    class FakeWebSocket:
+        def __init__(self):
+            self.sent = []
+            self.received = 0
+
+        async def accept(self):
+            pass
+
+        async def receive(self):
+            self.received += 1
+            if self.received == 1:
+                # Arrives together with an event for the subscriber
+                event_hub.publish_level_passed(authenticated_user.id, 1, datetime.utcnow())
+                return {"type": "websocket.receive", "text": "ping"}
+            await asyncio.sleep(0.01)
+            return {"type": "websocket.disconnect"}
+
+        async def send_text(self, text):
+            self.sent.append(json.loads(text))
+
+    class FakeSession:
+        async def close(self):
+            pass
+
+    monkeypatch.setattr(event_routes, "get_jwt_strategy", FakeStrategy)
+    websocket = FakeWebSocket()
+    subscribers = event_hub.subscribers
+    await event_routes.progress_event_websocket(websocket, "token", [], None, FakeSession())
+
+    assert [event["level"] for event in websocket.sent] == [1]
+    assert event_hub.subscribers == subscribers
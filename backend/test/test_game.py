@@ -203,6 +203,28 @@ async def test_get_certified_data_empty(test_db_session, mock_authenticated_user
         assert response.status_code == 404
 
 
+@pytest.mark.asyncio
+async def test_latest_certificate_tie_matches_bootstrap(test_db_session, mock_authenticated_user):
+    """Test that certificates issued at the same moment resolve the same way everywhere."""
+    from datetime import datetime
+    from uuid import UUID
+    
+    issued_at = datetime(2026, 1, 1, 12, 0, 0)
+    # Higher id inserted first, so insertion order alone does not decide the tie
+    for certificate_id, name in ((UUID(int=2), "Turtle Master"), (UUID(int=1), "Python Master")):
+        test_db_session.add(Certificate(
+            id=certificate_id, user_id=mock_authenticated_user.id, certificate_name=name, issued_at=issued_at,
+        ))
+    await test_db_session.commit()
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        latest = (await client.get("/game/get_certified_data")).json()
+        bootstrap = (await client.get("/game/bootstrap")).json()
+        assert latest["id"] == bootstrap["certificate"]["id"]
+        # Ties go to the highest id
+        assert latest["id"] == str(UUID(int=2))
+
+
 @pytest.mark.asyncio
 async def test_check_if_certified_exist_true(test_db_session, mock_authenticated_user):
     """Test checking if a certificate exists when it does."""
@@ -317,3 +339,224 @@ async def test_user_progress_summary(test_db_session, mock_authenticated_user):
         assert data["levels_passed"] == 2
         assert data["certificates_count"] == 1
 
+
+
+@pytest.mark.asyncio
+async def test_user_progress_summary_counts_distinct_levels(test_db_session, mock_authenticated_user):
+    """Test that replaying a level does not inflate the summary."""
+    user = mock_authenticated_user
+    
+    for level in [1, 1, 2, 2, 2]:
+        test_db_session.add(Progress(user_id=user.id, level=level))
+    await test_db_session.commit()
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/game/user_progress_summary")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["max_level"] == 2
+        assert data["levels_passed"] == 2
+        assert data["certificates_count"] == 0
+        assert data["next_certificates_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_user_progress_summary_paginates_certificates(test_db_session, mock_authenticated_user):
+    """Test keyset pagination of the certificates in the summary."""
+    user = mock_authenticated_user
+    
+    for name in ["First", "Second", "Third"]:
+        test_db_session.add(Certificate(user_id=user.id, certificate_name=name))
+    await test_db_session.commit()
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get(
+            "/game/user_progress_summary", params={"certificates_limit": 2}
+        )
+        first_page = response.json()
+        assert first_page["certificates_count"] == 3
+        assert len(first_page["certificates"]) == 2
+        assert first_page["next_certificates_cursor"]
+        
+        response = await client.get(
+            "/game/user_progress_summary",
+            params={
+                "certificates_limit": 2,
+                "certificates_cursor": first_page["next_certificates_cursor"],
+            },
+        )
+        second_page = response.json()
+        assert len(second_page["certificates"]) == 1
+        assert second_page["next_certificates_cursor"] is None
+        
+        names = {c["certificate_name"] for c in first_page["certificates"] + second_page["certificates"]}
+        assert names == {"First", "Second", "Third"}
+
+
+@pytest.mark.asyncio
+async def test_user_progress_summary_invalid_cursor(test_db_session, mock_authenticated_user):
+    """Test that a malformed certificates cursor is rejected."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get(
+            "/game/user_progress_summary", params={"certificates_cursor": "not-a-cursor"}
+        )
+        assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_levels_lock_state(test_db_session, mock_authenticated_user):
+    """Test the level listing with per-user passed/unlocked state."""
+    user = mock_authenticated_user
+    
+    test_db_session.add(Progress(user_id=user.id, level=1))
+    await test_db_session.commit()
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/game/levels")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_levels"] == len(CODE_LEVELS)
+        assert [level["number"] for level in data["levels"]] == list(range(1, len(CODE_LEVELS) + 1))
+        assert [level["passed"] for level in data["levels"][:3]] == [True, False, False]
+        assert [level["unlocked"] for level in data["levels"][:3]] == [True, True, False]
+        assert data["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_list_levels_keyset_pagination(test_db_session, mock_authenticated_user):
+    """Test paging through the level catalog with the cursor."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        first = (await client.get("/game/levels", params={"limit": 2})).json()
+        assert [level["number"] for level in first["levels"]] == [1, 2]
+        assert first["next_cursor"] == 2
+        
+        second = (await client.get(
+            "/game/levels", params={"limit": 2, "after": first["next_cursor"]}
+        )).json()
+        assert [level["number"] for level in second["levels"]] == [3, 4]
+
+
+@pytest.mark.asyncio
+async def test_level_geometry_binary_and_json(test_db_session, mock_authenticated_user):
+    """Test the packed geometry endpoint, its JSON fallback and caching headers."""
+    from src.geometry import unpack_geometry
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/game/levels/1/geometry")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/octet-stream"
+        assert response.headers["cache-control"] == "private, no-cache"
+        level, bbox, points = unpack_geometry(response.content)
+        assert level == 1
+        assert points[0] == (0.0, 0.0)
+        assert bbox == (0.0, 0.0, 0.0, float(len(MOVEMENT_LEVELS[0])))
+        
+        cached = await client.get(
+            "/game/levels/1/geometry", headers={"If-None-Match": response.headers["etag"]}
+        )
+        assert cached.status_code == 304
+        
+        json_response = await client.get("/game/levels/1/geometry", params={"format": "json"})
+        assert json_response.status_code == 200
+        assert json_response.json()["points"] == [list(point) for point in points]
+        assert json_response.headers["etag"] != response.headers["etag"]
+        
+        version = (await client.get("/game/levels", params={"limit": 1})).json()["levels"][0]["geometry_version"]
+        versioned = await client.get("/game/levels/1/geometry", params={"v": version})
+        assert versioned.content == response.content
+        assert "immutable" in versioned.headers["cache-control"]
+        stale = await client.get("/game/levels/1/geometry", params={"v": "0" * 32})
+        assert stale.headers["cache-control"] == "private, no-cache"
+
+
+@pytest.mark.asyncio
+async def test_level_geometry_requires_progression(test_db_session, mock_authenticated_user):
+    """Test that geometry of locked or unknown levels is not served."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        assert (await client.get("/game/levels/2/geometry")).status_code == 403
+        assert (await client.get("/game/levels/999/geometry")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_level_hint_on_and_off_path(test_db_session, mock_authenticated_user):
+    """Test hints on the solution path and the way back after a wrong key."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/game/levels/1/hint", params={"step": 0})
+        assert response.status_code == 200
+        assert response.json() == {"level": 1, "step": 0, "move": MOVEMENT_LEVELS[0][0], "moves_to_path": 0}
+        
+        # Turned left at the start: turn back right first
+        response = await client.get(
+            "/game/levels/1/hint", params={"step": 0, "x": 0, "y": 0, "heading": 1}
+        )
+        assert response.json()["move"] == "right"
+        assert response.json()["moves_to_path"] == 1
+        
+        # Far outside the level's hint area
+        response = await client.get(
+            "/game/levels/1/hint", params={"step": 0, "x": 50, "y": 0, "heading": 0}
+        )
+        assert response.json()["move"] is None
+        
+        assert (await client.get("/game/levels/1/hint", params={"step": 99})).status_code == 400
+        assert (await client.get("/game/levels/2/hint", params={"step": 0})).status_code == 403
+
+
+def test_hint_tables_lead_back_to_the_solution():
+    """Test that following hints from an off-path state completes every level."""
+    from src.hints import hint_tables
+    from src.turtle import step
+    
+    for table in hint_tables.values():
+        x, y, heading, current = 1, -1, 2, 0
+        for _ in range(table.steps * 20):
+            move, distance = table.lookup(current, x, y, heading)
+            if distance == 0:
+                current += 1
+            x, y, heading = step(x, y, heading, move)
+            if current == table.steps:
+                break
+        assert current == table.steps
+
+
+def test_hint_return_tables_are_shared_and_capped():
+    """Test that large levels share a capped return table instead of growing it."""
+    from src.hints import MAX_RETURN_RADIUS, build_hint_tables
+    from src.level_catalog import Level
+    
+    long_line = Level(number=1, pack="big", world=1, code=(), movements=("space",) * 200, cursor=())
+    table = build_hint_tables([long_line])[1]
+    assert table.return_radius == MAX_RETURN_RADIUS
+    
+    assert table.lookup(150, 1, 150, 0)[1] == 3
+    # Inside the hint area, but beyond what the return table covers
+    assert table.lookup(0, 0, 150, 0) is None
+
+
+@pytest.mark.asyncio
+async def test_bootstrap(test_db_session, mock_authenticated_user):
+    """Test the combined home page payload."""
+    user = mock_authenticated_user
+    for level in (1, 2, 2):
+        test_db_session.add(Progress(user_id=user.id, level=level))
+    test_db_session.add(Certificate(user_id=user.id, certificate_name="Python Master"))
+    await test_db_session.commit()
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/game/bootstrap")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["user"]["id"] == str(user.id)
+        assert data["user"]["username"] == user.username
+        assert data["current_level"] == 2
+        assert data["levels_passed"] == 2
+        assert data["total_levels"] == len(CODE_LEVELS)
+        assert data["all_levels_passed"] is False
+        assert data["passed_levels"] == [1, 2]
+        assert data["unlocked_levels"] == [1, 2, 3]
+        assert data["certificate"]["certificate_name"] == "Python Master"
+        assert data["certificate"]["verification_token"]
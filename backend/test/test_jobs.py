@@ -0,0 +1,170 @@
+"""Tests for the background job runner."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src import app as app_module
+from src import database
+from src.jobs import JobRunner
+from src.database import Base
+from src.models import Job
+
+
+@pytest.fixture
+async def job_runner(tmp_path, monkeypatch):
+    """
+    Create a job runner whose jobs live in a temporary SQLite file
+    (workers need their own connections, which in-memory SQLite cannot share).
+    
+    Yields:
+        JobRunner: Runner with two workers on "default", not started
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    monkeypatch.setattr(
+        database, "async_session_maker", async_sessionmaker(engine, expire_on_commit=False)
+    )
+    runner = JobRunner(
+        queues={"default": 2},
+        poll_interval=0.05,
+        lease_seconds=60,
+        retry_base_seconds=0.01,
+        retry_max_seconds=0.05,
+    )
+    yield runner
+    await runner.stop()
+    await engine.dispose()
+
+
+async def _wait_for_status(status: str, timeout: float = 2.0) -> Job:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        async with database.async_session_maker() as session:
+            job = await session.scalar(select(Job))
+        if job is not None and job.status == status:
+            return job
+        assert asyncio.get_running_loop().time() < deadline, f"job never reached {status}"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_job_runs_after_commit_and_retries(job_runner):
+    """Test that a failing job is retried with backoff until it succeeds."""
+    calls = []
+    
+    @job_runner.task("flaky", max_attempts=3)
+    async def flaky(payload: dict) -> None:
+        calls.append(payload["n"])
+        if len(calls) < 2:
+            raise RuntimeError("temporary failure")
+    
+    job_runner.start()
+    async with database.async_session_maker() as session:
+        job_runner.enqueue(session, "flaky", {"n": 7})
+        await session.commit()
+    
+    job = await _wait_for_status("done")
+    assert calls == [7, 7]
+    assert job.attempts == 2
+    assert job_runner.stats()["retried"] == 1
+
+
+@pytest.mark.asyncio
+async def test_job_fails_after_max_attempts(job_runner):
+    """Test that a job that keeps failing ends up failed with its error."""
+    @job_runner.task("broken", max_attempts=2)
+    async def broken(payload: dict) -> None:
+        raise ValueError("always broken")
+    
+    job_runner.start()
+    async with database.async_session_maker() as session:
+        job_runner.enqueue(session, "broken", {})
+        await session.commit()
+    
+    job = await _wait_for_status("failed")
+    assert job.attempts == 2
+    assert "always broken" in job.last_error
+
+
+@pytest.mark.asyncio
+async def test_expired_running_job_is_recovered(job_runner):
+    """Test that a job left running by a crashed process runs again."""
+    done = asyncio.Event()
+    
+    @job_runner.task("orphan")
+    async def orphan(payload: dict) -> None:
+        done.set()
+    
+    async with database.async_session_maker() as session:
+        session.add(Job(
+            queue="default",
+            name="orphan",
+            payload={},
+            status="running",
+            attempts=1,
+            locked_until=datetime.utcnow() - timedelta(seconds=1),
+        ))
+        await session.commit()
+    
+    assert await job_runner.recover_expired() == 1
+    job_runner.start()
+    await asyncio.wait_for(done.wait(), 2)
+    assert (await _wait_for_status("done")).attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_long_job_keeps_its_lease(job_runner):
+    """Test that a job running longer than its lease is not recovered as crashed."""
+    job_runner.lease = timedelta(seconds=0.3)
+    release = asyncio.Event()
+
+    @job_runner.task("slow")
+    async def slow(payload: dict) -> None:
+        await release.wait()
+
+    job_runner.start()
+    async with database.async_session_maker() as session:
+        job_runner.enqueue(session, "slow", {})
+        await session.commit()
+
+    await _wait_for_status("running")
+    await asyncio.sleep(0.5)
+    assert await job_runner.recover_expired() == 0
+    release.set()
+    assert (await _wait_for_status("done")).attempts == 1
+
+
+@pytest.mark.asyncio
+async def test_stop_does_not_wait_for_sweeper_interval(job_runner):
+    """Test that stopping returns promptly although the sweeper sleeps half a lease."""
+    job_runner.lease = timedelta(hours=1)
+    job_runner.start()
+    await asyncio.sleep(0.05)
+    await asyncio.wait_for(job_runner.stop(timeout=1.0), 2)
+
+
+@pytest.mark.asyncio
+async def test_lifespan_starts_and_stops(tmp_path, monkeypatch):
+    """Test that the app's lifespan shuts down (job runner included) on a fresh database."""
+    url = f"sqlite+aiosqlite:///{tmp_path / 'app.db'}"
+    engine = create_async_engine(url)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "async_session_maker", session_maker)
+    monkeypatch.setattr(app_module, "engine", engine)
+    monkeypatch.setattr(app_module, "read_engine", engine)
+    monkeypatch.setattr(app_module, "async_session_maker", session_maker)
+    # Startup migrates this database from scratch
+    monkeypatch.setattr(app_module.settings, "DATABASE_URL", url)
+    monkeypatch.setattr(app_module.settings, "JOB_RUNNER_ENABLED", True)
+
+    async def lifespan_cycle():
+        async with app_module.app.router.lifespan_context(app_module.app):
+            await asyncio.sleep(0.05)
+
+    await asyncio.wait_for(lifespan_cycle(), 15)
@@ -10,3 +10,110 @@ def test_same_len_mov_cursor():
     for i, cursor_list, movement_list in zip(range(len(CURSOR_LEVELS)), CURSOR_LEVELS, MOVEMENT_LEVELS):
         assert len(cursor_list) == len(movement_list), f"ERROR: in element {i}: \nCURSOR {cursor_list}\nMOVEMENT {movement_list}"
 
+
+
+def test_catalog_matches_level_lists():
+    from src.level_catalog import level_catalog
+
+    assert len(level_catalog) == len(CODE_LEVELS)
+    assert list(level_catalog.get(1).code) == CODE_LEVELS[0]
+    assert level_catalog.get(0) is None
+    assert level_catalog.get(len(CODE_LEVELS) + 1) is None
+
+
+def test_catalog_keyset_page_with_filters():
+    from src.level_catalog import Level, LevelCatalog
+
+    catalog = LevelCatalog(
+        Level(number=n, pack="a" if n % 2 else "b", world=1 + n // 5, code=(), movements=(), cursor=())
+        for n in range(1, 11)
+    )
+
+    assert [level.number for level in catalog.page(after=3, limit=3)] == [4, 5, 6]
+    assert [level.number for level in catalog.page(after=3, limit=3, pack="a")] == [5, 7, 9]
+    assert [level.number for level in catalog.page(world=2)] == [5, 6, 7, 8, 9]
+    assert [level.number for level in catalog.page(pack="b", world=2)] == [6, 8]
+    assert catalog.page(after=10) == []
+
+
+def test_builtin_levels_validate():
+    from src.level_packs import builtin_pack, validate_level
+
+    for level in builtin_pack()["levels"]:
+        assert validate_level(level) == []
+
+
+def test_validate_level_reports_mismatches():
+    from src.level_packs import validate_level
+
+    assert validate_level({"code": ["forward 20"], "movements": ["space"], "cursor": [0]})
+    assert validate_level({"code": ["forward 10"], "movements": ["space"], "cursor": [1]})
+    assert validate_level({"code": ["jump 10"], "movements": ["space"], "cursor": [0]})
+    assert validate_level(
+        {"code": ["forward 10", "turnleft 90"], "movements": ["space", "right"], "cursor": [0, 1]}
+    )
+
+
+def test_compile_reports_malformed_levels():
+    from src.level_packs import compile_packs
+
+    broken = {"name": "broken", "world": 1, "levels": [
+        {"code": ["forward 10"], "movements": ["space"]},
+        ["forward 10"],
+        {"code": ["forward 10"], "movements": ["space"], "cursor": [0]},
+        {"code": ["backward 10"], "movements": ["down"], "cursor": [0]},
+    ]}
+    artifact, errors = compile_packs([broken], workers=1)
+    assert [error.split(":")[0] for error in errors] == ["broken #1", "broken #2"]
+    assert [(level["number"], level["code"]) for level in artifact["levels"]] == [
+        (1, ["forward 10"]), (2, ["backward 10"]),
+    ]
+
+
+def test_compiled_artifact_round_trip(tmp_path):
+    import json
+
+    import pytest
+
+    from src.level_catalog import catalog_from_artifact
+    from src.level_packs import builtin_pack, compile_packs
+
+    extra = {"name": "extra", "world": 2, "levels": [{"code": ["backward 10"], "movements": ["down"], "cursor": [0]}]}
+    artifact, errors = compile_packs([builtin_pack(), extra], workers=2)
+    assert errors == []
+
+    path = tmp_path / "catalog.json"
+    path.write_text(json.dumps(artifact))
+    catalog = catalog_from_artifact(path)
+    assert len(catalog) == len(CODE_LEVELS) + 1
+    assert catalog.get(len(CODE_LEVELS) + 1).pack == "extra"
+    assert [level.number for level in catalog.page(world=2)] == [len(CODE_LEVELS) + 1]
+
+    artifact["levels"][0]["code"] = ["forward 90"]
+    path.write_text(json.dumps(artifact))
+    with pytest.raises(ValueError):
+        catalog_from_artifact(path)
+
+
+def test_canonical_hash_ignores_rotation():
+    from src.level_generator import canonical_hash
+
+    up_then_left = ["space", "space", "left", "space"]
+    right_then_up = ["right", "space", "space", "left", "space"]
+    assert canonical_hash(up_then_left) == canonical_hash(right_then_up)
+    assert canonical_hash(up_then_left) != canonical_hash(["space", "space", "space"])
+
+
+def test_generated_levels_are_valid_and_distinct():
+    from src.level_generator import Difficulty, canonical_hash, generate_levels
+    from src.level_packs import builtin_pack, validate_level
+
+    core = builtin_pack()["levels"]
+    levels = generate_levels(200, Difficulty(backward_rate=0.2), seed=1, exclude=core)
+    assert len(levels) == 200
+
+    hashes = [canonical_hash(level["movements"]) for level in levels + core]
+    assert len(set(hashes)) == len(hashes)
+    for level in levels:
+        assert validate_level(level) == []
+    assert generate_levels(200, Difficulty(backward_rate=0.2), seed=1, exclude=core) == levels
@@ -0,0 +1,70 @@
+"""Tests for the on-demand sampling profiler."""
+
+import asyncio
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from src.app import app
+from src.auth import current_superuser
+
+
+@pytest.fixture
+def superuser(mock_authenticated_user):
+    """Let the mocked user through current_superuser."""
+    async def override_superuser():
+        return mock_authenticated_user
+
+    app.dependency_overrides[current_superuser] = override_superuser
+    yield mock_authenticated_user
+
+
+def _busy_work(n: int = 200_000) -> int:
+    return sum(i * i for i in range(n))
+
+
+@pytest.mark.asyncio
+async def test_profile_for_seconds_returns_collapsed_stacks(superuser):
+    """Test that a timed session returns 'stack count' lines."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        profile = asyncio.create_task(
+            client.post("/admin/profile", params={"seconds": 0.3, "interval_ms": 1})
+        )
+        await asyncio.sleep(0.05)
+        for _ in range(5):
+            _busy_work()
+            await asyncio.sleep(0)
+        response = await profile
+        
+        assert response.status_code == 200
+        assert response.headers["content-disposition"].startswith("attachment")
+        lines = response.text.splitlines()
+        assert lines
+        for line in lines:
+            stack, count = line.rsplit(" ", 1)
+            assert int(count) > 0
+        assert any("_busy_work" in line for line in lines)
+
+
+@pytest.mark.asyncio
+async def test_profile_next_requests_and_validation(superuser):
+    """Test request-scoped sessions, and that exactly one mode must be given."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        assert (await client.post("/admin/profile")).status_code == 400
+        
+        profile = asyncio.create_task(client.post(
+            "/admin/profile", params={"requests": 2, "path": "/health", "timeout": 5}
+        ))
+        await asyncio.sleep(0.05)
+        for _ in range(2):
+            assert (await client.get("/health")).status_code == 200
+        response = await asyncio.wait_for(profile, 5)
+        assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_profile_requires_superuser(test_db_session):
+    """Test that the profiler is not available without superuser rights."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/admin/profile", params={"seconds": 1})
+        assert response.status_code == 401
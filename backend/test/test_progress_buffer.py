@@ -0,0 +1,138 @@
+"""Tests for the write-behind progress buffer."""
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src import database
+from src.app import app
+from src.config import settings
+from src.models import Progress
+from src.progress_buffer import ProgressBufferFull, ProgressWriteBuffer
+from src.routes import game_routes
+
+
+@pytest.fixture
+async def progress_buffer(test_engine, monkeypatch):
+    """
+    Create a write-behind buffer whose flushes go to the test database.
+    
+    Yields:
+        ProgressWriteBuffer: Started buffer; stopped (drained) on teardown
+    """
+    monkeypatch.setattr(
+        database, "async_session_maker", async_sessionmaker(test_engine, expire_on_commit=False)
+    )
+    buffer = ProgressWriteBuffer(flush_interval_ms=10, batch_size=4, max_queue_size=100)
+    buffer.start()
+    yield buffer
+    await buffer.stop()
+
+
+async def _count_progress(session) -> int:
+    return await session.scalar(select(func.count(Progress.id)))
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_queue_in_batches(test_db_session, authenticated_user, progress_buffer):
+    """Test that every queued row is inserted, batch_size rows at a time."""
+    for _ in range(10):
+        await progress_buffer.enqueue(authenticated_user.id, 1)
+    
+    await progress_buffer.stop()
+    
+    assert await _count_progress(test_db_session) == 10
+    stats = progress_buffer.stats()
+    assert stats["queue_depth"] == 0
+    assert stats["rows_flushed"] == 10
+    assert stats["batches_flushed"] == 3
+
+
+@pytest.mark.asyncio
+async def test_can_pass_uses_in_memory_state(test_db_session, authenticated_user, progress_buffer):
+    """Test that queued-but-unflushed levels unlock the next level."""
+    user_id = authenticated_user.id
+    
+    assert await progress_buffer.can_pass(user_id, 1, test_db_session)
+    assert not await progress_buffer.can_pass(user_id, 2, test_db_session)
+    
+    await progress_buffer.enqueue(user_id, 1)
+    assert await progress_buffer.can_pass(user_id, 2, test_db_session)
+    
+    await progress_buffer.stop()
+
+
+@pytest.mark.asyncio
+async def test_pass_level_write_behind(test_db_session, mock_authenticated_user, progress_buffer, monkeypatch):
+    """Test pass_level acknowledging through the buffer in write-behind mode."""
+    monkeypatch.setattr(settings, "PROGRESS_WRITE_BEHIND", True)
+    monkeypatch.setattr(game_routes, "progress_buffer", progress_buffer)
+    # Flush only on stop(): the in-memory test database is one shared
+    # connection, so a flush overlapping a request could be rolled back with it
+    progress_buffer.flush_interval = 60
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/game/pass_level", json={"level": 1})
+        assert response.status_code == 200
+        assert response.json()["level"] == 1
+        
+        response = await client.post("/game/pass_level", json={"level": 2})
+        assert response.status_code == 200
+        
+        response = await client.post("/game/pass_level", json={"level": 4})
+        assert response.status_code == 403
+    
+    await progress_buffer.stop()
+    
+    assert await _count_progress(test_db_session) == 2
+
+
+@pytest.mark.asyncio
+async def test_sync_delivers_rows_flushed_after_cursor(test_db_session, mock_authenticated_user, progress_buffer):
+    """Test that a queued row flushed after a sync cursor was handed out is still synced."""
+    progress_buffer.flush_interval = 60
+    queued = await progress_buffer.enqueue(mock_authenticated_user.id, 1)
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        # Stored after the queued row was stamped, but committed before it
+        response = await client.post("/game/sync", json={"device_id": "a", "events": [{"sequence": 1, "level": 1}]})
+        first = response.json()
+        assert first["changes"][0]["passed_at"] > queued["passed_at"].isoformat()
+        
+        await progress_buffer.stop()
+        
+        response = await client.post("/game/sync", json={"device_id": "b", "cursor": first["cursor"]})
+        assert [change["id"] for change in response.json()["changes"]] == [str(queued["id"])]
+
+
+@pytest.mark.asyncio
+async def test_poison_row_is_dropped_not_retried(test_db_session, authenticated_user, progress_buffer):
+    """Test that a row that can never be inserted is isolated and dropped with the rest flushed."""
+    user_id = authenticated_user.id
+    first = await progress_buffer.enqueue(user_id, 1)
+    await progress_buffer.stop()
+
+    # Same primary key as a stored row: an integrity error on every attempt
+    await progress_buffer.queue.put(dict(first, level=2))
+    for level in (2, 3, 4):
+        await progress_buffer.enqueue(user_id, level)
+    progress_buffer.start()
+    await progress_buffer.stop()
+
+    assert await _count_progress(test_db_session) == 4
+    stats = progress_buffer.stats()
+    assert stats["rows_dropped"] == 1
+    assert stats["queue_depth"] == 0
+    # Every row left the buffer, so nothing is cached any more
+    assert progress_buffer._max_level == {}
+
+
+@pytest.mark.asyncio
+async def test_enqueue_times_out_when_queue_stays_full(authenticated_user):
+    """Test that a full queue raises instead of blocking pass_level forever."""
+    buffer = ProgressWriteBuffer(flush_interval_ms=10, batch_size=4, max_queue_size=1, enqueue_timeout_ms=20)
+    await buffer.enqueue(authenticated_user.id, 1)
+
+    with pytest.raises(ProgressBufferFull):
+        await buffer.enqueue(authenticated_user.id, 2)
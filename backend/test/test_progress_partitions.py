@@ -0,0 +1,35 @@
+"""Tests for progress partition maintenance helpers."""
+
+from datetime import datetime
+
+import pytest
+
+from src.progress_partitions import (
+    add_months,
+    create_partition_sql,
+    maintain_partitions,
+    month_start,
+    partition_month,
+    partition_name,
+)
+
+
+def test_monthly_partition_bounds_and_names():
+    """Test month arithmetic across year boundaries and partition naming."""
+    month = month_start(datetime(2026, 12, 17, 8, 30))
+    assert month == datetime(2026, 12, 1)
+    assert add_months(month, 1) == datetime(2027, 1, 1)
+    assert add_months(month, -12) == datetime(2025, 12, 1)
+
+    assert partition_name(month) == "progress_p2026_12"
+    assert partition_month("progress_p2026_12") == month
+    assert partition_month("progress_default") is None
+    assert create_partition_sql(month).endswith(
+        "FOR VALUES FROM ('2026-12-01') TO ('2027-01-01')"
+    )
+
+
+@pytest.mark.asyncio
+async def test_maintenance_is_a_no_op_without_partitioning(test_engine):
+    """Test that maintenance leaves non-PostgreSQL databases alone."""
+    assert await maintain_partitions(test_engine) == {"created": [], "archived": []}
@@ -0,0 +1,93 @@
+"""Tests for admission control middleware."""
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient, ASGITransport
+
+from src.auth import get_jwt_strategy
+from src.models import User
+from src.rate_limit import RateLimitMiddleware, TokenBuckets
+
+
+def test_token_bucket_allows_burst_then_limits():
+    """Test that a bucket allows `burst` requests, then reports the wait time."""
+    buckets = TokenBuckets(rate=2, burst=3)
+    
+    assert [buckets.consume("user", now=0.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert buckets.consume("user", now=0.0) == pytest.approx(0.5)
+    
+    # Half a second refills one token
+    assert buckets.consume("user", now=0.5) == 0.0
+
+
+def test_token_bucket_evicts_idle_buckets():
+    """Test that buckets idle long enough to be full are dropped."""
+    buckets = TokenBuckets(rate=1, burst=2)
+    
+    buckets.consume("idle", now=0.0)
+    buckets.consume("active", now=1.5)
+    assert len(buckets) == 2
+    
+    buckets.consume("active", now=2.5)
+    assert len(buckets) == 1
+
+
+def _make_app(**limits) -> tuple[FastAPI, asyncio.Event]:
+    release = asyncio.Event()
+    app = FastAPI()
+    
+    @app.get("/game/ping")
+    async def ping():
+        return {"ok": True}
+    
+    @app.get("/game/slow")
+    async def slow():
+        await release.wait()
+        return {"ok": True}
+    
+    app.add_middleware(RateLimitMiddleware, **limits)
+    return app, release
+
+
+async def _auth_header() -> dict:
+    user = User(id=uuid4(), email="limit@example.com", username="limit")
+    token = await get_jwt_strategy().write_token(user)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.asyncio
+async def test_per_user_limit_returns_429_with_retry_after():
+    """Test that a user exceeding their bucket is shed with a 429."""
+    app, _ = _make_app(rate=1, burst=2, max_concurrent=10)
+    headers = await _auth_header()
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        assert (await client.get("/game/ping", headers=headers)).status_code == 200
+        assert (await client.get("/game/ping", headers=headers)).status_code == 200
+        
+        response = await client.get("/game/ping", headers=headers)
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "1"
+        
+        # Another user has their own bucket
+        assert (await client.get("/game/ping", headers=await _auth_header())).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_global_concurrency_limit():
+    """Test that requests beyond the concurrency cap are shed while others are in flight."""
+    app, release = _make_app(rate=100, burst=100, max_concurrent=1)
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        in_flight = asyncio.create_task(client.get("/game/slow"))
+        await asyncio.sleep(0.05)
+        
+        response = await client.get("/game/ping")
+        assert response.status_code == 429
+        
+        release.set()
+        assert (await in_flight).status_code == 200
+        assert (await client.get("/game/ping")).status_code == 200
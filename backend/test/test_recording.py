@@ -0,0 +1,87 @@
+"""Tests for recorded play sessions."""
+
+import json
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from src.app import app
+from src.models import User
+from src.recording import HEADER, decode_session, encode_session
+
+
+def test_encode_decode_round_trip():
+    """Test that moves and offsets survive encoding, packed 4 moves per byte."""
+    moves = ["space", "left", "right", "down", "space", "space"]
+    offsets = [0, 120, 450, 450, 20_000, 3_600_000]
+    data = encode_session(moves, offsets)
+
+    assert decode_session(data) == (moves, offsets)
+    # 2 bytes of moves; deltas of 0, 120, 330, 0, 19550, 3580000 take 1+1+2+1+3+4 bytes
+    assert len(data) == HEADER.size + 2 + 12
+
+    with pytest.raises(ValueError):
+        encode_session(["space", "space"], [100, 50])
+    with pytest.raises(ValueError):
+        encode_session(["jump"], [0])
+
+
+@pytest.mark.asyncio
+async def test_upload_list_and_replay_session(test_db_session, mock_authenticated_user):
+    """Test uploading a batch, listing it and streaming a replay back."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/game/sessions", json={"sessions": [
+            {"level": 1, "started_at": "2026-01-05T10:00:00Z", "moves": ["space"], "offsets_ms": [800]},
+            {"level": 2, "started_at": "2026-01-05T12:01:00+02:00",
+             "moves": ["left", "space", "space"], "offsets_ms": [300, 900, 1400]},
+        ]})
+        assert response.status_code == 201
+        uploaded = response.json()["sessions"]
+        assert [s["event_count"] for s in uploaded] == [1, 3]
+        assert uploaded[1]["duration_ms"] == 1400
+        assert uploaded[1]["started_at"].startswith("2026-01-05T10:01:00")
+
+        response = await client.get("/game/sessions", params={"level": 2})
+        assert [s["id"] for s in response.json()["sessions"]] == [uploaded[1]["id"]]
+
+        response = await client.get(f"/game/sessions/{uploaded[1]['id']}/replay")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        events = [json.loads(line) for line in response.text.splitlines()]
+        assert events == [
+            {"t": 300, "move": "left"},
+            {"t": 900, "move": "space"},
+            {"t": 1400, "move": "space"},
+        ]
+
+        # Offsets must not go backwards
+        response = await client.post("/game/sessions", json={"sessions": [
+            {"level": 1, "started_at": "2026-01-05T10:00:00Z",
+             "moves": ["space", "space"], "offsets_ms": [500, 100]},
+        ]})
+        assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_other_users_sessions_are_private(test_db_session, mock_authenticated_user):
+    """Test that non-superusers cannot list or replay another user's sessions."""
+    other = User(
+        id=uuid4(), email="other@example.com", username="other",
+        hashed_password="x", is_active=True, is_superuser=False, is_verified=True,
+    )
+    test_db_session.add(other)
+    await test_db_session.commit()
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/game/sessions", json={"sessions": [
+            {"level": 1, "started_at": "2026-01-05T10:00:00Z", "moves": ["space"], "offsets_ms": [800]},
+        ]})
+        session_id = response.json()["sessions"][0]["id"]
+
+        response = await client.get("/game/sessions", params={"user_id": str(other.id)})
+        assert response.status_code == 403
+
+        mock_authenticated_user.id = other.id
+        response = await client.get(f"/game/sessions/{session_id}/replay")
+        assert response.status_code == 404
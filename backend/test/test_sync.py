@@ -0,0 +1,68 @@
+"""Tests for offline progress sync."""
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from src.app import app
+
+
+@pytest.mark.asyncio
+async def test_sync_applies_events_once(test_db_session, mock_authenticated_user):
+    """Test that a retried batch is acknowledged without storing its events twice."""
+    batch = {"device_id": "tablet-7", "events": [
+        {"sequence": 1, "level": 1, "duration_ms": 9_000},
+        {"sequence": 2, "level": 3},
+        {"sequence": 4, "level": 2},
+        {"sequence": 5, "level": 3},
+    ]}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/game/sync", json=batch)
+        assert response.status_code == 200
+        first = response.json()
+        assert first["acked_sequence"] == 5
+        assert (first["applied"], first["duplicates"]) == (3, 0)
+        # Level 3 was still locked when sequence 2 was applied
+        assert [rejected["sequence"] for rejected in first["rejected"]] == [2]
+        assert [change["level"] for change in first["changes"]] == [1, 2, 3]
+        assert first["changes"][0]["duration_ms"] == 9_000
+
+        # Reconnect: the same batch again plus one new event
+        batch["events"].append({"sequence": 6, "level": 4})
+        response = await client.post("/game/sync", json={**batch, "cursor": first["cursor"]})
+        second = response.json()
+        assert second["acked_sequence"] == 6
+        assert (second["applied"], second["duplicates"]) == (1, 4)
+        assert [change["level"] for change in second["changes"]] == [4]
+
+        # Nothing new on either side
+        response = await client.post("/game/sync", json={"device_id": "tablet-7", "cursor": second["cursor"]})
+        third = response.json()
+        assert (third["acked_sequence"], third["changes"], third["cursor"]) == (6, [], second["cursor"])
+
+        response = await client.get("/game/current_level")
+        assert response.json()["current_level"] == 4
+
+
+@pytest.mark.asyncio
+async def test_sync_devices_and_validation(test_db_session, mock_authenticated_user):
+    """Test that sequences are per device and that malformed batches are refused."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/game/sync", json={"device_id": "a", "events": [{"sequence": 1, "level": 1}]})
+        cursor = response.json()["cursor"]
+
+        # Sequence 1 of another device is a different event
+        response = await client.post("/game/sync", json={
+            "device_id": "b", "events": [{"sequence": 1, "level": 2}], "cursor": cursor,
+        })
+        body = response.json()
+        assert (body["applied"], body["duplicates"]) == (1, 0)
+        assert [change["level"] for change in body["changes"]] == [2]
+
+        response = await client.post("/game/sync", json={
+            "device_id": "a", "events": [{"sequence": 3, "level": 1}, {"sequence": 2, "level": 2}],
+        })
+        assert response.status_code == 400
+        response = await client.post("/game/sync", json={"device_id": "a", "cursor": "not-a-cursor"})
+        assert response.status_code == 400
+        response = await client.post("/game/sync", json={"device_id": "a", "events": [{"sequence": 0, "level": 1}]})
+        assert response.status_code == 422
@@ -29,12 +29,9 @@ const mockGameState = ({
   total_levels = 4,
   all_levels_passed = false,
 } = {}) => {
-  api.gameAPI.getCurrentLevel.mockResolvedValueOnce({
+  api.gameAPI.bootstrap.mockResolvedValueOnce({
     current_level,
     total_levels,
-  });
-
-  api.gameAPI.checkPassAllLevel.mockResolvedValueOnce({
     all_levels_passed,
   });
 };
@@ -105,7 +102,7 @@ describe('HomePage', () => {
   });
 
   it('should show loading message initially', () => {
-    api.gameAPI.getCurrentLevel.mockImplementationOnce(
+    api.gameAPI.bootstrap.mockImplementationOnce(
       () => new Promise((resolve) => setTimeout(() => resolve({}), 100))
     );
 
@@ -117,12 +114,9 @@ describe('HomePage', () => {
   it('should show error message on API failure', async () => {
     jest.spyOn(console, 'error').mockImplementation(() => {});
 
-    api.gameAPI.getCurrentLevel.mockRejectedValueOnce(
+    api.gameAPI.bootstrap.mockRejectedValueOnce(
       new Error('Failed to fetch level')
     );
-    api.gameAPI.checkPassAllLevel.mockResolvedValueOnce({
-      all_levels_passed: false,
-    });
 
     renderHomePage();
 
@@ -136,12 +130,9 @@ describe('HomePage', () => {
   it('should show retry button on error', async () => {
     jest.spyOn(console, 'error').mockImplementation(() => {});
 
-    api.gameAPI.getCurrentLevel.mockRejectedValueOnce(
+    api.gameAPI.bootstrap.mockRejectedValueOnce(
       new Error('Failed to fetch level')
     );
-    api.gameAPI.checkPassAllLevel.mockResolvedValueOnce({
-      all_levels_passed: false,
-    });
 
     renderHomePage();
 
@@ -70,6 +70,14 @@ export const authAPI = {
     if (!response.ok) throw new Error('Failed to get current user');
     return response.json();
   },
+
+  checkAvailability: async ({ username } = {}) => {
+    const params = new URLSearchParams();
+    if (username) params.append('username', username);
+    const response = await fetch(`${API_BASE_URL}/auth/availability?${params}`);
+    if (!response.ok) throw new Error('Failed to check availability');
+    return response.json();
+  },
 };
 
 // API calls for game
@@ -92,7 +100,7 @@ export const gameAPI = {
     return response.json();
   },
 
-  passLevel: async (level) => {
+  passLevel: async (level, durationMs) => {
     const token = getAuthToken();
     const response = await fetch(`${API_BASE_URL}/game/pass_level`, {
       method: 'POST',
@@ -100,7 +108,7 @@ export const gameAPI = {
         'Content-Type': 'application/json',
         Authorization: `Bearer ${token}`,
       },
-      body: JSON.stringify({ level }),
+      body: JSON.stringify({ level, duration_ms: durationMs }),
     });
     if (!response.ok) throw new Error('Failed to pass level');
     return response.json();
@@ -178,6 +186,97 @@ gameAPI.getUserProgressSummary = async () => {
   return response.json();
 };
 
+// User, progress, level lock map and latest certificate in one request
+gameAPI.bootstrap = async () => {
+  const token = getAuthToken();
+  const response = await fetch(`${API_BASE_URL}/game/bootstrap`, {
+    headers: { Authorization: `Bearer ${token}` },
+  });
+  if (!response.ok) throw new Error('Failed to load home page data');
+  return response.json();
+};
+
+gameAPI.listLevels = async ({ after = 0, limit = 50, pack, world } = {}) => {
+  const token = getAuthToken();
+  const params = new URLSearchParams({ after, limit });
+  if (pack) params.append('pack', pack);
+  if (world) params.append('world', world);
+  const response = await fetch(`${API_BASE_URL}/game/levels?${params}`, {
+    headers: { Authorization: `Bearer ${token}` },
+  });
+  if (!response.ok) throw new Error('Failed to list levels');
+  return response.json();
+};
+
+// Decode a packed level geometry blob (layout documented in backend/src/geometry.py)
+export const decodeLevelGeometry = (buffer) => {
+  const view = new DataView(buffer);
+  const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+  if (magic !== 'TTG1') throw new Error('Invalid level geometry');
+  const level = view.getUint32(4, true);
+  const count = view.getUint32(8, true);
+  const bbox = [0, 1, 2, 3].map((i) => view.getFloat32(12 + i * 4, true));
+  const points = [];
+  for (let i = 0; i < count; i += 1) {
+    const offset = 28 + i * 8;
+    points.push([view.getFloat32(offset, true), view.getFloat32(offset + 4, true)]);
+  }
+  return { level, bbox, points };
+};
+
+// version: geometry_version from listLevels; the versioned URL is cached for good
+gameAPI.getLevelGeometry = async (level, version) => {
+  const token = getAuthToken();
+  const query = version ? `?v=${encodeURIComponent(version)}` : '';
+  const response = await fetch(`${API_BASE_URL}/game/levels/${level}/geometry${query}`, {
+    headers: { Authorization: `Bearer ${token}` },
+  });
+  if (!response.ok) throw new Error('Failed to get level geometry');
+  return decodeLevelGeometry(await response.arrayBuffer());
+};
+
+// state (optional): { x, y, heading } in grid units, heading 0 up, 1 left, 2 down, 3 right
+gameAPI.getHint = async (level, step, state) => {
+  const token = getAuthToken();
+  const params = new URLSearchParams({ step, ...(state || {}) });
+  const response = await fetch(`${API_BASE_URL}/game/levels/${level}/hint?${params}`, {
+    headers: { Authorization: `Bearer ${token}` },
+  });
+  if (!response.ok) throw new Error('Failed to get hint');
+  return response.json();
+};
+
+// sessions: [{ level, started_at, moves: [...], offsets_ms: [...] }]
+gameAPI.uploadSessions = async (sessions) => {
+  const token = getAuthToken();
+  const response = await fetch(`${API_BASE_URL}/game/sessions`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+      Authorization: `Bearer ${token}`,
+    },
+    body: JSON.stringify({ sessions }),
+  });
+  if (!response.ok) throw new Error('Failed to upload sessions');
+  return response.json();
+};
+
+// Send progress queued while offline and fetch progress recorded since `cursor`.
+// events: [{ sequence, level, duration_ms }], sequences increasing per device
+gameAPI.sync = async (deviceId, events, cursor = null) => {
+  const token = getAuthToken();
+  const response = await fetch(`${API_BASE_URL}/game/sync`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+      Authorization: `Bearer ${token}`,
+    },
+    body: JSON.stringify({ device_id: deviceId, events, cursor }),
+  });
+  if (!response.ok) throw new Error('Failed to sync progress');
+  return response.json();
+};
+
 // Sound utilities
 export const playSound = (type = 'success') => {
   // Create a simple beep using Web Audio API
@@ -4,15 +4,25 @@ import React from 'react';
  * Level Grid Component
  * Displays a 5x5 grid of level buttons
  * Shows locked/unlocked states and handles level selection
+ * When `levels` (a page from /game/levels) is given, its passed/unlocked
+ * state is used instead of deriving it from currentLevel
  */
-function LevelGrid({ totalLevels, currentLevel, onLevelSelect }) {
+function LevelGrid({ totalLevels, currentLevel, onLevelSelect, levels }) {
+  const levelStates = levels
+    ? levels
+    : Array.from({ length: totalLevels }, (_, index) => {
+        const i = index + 1;
+        return {
+          number: i,
+          unlocked: currentLevel === null ? i === 1 : i <= currentLevel || i === currentLevel + 1,
+          passed: currentLevel === null ? false : i <= currentLevel,
+        };
+      });
+
   const renderLevelButtons = () => {
     const buttons = [];
 
-    for (let i = 1; i <= totalLevels; i++) {
-      const isUnlocked = currentLevel === null ? i === 1 : i <= currentLevel || i === currentLevel + 1;
-      const isPassed = currentLevel === null ? false : i <= currentLevel;
-
+    for (const { number: i, unlocked: isUnlocked, passed: isPassed } of levelStates) {
       buttons.push(
         <button
           key={i}
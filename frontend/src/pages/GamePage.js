@@ -31,6 +31,8 @@ function GamePage() {
 
   const canvasRef = useRef(null);
   const lineDataRef = useRef([]);
+  // Play time includes restarts after mistakes
+  const startedAtRef = useRef(Date.now());
 
   // Load level data on component mount
   useEffect(() => {
@@ -43,6 +45,7 @@ function GamePage() {
       const data = await gameAPI.getLevelData(levelNumber);
       setLevelData(data);
       resetLevel();
+      startedAtRef.current = Date.now();
     } catch (err) {
       setError(err.message || 'Failed to load level');
       console.error(err);
@@ -173,7 +176,7 @@ function GamePage() {
 
     try {
       // Record level completion
-      await gameAPI.passLevel(levelNumber);
+      await gameAPI.passLevel(levelNumber, Date.now() - startedAtRef.current);
 
       // Show success message and redirect after delay
       setTimeout(() => {
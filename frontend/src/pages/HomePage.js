@@ -24,12 +24,10 @@ function HomePage() {
   const loadLevelProgress = async () => {
     try {
       setLoading(true);
-      const levelData = await gameAPI.getCurrentLevel();
-      setCurrentLevel(levelData.current_level);
-      setTotalLevels(levelData.total_levels);
-
-      const passedData = await gameAPI.checkPassAllLevel();
-      setAllLevelsPassed(passedData.all_levels_passed);
+      const data = await gameAPI.bootstrap();
+      setCurrentLevel(data.current_level);
+      setTotalLevels(data.total_levels);
+      setAllLevelsPassed(data.all_levels_passed);
       setError('');
     } catch (error) {
       console.error('Failed to load level progress:', error);
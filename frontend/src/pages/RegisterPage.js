@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useEffect, useState } from 'react';
 import { useNavigate, Link } from 'react-router-dom';
 import { authAPI, setAuthToken } from '../api';
 import '../styles/AuthPages.css';
@@ -14,8 +14,30 @@ function RegisterPage() {
   const [confirmPassword, setConfirmPassword] = useState('');
   const [error, setError] = useState('');
   const [loading, setLoading] = useState(false);
+  const [availability, setAvailability] = useState(null);
   const navigate = useNavigate();
 
+  // Check username availability as the user types (debounced)
+  useEffect(() => {
+    if (!username) {
+      setAvailability(null);
+      return undefined;
+    }
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      try {
+        const result = await authAPI.checkAvailability({ username });
+        if (!cancelled) setAvailability(result || null);
+      } catch (err) {
+        if (!cancelled) setAvailability(null);
+      }
+    }, 250);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [username]);
+
   const handleSubmit = async (e) => {
     e.preventDefault();
     setError('');
@@ -65,6 +87,13 @@ function RegisterPage() {
               required
               placeholder="Choose a username"
             />
+            {availability && availability.username === username && !availability.username_available && (
+              <small className="hint-text">
+                Username already taken.
+                {availability.suggestions.length > 0 &&
+                  ` Try: ${availability.suggestions.join(', ')}`}
+              </small>
+            )}
           </div>
 
           <div className="form-group">
@@ -176,6 +176,7 @@ export const createMockAPI = () => {
       getLevelData: jest.fn(),
       updateProgress: jest.fn(),
       checkPassAllLevel: jest.fn(),
+      bootstrap: jest.fn(),
     },
     certificateAPI: {
       checkIfCertificateExist: jest.fn(),